@@ -1,41 +1,193 @@
 # app.py
-from datetime import datetime
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
-from flask import Flask, abort, jsonify, render_template
+from flask import Flask, Response, abort, jsonify, render_template, request
 
-from utils.constants import OUTPUT_PATH_REPORT, OUTPUT_PATH_SANITISED
+try:  # optional: serve ``br`` when the brotli wheel is installed
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+from utils.aggregates import jobs_per_day, salary_histogram, top_companies
+from utils.changelog import merge_change_sets, read_change_sets
+from utils.constants import (
+    OUTPUT_PATH_CHANGES,
+    OUTPUT_PATH_DB,
+    OUTPUT_PATH_REPORT,
+    OUTPUT_PATH_REPORT_HISTORY,
+    OUTPUT_PATH_REPORT_JSON,
+    OUTPUT_PATH_SANITISED,
+    OUTPUT_PATH_SANITISED_ARROW,
+)
+from utils.dataset_cache import DatasetCache, Snapshot, VersionWatcher
+from utils.duplicates import unique_postings
+from utils.job_store import JobStore
+from utils.queries import (
+    JobIndex,
+    QueryError,
+    decode_cursor,
+    encode_cursor,
+    parse_fields,
+    parse_jobs_query,
+)
+from utils.reporting import flatten_report, read_quality_report, read_report_history
+from utils.storage import read_sanitised
 
 app = Flask(__name__, static_folder="static", template_folder="templates")
 
 
-def load_jobs_df() -> pd.DataFrame:
-    """Read the sanitised CSV. If it doesn’t exist yet, abort with 404."""
-    if not Path(OUTPUT_PATH_SANITISED).exists():
+# Parsed once per published file and shared by every request in the process.
+# The typed Arrow artefact is preferred; the CSV covers pyarrow-less pipelines.
+jobs_cache = DatasetCache(
+    [OUTPUT_PATH_SANITISED_ARROW, OUTPUT_PATH_SANITISED], read_sanitised
+)
+# The versioned JSON report is preferred; the CSV predates it.
+report_cache = DatasetCache(
+    [OUTPUT_PATH_REPORT_JSON, OUTPUT_PATH_REPORT], read_quality_report
+)
+report_history_cache = DatasetCache(OUTPUT_PATH_REPORT_HISTORY, read_report_history)
+changes_cache = DatasetCache(OUTPUT_PATH_CHANGES, read_change_sets)
+# One poller per process feeds every /api/v1/events subscriber.
+jobs_watcher = VersionWatcher(jobs_cache)
+
+# Idle SSE streams send a comment this often so proxies keep them open.
+SSE_HEARTBEAT_SECONDS = 15
+# Reconnect delay the browser should use after a dropped stream.
+SSE_RETRY_MS = 5000
+
+
+def jobs_snapshot() -> Snapshot:
+    """Return the cached sanitised dataset. If it doesn’t exist yet, abort with 404."""
+    try:
+        return jobs_cache.get()
+    except FileNotFoundError:
         abort(
             404,
             description="Sanitised dataset not found – run data_processing.py first.",
         )
-    return pd.read_csv(OUTPUT_PATH_SANITISED)
+
+
+def load_jobs_df() -> pd.DataFrame:
+    """Return the cached sanitised DataFrame (shared – do not mutate)."""
+    return jobs_snapshot().value
+
+
+# name → f(df, param, today); ``param`` is the one knob each series exposes.
+STATS_SERIES = {
+    "jobs-per-day": lambda df, days, today: jobs_per_day(
+        df, days=days, today=pd.Timestamp(today)
+    ),
+    "salary-histogram": lambda df, bins, today: salary_histogram(df, max_bins=bins),
+    "top-companies": lambda df, limit, today: top_companies(df, n=limit),
+}
+
+
+def compute_stats(snapshot: Snapshot, name: str, param: int, today: date):
+    """
+    Compute one aggregate for one dataset version, memoised on the snapshot.
+
+    ``today`` only takes part in the memo key so that the day-anchored series
+    rolls over at midnight without waiting for a new publish.
+    """
+    series = STATS_SERIES[name]
+    return snapshot.derive(
+        ("stats", name, param, today),
+        # Reposts (see utils.duplicates) count once, as their first posting.
+        lambda df: series(df[unique_postings(df)], param, today),
+    )
+
+
+@dataclass(frozen=True)
+class EncodedBody:
+    """A JSON body serialised and compressed once, plus its strong ETag."""
+
+    etag: str
+    encodings: dict  # content-coding → bytes ("identity", "gzip", maybe "br")
+
+
+def encode_json(payload) -> EncodedBody:
+    body = app.json.dumps(payload).encode("utf-8")
+    encodings = {
+        "identity": body,
+        "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+    }
+    if brotli is not None:
+        encodings["br"] = brotli.compress(body)
+    # Content-derived: bodies without the dataset version (/api/v1/jobs, the
+    # quality report) still answer 304 after a republish with identical data.
+    # Bodies that embed ``snapshot.version`` (stats, quality history) get a new
+    # ETag on every publish, so a revalidated body never names a stale version.
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return EncodedBody(etag=etag, encodings=encodings)
+
+
+def conditional_json(snapshot: Snapshot, key, build) -> Response:
+    """
+    Serve ``build(df)`` as JSON, serialised and compressed once per snapshot.
+
+    Requests carrying a matching ``If-None-Match`` (or a fresh enough
+    ``If-Modified-Since``) get an empty 304; everything else gets the
+    pre-encoded bytes in the best coding the client accepts.
+    """
+    encoded = snapshot.derive(("encoded", key), lambda df: encode_json(build(df)))
+
+    coding = request.accept_encodings.best_match(
+        [c for c in ("br", "gzip") if c in encoded.encodings], default="identity"
+    )
+    response = Response(encoded.encodings[coding], mimetype="application/json")
+    if coding != "identity":
+        response.headers["Content-Encoding"] = coding
+    response.vary.add("Accept-Encoding")
+    response.set_etag(encoded.etag)
+    response.last_modified = snapshot.last_modified
+    # Let caches keep the body but always revalidate – the ETag makes that cheap.
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def stats_response(name: str, param: int):
+    """Wrap a cached aggregate together with the dataset version it came from."""
+    snapshot = jobs_snapshot()
+    today = date.today()
+    return conditional_json(
+        snapshot,
+        ("stats", name, param, today),
+        lambda df: {
+            "version": snapshot.version,
+            "data": compute_stats(snapshot, name, param, today),
+        },
+    )
+
+
+# Report metadata that is not a quality metric.
+REPORT_META_KEYS = ("schema_version", "generated_at")
+
+
+def quality_tiles(report: dict) -> dict:
+    """The dashboard's quality tiles: every report metric, flattened."""
+    return flatten_report(
+        {k: v for k, v in report.items() if k not in REPORT_META_KEYS}
+    )
 
 
 @app.route("/")
 def home():
     # get last-modified time for footer
-    last_updated = (
-        datetime.fromtimestamp(Path(OUTPUT_PATH_SANITISED).stat().st_mtime).strftime(
-            "%Y-%m-%d %H:%M"
-        )
-        if Path(OUTPUT_PATH_SANITISED).exists()
-        else "N/A"
-    )
-    # Load quality report
-    if Path(OUTPUT_PATH_REPORT).exists():
-        quality_df = pd.read_csv(OUTPUT_PATH_REPORT)
-        quality_stats = quality_df.to_dict(orient="records")[0]
-    else:
+    try:
+        last_updated = jobs_cache.get().last_modified.strftime("%Y-%m-%d %H:%M")
+    except FileNotFoundError:
+        last_updated = "N/A"
+    # Load quality report (flattened once per published report)
+    try:
+        quality_stats = report_cache.get().derive(("flat",), quality_tiles)
+    except FileNotFoundError:
         quality_stats = {}
 
     return render_template(
@@ -43,21 +195,299 @@ def home():
     )
 
 
+def to_records(df: pd.DataFrame) -> list:
+    # Dates go out as the same text the CSV holds ("2025-05-30"), not in
+    # Flask's HTTP-date format.
+    df = df.copy()
+    for column in df.select_dtypes(include=["datetime", "datetimetz"]).columns:
+        df[column] = df[column].astype(str).where(df[column].notna(), None)
+    # Convert any pandas/NumPy NA values to real Python None so that the
+    # JSON encoder emits valid ``null`` instead of the JavaScript ``NaN``.
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def query_jobs(snapshot: Snapshot, args) -> dict:
+    """
+    Filter, project and paginate the cached frame for one request.
+
+    Filters are evaluated as boolean masks over a :class:`JobIndex` built once
+    per dataset version. The cursor pins the version it was issued for; if the
+    dataset is republished mid-walk the client has to start over.
+    """
+    df = snapshot.value
+    query = parse_jobs_query(args)
+    fields = parse_fields(args, df.columns)
+
+    limit = args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+    limit = min(max(limit, 1), MAX_PAGE_SIZE)
+
+    start_position = 0
+    if args.get("cursor"):
+        version, start_position = decode_cursor(args["cursor"])
+        if version != snapshot.version:
+            abort(409, description="Dataset changed since this cursor was issued.")
+
+    index = snapshot.derive(("job_index",), JobIndex)
+    positions = np.flatnonzero(index.mask(query))
+    start = int(np.searchsorted(positions, start_position))
+    page = positions[start : start + limit]
+    has_more = start + limit < len(positions)
+
+    rows = df.iloc[page]
+    if fields:
+        rows = rows[fields]
+
+    return {
+        "version": snapshot.version,
+        "total": int(len(positions)),
+        "next_cursor": (
+            encode_cursor(snapshot.version, int(positions[start + limit]))
+            if has_more
+            else None
+        ),
+        "data": to_records(rows),
+    }
+
+
 @app.route("/api/v1/jobs")
 def api_jobs():
     """
     Return the sanitised dataset as clean JSON.
-    pandas → dict → replace NaN/NaT with None → jsonify
+
+    Without query parameters this is the full dump, serialised once per version
+    (pandas → dict → NaN/NaT → None → JSON bytes). With any of ``limit``,
+    ``cursor``, ``fields``, ``company_name``, ``location``, ``tag``,
+    ``min_salary``, ``max_salary``, ``published_after`` or ``published_before``
+    it returns one page: ``{"version", "total", "next_cursor", "data"}``.
     """
-    df = load_jobs_df()
+    snapshot = jobs_snapshot()
+    if not request.args:
+        return conditional_json(snapshot, ("jobs",), to_records)
+
+    try:
+        return jsonify(query_jobs(snapshot, request.args))
+    except QueryError as e:
+        abort(400, description=str(e))
+
+
+def rows_for_ids(snapshot: Snapshot, ids: list, fields: list) -> list:
+    """Look up rows by job id through an id index built once per version."""
+    if not ids:
+        return []
+    id_index = snapshot.derive(("id_index",), lambda df: pd.Index(df["id"]))
+    positions = id_index.get_indexer(ids)
+    rows = snapshot.value.iloc[positions[positions >= 0]]
+    return to_records(rows[fields] if fields else rows)
+
+
+@app.route("/api/v1/jobs/changes")
+def api_jobs_changes():
+    """
+    Net changes since scrape run ``since``: ``added`` and ``changed`` rows plus
+    ``removed`` ids (no longer listed – their rows stay in the full dataset).
+
+    Start from ``since=0`` or the ``latest`` of a previous call. A ``since``
+    older than the retained log answers 410; reload ``/api/v1/jobs`` then. One
+    past ``latest`` (never issued, or from before the log was reset) is a 400.
+    """
+    since = request.args.get("since", type=int)
+    if since is None:
+        abort(400, description="'since' must be an integer run number.")
+
+    try:
+        change_sets = changes_cache.get().value
+    except FileNotFoundError:
+        change_sets = []
+
+    try:
+        merged = merge_change_sets(change_sets, since)
+    except ValueError as e:
+        abort(400, description=str(e))
+    if merged is None:
+        abort(410, description="Change log no longer covers 'since'; reload in full.")
 
-    # Convert any pandas/NumPy NA values to real Python None so that Flask/jsonify
-    # serialises them as valid JSON ``null`` instead of the JavaScript ``NaN``.
-    cleaned = df.replace({pd.NA: None, np.nan: None}).to_dict(  # ensure NA/NaN → None
-        orient="records"
+    snapshot = jobs_snapshot()
+    try:
+        fields = parse_fields(request.args, snapshot.value.columns)
+    except QueryError as e:
+        abort(400, description=str(e))
+
+    return jsonify(
+        {
+            "since": since,
+            "latest": merged.seq,
+            "added": rows_for_ids(snapshot, merged.added, fields),
+            "changed": rows_for_ids(snapshot, merged.changed, fields),
+            "removed": merged.removed,
+        }
     )
 
-    return jsonify(cleaned)
+
+@app.route("/api/v1/jobs/<job_id>")
+def api_job(job_id: str):
+    """
+    One job by id. When the SQLite job store exists, the sanitised row is
+    complemented with the raw listing fields and first/last-seen timestamps,
+    looked up by primary key.
+    """
+    snapshot = jobs_snapshot()
+    records = rows_for_ids(snapshot, [job_id], [])
+    record = records[0] if records else {}
+
+    if Path(OUTPUT_PATH_DB).exists():
+        with JobStore(OUTPUT_PATH_DB, readonly=True) as store:
+            raw = to_records(store.fetch([job_id]))
+        if raw:
+            record = {**raw[0], **record}
+
+    if not record:
+        abort(404, description=f"No job with id {job_id!r}.")
+    return jsonify(record)
+
+
+@app.route("/api/v1/listings")
+def api_listings():
+    """
+    Raw listings from the SQLite job store – every job ever scraped, with its
+    first/last-seen times – newest first, filtered through the store's indexes:
+    ``company_name``, ``published_after``, ``published_before``,
+    ``min_salary``, ``max_salary`` and ``limit`` (default 100, max 1000).
+    """
+    if not Path(OUTPUT_PATH_DB).exists():
+        abort(404, description="No job store – run with JOBS_STORAGE_BACKEND=sqlite.")
+    try:
+        query = parse_jobs_query(request.args)
+    except QueryError as e:
+        abort(400, description=str(e))
+    if query.location or query.tags:
+        abort(400, description="'location' and 'tag' are only on /api/v1/jobs.")
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+
+    with JobStore(OUTPUT_PATH_DB, readonly=True) as store:
+        try:
+            rows = store.query(
+                company=query.companies,
+                published_after=query.published_after,
+                published_before=query.published_before,
+                min_salary=query.min_salary,
+                max_salary=query.max_salary,
+                limit=min(max(limit, 1), MAX_PAGE_SIZE),
+            )
+        except pd.errors.DatabaseError:
+            # The schema is the scraper's to create and migrate.
+            abort(503, description="Job store not migrated yet – run the scraper.")
+    return jsonify({"count": len(rows), "data": to_records(rows)})
+
+
+@app.route("/api/v1/stats/jobs-per-day")
+def api_stats_jobs_per_day():
+    """Postings per day over the last ``days`` days (default 30, max 365)."""
+    days = min(max(request.args.get("days", 30, type=int), 1), 365)
+    return stats_response("jobs-per-day", days)
+
+
+@app.route("/api/v1/stats/salary-histogram")
+def api_stats_salary_histogram():
+    """Histogram of ``salary_min`` with at most ``bins`` buckets (default 20)."""
+    bins = min(max(request.args.get("bins", 20, type=int), 1), 100)
+    return stats_response("salary-histogram", bins)
+
+
+@app.route("/api/v1/stats/top-companies")
+def api_stats_top_companies():
+    """The ``limit`` companies with the most postings (default 10, max 100)."""
+    limit = min(max(request.args.get("limit", 10, type=int), 1), 100)
+    return stats_response("top-companies", limit)
+
+
+def version_event(snapshot: Snapshot | None) -> str:
+    """Format one ``dataset`` Server-Sent Event for ``snapshot``."""
+    if snapshot is None:
+        return 'event: dataset\ndata: {"version": null, "rows": 0}\n\n'
+
+    def summary(df: pd.DataFrame) -> dict:
+        return {
+            "version": snapshot.version,
+            "rows": int(len(df)),
+            "rows_with_salary": (
+                int(df["salary_min"].notna().sum()) if "salary_min" in df else 0
+            ),
+            "last_modified": snapshot.last_modified.isoformat(timespec="seconds"),
+        }
+
+    payload = json.dumps(snapshot.derive(("event",), summary))
+    return f"event: dataset\nid: {snapshot.version}\ndata: {payload}\n\n"
+
+
+@app.route("/api/v1/events")
+def api_events():
+    """
+    Server-Sent Events stream announcing each newly published dataset.
+
+    The current version is sent straight away, then one ``dataset`` event per
+    publish. Clients reload only when the version they hold is stale.
+    """
+    watcher = jobs_watcher
+
+    def stream():
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        snapshot = watcher.current()
+        yield version_event(snapshot)
+        known = snapshot.version if snapshot else None
+        while True:
+            if watcher.wait(known, timeout=SSE_HEARTBEAT_SECONDS):
+                snapshot = watcher.current()
+                known = snapshot.version if snapshot else None
+                yield version_event(snapshot)
+            else:
+                yield ": keep-alive\n\n"
+
+    response = Response(stream(), mimetype="text/event-stream")
+    response.cache_control.no_cache = True
+    response.headers["X-Accel-Buffering"] = "no"  # disable nginx buffering
+    return response
+
+
+@app.route("/api/v1/quality")
+def api_quality():
+    """The latest data-quality report as published by data_processing.py."""
+    try:
+        snapshot = report_cache.get()
+    except FileNotFoundError:
+        abort(404, description="Quality report not found – run data_processing.py.")
+    return conditional_json(snapshot, ("report",), lambda report: report)
+
+
+@app.route("/api/v1/quality/history")
+def api_quality_history():
+    """The last ``limit`` quality reports, oldest first (default 100, max 2000)."""
+    limit = min(max(request.args.get("limit", 100, type=int), 1), 2000)
+    try:
+        snapshot = report_history_cache.get()
+    except FileNotFoundError:
+        abort(404, description="No quality history yet – run data_processing.py.")
+    return conditional_json(
+        snapshot,
+        ("history", limit),
+        lambda history: {"version": snapshot.version, "data": history[-limit:]},
+    )
+
+
+@app.route("/api/v1/cache")
+def api_cache():
+    """Hit/miss/reload counters of the in-process dataset caches."""
+    return jsonify(
+        {
+            "jobs": jobs_cache.stats(),
+            "quality_report": report_cache.stats(),
+            "quality_history": report_history_cache.stats(),
+            "changes": changes_cache.stats(),
+        }
+    )
 
 
 if __name__ == "__main__":
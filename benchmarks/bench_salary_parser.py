@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Compare the vectorised compensation parser with the per-row ``apply`` it
+replaced, on synthetic columns drawn from realistic compensation strings.
+
+    python -m benchmarks.bench_salary_parser [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_processing import extract_salaries
+from utils.salary import parse_compensation
+
+SAMPLES = [
+    "SGD 4,000 – 8,000 with equity",
+    "SGD 3,500 – 5,000",
+    "SGD 380,000 – 400,000 with equity",
+    "SGD 55,000",
+    "S$4.5k - 6k per month",
+    "USD 120k/yr",
+    "IDR 15,000,000 – 20,000,000",
+    "Equity",
+    None,
+]
+
+
+def make_column(rows: int, distinct: int = 2_000, seed: int = 0) -> pd.Series:
+    """``rows`` strings with about ``distinct`` unique values, like a real scrape."""
+    rng = np.random.default_rng(seed)
+    pool = []
+    for i in range(distinct):
+        low = 2_000 + 250 * (i % 80)
+        template = SAMPLES[i % len(SAMPLES)]
+        pool.append(
+            None
+            if template is None
+            else template.replace("4,000", f"{low:,}").replace("3,500", f"{low:,}")
+        )
+    return pd.Series(np.array(pool, dtype=object)[rng.integers(0, distinct, rows)])
+
+
+def per_row(compensation: pd.Series) -> pd.DataFrame:
+    return compensation.apply(lambda x: pd.Series(extract_salaries(x)))
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the salary parser.")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--apply-limit",
+        type=int,
+        default=100_000,
+        help="skip the slow per-row baseline above this many rows",
+    )
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'apply (s)':>10} {'vectorised (s)':>15} {'speed-up':>9}")
+    for rows in args.sizes:
+        column = make_column(rows)
+        fast = timed(parse_compensation, column)
+        if rows <= args.apply_limit:
+            slow = timed(per_row, column)
+            print(f"{rows:>10,} {slow:>10.3f} {fast:>15.3f} {slow / fast:>8.0f}x")
+        else:
+            print(f"{rows:>10,} {'-':>10} {fast:>15.3f} {'-':>9}")
+
+
+if __name__ == "__main__":
+    main()
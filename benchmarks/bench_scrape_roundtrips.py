@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Count WebDriver round trips per scrape for the two DOM extraction modes of
+``scrape_all_jobs``: "cards" (element lookups for every card, every round)
+and "batch" (one script call per round for the new cards only).
+
+By default the browser is simulated: a page that grows by ``--per-scroll``
+cards per scroll, where every driver / element call counts as one round trip.
+``--live`` scrapes the real site with Chrome instead and counts the WebDriver
+commands actually sent.
+
+    python -m benchmarks.bench_scrape_roundtrips [--cards 100 500 2000] [--live]
+"""
+
+import argparse
+import logging
+import time
+from collections import Counter
+
+import scraper.selenium_scraper as selenium_scraper
+from scraper.selenium_scraper import EXTRACT_CARDS_JS
+
+MODES = ("cards", "batch")
+
+
+class FakeNode:
+    """An element inside a card; reading it is one round trip."""
+
+    def __init__(self, counter: Counter, value: str):
+        self._counter = counter
+        self._value = value
+
+    @property
+    def text(self) -> str:
+        self._counter["text"] += 1
+        return self._value
+
+    def get_attribute(self, name: str) -> str:
+        self._counter["get_attribute"] += 1
+        return self._value
+
+    def find_elements(self, by, selector) -> list:
+        self._counter["find_elements"] += 1
+        tags = ("Engineer", "SaaS", "Full-time")
+        return [FakeNode(self._counter, tag) for tag in tags]
+
+
+class FakeCard:
+    def __init__(self, counter: Counter, n: int):
+        self._counter = counter
+        self.row = {
+            "title": f"Engineer {n}",
+            "company": "Acme",
+            "location": "Singapore, Singapore",
+            "link": f"https://www.techinasia.com/jobs/job-{n}",
+            "image_url": "https://cdn.example/logo.png",
+            "compensation": "SGD 6,000 – 12,000",
+            "published_date": "1d ago",
+            "metadata": "Engineer,SaaS,Full-time",
+        }
+
+    def find_element(self, by, selector) -> FakeNode:
+        self._counter["find_element"] += 1
+        if selector == selector_of("title"):
+            return FakeNode(self._counter, self.row["link"])
+        return FakeNode(self._counter, self.row["company"])
+
+
+def selector_of(name: str) -> str:
+    return selenium_scraper.CARD_SELECTORS[name]
+
+
+class FakeDriver:
+    """A listing page of ``total`` cards, ``per_scroll`` more after each scroll."""
+
+    def __init__(self, total: int, per_scroll: int):
+        self.counter = Counter()
+        self.cards = [FakeCard(self.counter, n) for n in range(total)]
+        self.per_scroll = per_scroll
+        self.loaded = min(per_scroll, total)
+
+    def get(self, url):
+        self.counter["get"] += 1
+
+    def quit(self):
+        pass
+
+    def find_elements(self, by, selector) -> list:
+        self.counter["find_elements"] += 1
+        return self.cards[: self.loaded]
+
+    def execute_script(self, script, *args):
+        self.counter["execute_script"] += 1
+        if script == EXTRACT_CARDS_JS:
+            start = args[1]
+            return {
+                "count": self.loaded,
+                "height": self.loaded * 100,
+                "jobs": [card.row for card in self.cards[start : self.loaded]],
+            }
+        return self.loaded * 100  # document.body.scrollHeight
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, *args):  # scroll_and_wait
+        self.counter["execute_async_script"] += 1
+        if self.loaded == len(self.cards):
+            return "end"
+        self.loaded = min(self.loaded + self.per_scroll, len(self.cards))
+        return "grew"
+
+
+def count_commands(driver) -> Counter:
+    """Count every WebDriver command ``driver`` (and its elements) sends."""
+    counter = Counter()
+    execute = driver.execute
+
+    def counted(command, params=None):
+        counter[command] += 1
+        return execute(command, params)
+
+    driver.execute = counted
+    return counter
+
+
+def run(mode: str, make_driver) -> tuple[int, int, float]:
+    """(jobs scraped, round trips, seconds) of one scrape."""
+    counters = []
+
+    def configure():
+        driver, counter = make_driver()
+        counters.append(counter)
+        return driver
+
+    selenium_scraper.configure_webdriver = configure
+    start = time.perf_counter()
+    df = selenium_scraper.scrape_all_jobs(extraction=mode)
+    return len(df), sum(counters[0].values()), time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Count WebDriver round trips.")
+    parser.add_argument("--cards", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--per-scroll", type=int, default=20)
+    parser.add_argument("--live", action="store_true", help="scrape the real site")
+    args = parser.parse_args()
+    selenium_scraper.logger.setLevel(logging.INFO)  # no per-card debug lines
+
+    print(f"{'cards':>8} {'mode':>6} {'round trips':>12} {'per card':>9} {'s':>7}")
+    if args.live:
+        configure_webdriver = selenium_scraper.configure_webdriver
+
+        def make_driver():
+            driver = configure_webdriver()
+            return driver, count_commands(driver)
+
+        for mode in MODES:
+            jobs, trips, seconds = run(mode, make_driver)
+            print(
+                f"{jobs:>8,} {mode:>6} {trips:>12,} {trips / max(jobs, 1):>9.1f} "
+                f"{seconds:>7.1f}"
+            )
+        return
+
+    selenium_scraper.SCROLL_PAUSE_TIME = 0
+    for total in args.cards:
+        for mode in MODES:
+
+            def make_driver():
+                driver = FakeDriver(total, args.per_scroll)
+                return driver, driver.counter
+
+            jobs, trips, seconds = run(mode, make_driver)
+            print(
+                f"{jobs:>8,} {mode:>6} {trips:>12,} {trips / max(jobs, 1):>9.1f} "
+                f"{seconds:>7.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
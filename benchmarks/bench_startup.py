@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Cold-start budget for the entry points, measured with ``python -X importtime``.
+
+Each module is imported in a fresh interpreter several times; the fastest
+cumulative import time is compared with its budget, and the run fails if a
+budget is exceeded or a module that should load lazily was imported.
+
+    python -m benchmarks.bench_startup [--runs 5] [--budget-scale 1.5]
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# module → (budget in ms, top-level packages it must not import)
+BUDGETS = {
+    # Only selenium + utils: pandas and the pipeline load after the browser.
+    "scraper.selenium_scraper": (250, ["pandas", "matplotlib", "seaborn"]),
+    "data_processing": (800, ["matplotlib", "seaborn"]),
+    "app": (1000, ["matplotlib", "seaborn", "selenium"]),
+}
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+@dataclass
+class StartupResult:
+    module: str
+    cumulative_ms: float
+    top_level: list[str]  # other packages imported, slowest first
+    forbidden: list[str]
+
+
+def measure(module: str, forbidden=()) -> StartupResult:
+    """Import ``module`` in a fresh interpreter and parse its importtime log."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_us = 0
+    packages: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, _, name = match.groups()
+        if name == module:
+            cumulative_us = int(cumulative)
+        top = name.split(".")[0]
+        if top in ("site", "encodings") or top == module.split(".")[0]:
+            continue
+        packages[top] = max(packages.get(top, 0), int(cumulative))
+    return StartupResult(
+        module=module,
+        cumulative_ms=cumulative_us / 1000,
+        top_level=sorted(packages, key=packages.get, reverse=True),
+        forbidden=[name for name in forbidden if name in packages],
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check entry-point import times.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget-scale",
+        type=float,
+        default=1.0,
+        help="multiply every budget, e.g. on a slower CI runner",
+    )
+    parser.add_argument("modules", nargs="*", default=list(BUDGETS))
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':<28} {'best (ms)':>10} {'budget':>8}  heaviest imports")
+    for module in args.modules:
+        budget_ms, forbidden = BUDGETS.get(module, (float("inf"), []))
+        budget_ms *= args.budget_scale
+        best = min(
+            (measure(module, forbidden) for _ in range(args.runs)),
+            key=lambda result: result.cumulative_ms,
+        )
+        over = best.cumulative_ms > budget_ms
+        failed |= over or bool(best.forbidden)
+        print(
+            f"{module:<28} {best.cumulative_ms:>10.0f} {budget_ms:>8.0f}  "
+            f"{', '.join(best.top_level[:4])}{'  ← OVER BUDGET' if over else ''}"
+        )
+        if best.forbidden:
+            print(f"  ✗ loads {', '.join(best.forbidden)} at import time")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
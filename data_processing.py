@@ -1,20 +1,47 @@
 #!/usr/bin/env python3
 
+import argparse
 import re
+from collections import Counter
+from collections.abc import Iterable
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import pandas as pd
-import seaborn as sns
 
+from utils.changelog import VOLATILE_COLUMNS
+from utils.charts import chart_inputs, render_charts, sgd_salaries
+from utils.companies import CompanyAliases
 from utils.constants import (
-    OUTPUT_PATH_CHART_JOBS_PER_DAY,
-    OUTPUT_PATH_CHART_SALARY,
-    OUTPUT_PATH_CHART_TOP_COMPANIES,
+    OUTPUT_PATH_DB,
     OUTPUT_PATH_SANITISED,
+    OUTPUT_PATH_SANITISED_ARROW,
+    PROCESSING_CHUNKSIZE,
+    STORAGE_BACKEND,
 )
-from utils.functions import get_csv_path, get_logger
-from utils.reporting import log_quality_report
+from utils.dates import parse_published_dates
+from utils.duplicates import DuplicateIndex, unique_postings
+from utils.functions import get_csv_path, get_logger, write_csv_atomic
+from utils.incremental import (
+    ProcessingState,
+    apply_delta,
+    count_values,
+    output_versions,
+    plan_increment,
+    read_processing_state,
+    row_hashes,
+    unchanged_output,
+    write_processing_state,
+)
+from utils.job_store import RAW_COLUMNS, JobStore
+from utils.reporting import QualitySummary, log_quality_report
+from utils.salary import SALARY_COLUMNS, parse_compensation
+from utils.storage import (
+    SanitisedWriter,
+    read_sanitised,
+    typed_sanitised,
+    write_arrow_atomic,
+)
+from utils.streaming import IdIndex, iter_csv_chunks
 
 logger = get_logger(__name__)
 
@@ -23,6 +50,9 @@ def extract_salaries(compensation):
     """
     Extract min and max salary from compensation string, e.g. 'SGD 4,000 – 8,000 with equity'
     Returns (min_salary, max_salary) as ints or (None, None) if not found.
+
+    Scalar reference implementation, kept for one-off lookups and the parser
+    benchmark; the pipeline uses the vectorised ``utils.salary.parse_compensation``.
     """
     if not isinstance(compensation, str):
         return None, None
@@ -34,26 +64,48 @@ def extract_salaries(compensation):
     return None, None
 
 
-def cleanup_and_analyse(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Standardise column names, parse salaries / dates, and de-duplicate.
+SANITISED_COLUMNS = [
+    "id",
+    "title",
+    "company_name",
+    "company_id",
+    "location",
+    "link",
+    "image_url",
+    "salary_min",
+    "salary_max",
+    "salary_currency",
+    "salary_period",
+    "published_date_parsed",
+    "metadata",
+    "duplicate_group_id",
+]
+SANITISED_OUTPUTS = [OUTPUT_PATH_SANITISED_ARROW, OUTPUT_PATH_SANITISED]
+# What decides whether a raw row must be re-transformed. scraped_at changes on
+# every run, so it is replaced by the date it resolves relative dates to.
+HASHED_COLUMNS = [c for c in RAW_COLUMNS if c not in VOLATILE_COLUMNS] + [
+    "published_date_parsed"
+]
 
-    ⚠️  Data-retention policy
-    -------------------------
-    • **Keep** rows whose salary is hidden (salary_min / salary_max == NaN)
-        – They’re still useful for non-compensation analyses (e.g. posting volume, title search, company counts).
-    • **Filter out** those rows *only* when we compute salary-specific statistics or build the salary histogram on Dashboard.
-    This gives us a loss-less master dataset while ensuring pay charts are not skewed by nulls.
 
+def transform(
+    df: pd.DataFrame,
+    companies: CompanyAliases | None = None,
+    duplicates: DuplicateIndex | None = None,
+) -> pd.DataFrame:
     """
+    Standardise column names, parse salaries / dates, resolve companies and
+    de-duplicate.
 
-    logger.info("Starting data cleanup and analysis.")
-
-    # 1. Extract salary_min and salary_max from 'compensation'
+    Every step only looks at its own row – company ids and repost groups come
+    from the ``companies`` alias map and the ``duplicates`` index, which only
+    ever grow – so transforming a subset of the raw rows gives exactly the
+    rows a full run would produce for them.
+    """
+    # 1. Extract monthly salary_min / salary_max (+ currency, quoted period)
+    #    from 'compensation' – one regex pass over the distinct strings
     if "compensation" in df.columns:
-        df[["salary_min", "salary_max"]] = df["compensation"].apply(
-            lambda x: pd.Series(extract_salaries(x))
-        )
+        df[SALARY_COLUMNS] = parse_compensation(df["compensation"])
 
     # 2. Create company_name for consistency
     if "company" in df.columns:
@@ -63,18 +115,137 @@ def cleanup_and_analyse(df: pd.DataFrame) -> pd.DataFrame:
     if "id" in df.columns:
         df = df.drop_duplicates(subset=["id"])
 
-    # 3b. Parse the published_date into an actual datetime for downstream analysis
+    # 3b. Resolve published_date ("9 May 2025", "1d ago") into an actual
+    #     datetime, anchoring relative dates to the row's scrape time
     if "published_date" in df.columns:
-        df["published_date_parsed"] = pd.to_datetime(
-            df["published_date"], errors="coerce"
-        )
+        df["published_date_parsed"] = _published_dates(df)
+
+    # 4. Clean company_name column (missing names stay missing, not "nan")
+    df["company_name"] = df["company_name"].astype("string").str.strip().str.lower()
 
-    # 4. Clean company_name column
-    df["company_name"] = df["company_name"].astype(str).str.strip().str.lower()
+    # 4b. One company_id per company: "Grab", "GRAB PTE. LTD." → "grab"
+    if companies is None:
+        companies = CompanyAliases()
+    df["company_id"] = companies.resolve(df["company_name"])
+
+    # 4c. Group reposts of the same role under a fresh id (MinHash LSH)
+    if duplicates is None:
+        duplicates = DuplicateIndex()
+    df["duplicate_group_id"] = duplicates.assign(df)
 
     # 5. Convert salary_min to numeric
     df["salary_min"] = pd.to_numeric(df["salary_min"], errors="coerce")
 
+    return df
+
+
+def _published_dates(df: pd.DataFrame) -> pd.Series:
+    scraped_at = df["scraped_at"] if "scraped_at" in df.columns else None
+    return parse_published_dates(df["published_date"], scraped_at)
+
+
+def _day_keys(df: pd.DataFrame) -> pd.Series:
+    return df["published_date_parsed"].dt.strftime("%Y-%m-%d")
+
+
+def _counted(df: pd.DataFrame) -> pd.DataFrame:
+    """The rows the charts count: one per posting, reposts excluded."""
+    return df[unique_postings(df)]
+
+
+def _previous_sanitised(state: ProcessingState | None) -> pd.DataFrame | None:
+    """The published sanitised dataset, if it is the one ``state`` describes."""
+    if state is None:
+        return None
+    path = unchanged_output(state, SANITISED_OUTPUTS)
+    if path is None:
+        logger.info("Sanitised outputs changed since the last watermark.")
+        return None
+    previous = read_sanitised(path)
+    if list(previous.columns) != SANITISED_COLUMNS:
+        logger.info("Sanitised schema changed since the last watermark.")
+        return None
+    return previous
+
+
+def cleanup_and_analyse(df: pd.DataFrame, incremental: bool = False) -> pd.DataFrame:
+    """
+    Clean the raw jobs (see :func:`transform`), publish the sanitised dataset
+    and quality report, and refresh the charts. Returns the sanitised frame.
+
+    With ``incremental=True`` only rows that are new or changed since the last
+    run (per the watermark in ``processing_state.json``) are transformed and
+    merged into the published dataset; the chart aggregates and the quality
+    summary are updated by delta. Without a usable watermark this falls back to
+    a full rebuild.
+
+    ⚠️  Data-retention policy
+    -------------------------
+    • **Keep** rows whose salary is hidden (salary_min / salary_max == NaN)
+        – They’re still useful for non-compensation analyses (e.g. posting volume, title search, company counts).
+    • **Filter out** those rows *only* when we compute salary-specific statistics or build the salary histogram on Dashboard.
+    This gives us a loss-less master dataset while ensuring pay charts are not skewed by nulls.
+
+    """
+
+    logger.info("Starting data cleanup and analysis.")
+
+    hashed = df
+    if "published_date" in df.columns:
+        hashed = df.assign(published_date_parsed=_published_dates(df))
+    hashes = row_hashes(hashed, HASHED_COLUMNS)
+    state = read_processing_state() if incremental else None
+    previous = _previous_sanitised(state)
+    companies = CompanyAliases.load()
+    duplicates = DuplicateIndex.load()
+
+    if previous is None:
+        if incremental:
+            logger.info("No usable watermark; running a full rebuild.")
+        sanitised = transform(df, companies, duplicates)
+        sanitised = typed_sanitised(sanitised[SANITISED_COLUMNS])
+        counted = _counted(sanitised)
+        state = ProcessingState(
+            jobs_per_day=dict(count_values(_day_keys(counted))),
+            companies=dict(count_values(counted["company_id"])),
+        )
+        quality = QualitySummary.from_frame(sanitised)
+    else:
+        increment = plan_increment(hashes, state)
+        if increment.is_empty:
+            logger.info("No new or changed rows since the last run.")
+            return previous
+        logger.info(
+            "Incremental run: %d new/changed, %d removed of %d rows.",
+            len(increment.changed),
+            len(increment.removed),
+            len(hashes),
+        )
+        fresh = df[df["id"].astype(str).isin(increment.changed)]
+        fresh = transform(fresh.copy(), companies, duplicates)
+        fresh = typed_sanitised(fresh[SANITISED_COLUMNS])
+        touched = previous["id"].isin(increment.changed.append(increment.removed))
+        stale = previous[touched]
+
+        # Same row order as a full run: first appearance in the raw data.
+        sanitised = pd.concat([previous[~touched], fresh], ignore_index=True)
+        sanitised = sanitised.set_index("id").reindex(hashes.index).reset_index()
+        sanitised = typed_sanitised(sanitised)
+
+        quality = QualitySummary.from_dict(state.quality)
+        rescan = quality.remove(stale)
+        quality.update(fresh)
+        if rescan:
+            quality.rescan(sanitised, rescan)
+        # Reposts never entered the counts, so removing them changes nothing.
+        stale, fresh = _counted(stale), _counted(fresh)
+        state.jobs_per_day = apply_delta(
+            state.jobs_per_day, _day_keys(stale), _day_keys(fresh)
+        )
+        state.companies = apply_delta(
+            state.companies, stale["company_id"], fresh["company_id"]
+        )
+
     logger.info("Data cleaning completed.")
 
     # -----------------------------------------------------------------
@@ -82,105 +253,125 @@ def cleanup_and_analyse(df: pd.DataFrame) -> pd.DataFrame:
     # -----------------------------------------------------------------
     Path(OUTPUT_PATH_SANITISED).parent.mkdir(parents=True, exist_ok=True)
 
-    sanitised_cols = [
-        "id",
-        "title",
-        "company_name",
-        "location",
-        "link",
-        "image_url",
-        "salary_min",
-        "salary_max",
-        "published_date_parsed",
-        "metadata",
-    ]
-    df[sanitised_cols].to_csv(OUTPUT_PATH_SANITISED, index=False)
+    write_csv_atomic(sanitised, OUTPUT_PATH_SANITISED, index=False)
     logger.info(f"Saved sanitised dataset → {OUTPUT_PATH_SANITISED}")
 
+    # Typed columnar copy for readers (app.py): memory-mapped, no re-parsing
+    if write_arrow_atomic(sanitised, OUTPUT_PATH_SANITISED_ARROW):
+        logger.info(f"Saved sanitised dataset → {OUTPUT_PATH_SANITISED_ARROW}")
+
     # NEW: quick quality snapshot
-    log_quality_report(df[sanitised_cols])
+    log_quality_report(sanitised, summary=quality)
+    state.quality = quality.to_dict()
 
-    # -----------------------------------------------------------------
-    # 1) Salary histogram – only rows with salary_min
-    # -----------------------------------------------------------------
-    salary_df = df.dropna(subset=["salary_min"])
-    if not salary_df.empty:
-        plt.figure(figsize=(10, 6))
-        sns.histplot(salary_df["salary_min"], bins=20, kde=True)
-        plt.title("Salary Distribution (posts w/ salary only)")
-        plt.xlabel("Minimum Salary (SGD)")
-        plt.ylabel("Frequency")
-        plt.tight_layout()
-        plt.savefig(OUTPUT_PATH_CHART_SALARY)
-        plt.close()
-        logger.info("Saved salary histogram.")
-    else:
-        logger.warning("No rows with salary_min; salary histogram skipped.")
+    # Separate stage: only charts whose plotted data changed are re-rendered
+    render_charts(
+        chart_inputs(
+            sgd_salaries(_counted(sanitised)), state.jobs_per_day, state.companies
+        )
+    )
 
-    # -----------------------------------------------------------------
-    # 2) Top‑companies bar chart – need company_name
-    # -----------------------------------------------------------------
-    company_df = df.dropna(subset=["company_name"])
-    if not company_df.empty:
-        top_companies = company_df["company_name"].value_counts().head(10)
-        plt.figure(figsize=(10, 6))
-        sns.barplot(x=top_companies.values, y=top_companies.index)
-        plt.title("Top 10 Companies by Job Postings")
-        plt.xlabel("# Postings")
-        plt.ylabel("Company")
-        plt.tight_layout()
-        plt.savefig(OUTPUT_PATH_CHART_TOP_COMPANIES)
-        plt.close()
-        logger.info("Saved top companies bar chart.")
-    else:
-        logger.warning("No company_name values; top‑companies chart skipped.")
+    companies.save()
+    duplicates.save()
 
-    # -----------------------------------------------------------------
-    # 3) Jobs‑per‑day line chart – need published_date_parsed
-    # -----------------------------------------------------------------
-    date_df = df.dropna(subset=["published_date_parsed"])
-    daily_counts = (
-        date_df.set_index("published_date_parsed")
-        .resample("D")
-        .size()
-        .rename("num_jobs")
-        .reset_index()
-    )
+    # Watermark last: a crash above leaves the old one, so the next run redoes it.
+    state.row_hashes = {job_id: int(h) for job_id, h in hashes.items()}
+    state.outputs = output_versions(SANITISED_OUTPUTS)
+    write_processing_state(state)
 
-    if not daily_counts.empty:
-        end_date = daily_counts["published_date_parsed"].max()
-        start_date = end_date - pd.Timedelta(days=30)
-        plot_series = daily_counts[daily_counts["published_date_parsed"] >= start_date]
-        plt.figure(figsize=(12, 4))
-        plt.plot(
-            plot_series["published_date_parsed"],
-            plot_series["num_jobs"],
-            marker="o",
-            linestyle="-",
-        )
-        plt.title("Job postings per day (last 30 days)")
-        plt.xlabel("Date")
-        plt.ylabel("# jobs scraped")
-        plt.tight_layout()
-        plt.savefig(OUTPUT_PATH_CHART_JOBS_PER_DAY)
-        plt.close()
-        logger.info("Saved jobs‑per‑day line chart.")
-    else:
-        logger.warning("No valid dates; jobs‑per‑day chart skipped.")
+    return sanitised
 
-    return df
+
+def stream_cleanup_and_analyse(chunks: Iterable[pd.DataFrame]) -> int:
+    """
+    :func:`cleanup_and_analyse` for master files that do not fit in memory.
+
+    Each raw chunk is de-duplicated against the ids of earlier chunks,
+    transformed and appended to the sanitised outputs; the chart aggregates
+    and quality summary are folded in per chunk. Peak memory is one chunk
+    plus the id index and the SGD salaries. Produces the same files as a full
+    run (the quality report's quartiles come from merged sketches) and
+    returns the number of sanitised rows.
+
+    No row-hash watermark is kept, so the next ``--incremental`` run
+    rebuilds in full.
+    """
+    logger.info("Starting chunked data cleanup and analysis.")
+    Path(OUTPUT_PATH_SANITISED).parent.mkdir(parents=True, exist_ok=True)
+
+    seen = IdIndex()
+    companies = CompanyAliases.load()
+    duplicates = DuplicateIndex.load()
+    jobs_per_day, company_counts = Counter(), Counter()
+    quality = QualitySummary()
+    salaries = []
+    with SanitisedWriter(
+        SANITISED_COLUMNS, OUTPUT_PATH_SANITISED, OUTPUT_PATH_SANITISED_ARROW
+    ) as writer:
+        for chunk in chunks:
+            # Keep the first occurrence of an id, as drop_duplicates does.
+            chunk = chunk[seen.first_seen(chunk["id"])]
+            sanitised = transform(chunk.copy(), companies, duplicates)
+            sanitised = typed_sanitised(sanitised[SANITISED_COLUMNS])
+            writer.write(sanitised)
+
+            quality.update(sanitised)
+            counted = _counted(sanitised)
+            jobs_per_day.update(count_values(_day_keys(counted)))
+            company_counts.update(count_values(counted["company_id"]))
+            salaries.append(sgd_salaries(counted))
+            logger.debug(f"Processed chunk → {writer.rows} rows so far")
+
+    logger.info(f"Saved {writer.rows} sanitised rows → {OUTPUT_PATH_SANITISED}")
+
+    companies.save()
+    duplicates.save()
+
+    log_quality_report(summary=quality, columns=SANITISED_COLUMNS)
+    salaries = pd.concat(salaries) if salaries else pd.Series(dtype="float64")
+    render_charts(chart_inputs(salaries, dict(jobs_per_day), dict(company_counts)))
+    return writer.rows
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean and analyse scraped jobs.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only process rows that are new or changed since the last run",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=PROCESSING_CHUNKSIZE,
+        help="stream the master dataset this many rows at a time (0: load it all)",
+    )
+    args = parser.parse_args()
     csv_path = get_csv_path()
-    logger.info(f"Reading data from '{csv_path}'.")
 
     try:
-        df = pd.read_csv(csv_path)
+        if args.chunksize > 0:
+            if args.incremental:
+                logger.warning("--incremental is ignored with --chunksize.")
+            if STORAGE_BACKEND == "sqlite":
+                logger.info(f"Streaming data from '{OUTPUT_PATH_DB}'.")
+                with JobStore() as store:
+                    stream_cleanup_and_analyse(store.iter_chunks(args.chunksize))
+            else:
+                logger.info(f"Streaming data from '{csv_path}'.")
+                stream_cleanup_and_analyse(iter_csv_chunks(csv_path, args.chunksize))
+        elif STORAGE_BACKEND == "sqlite":
+            logger.info(f"Reading data from '{OUTPUT_PATH_DB}'.")
+            with JobStore() as store:
+                df = store.read_all()
+            cleanup_and_analyse(df, incremental=args.incremental)
+        else:
+            logger.info(f"Reading data from '{csv_path}'.")
+            df = pd.read_csv(csv_path)
+            cleanup_and_analyse(df, incremental=args.incremental)
     except FileNotFoundError:
         logger.error(
             "CSV file not found. Please ensure 'data/techinasia_jobs_master.csv' exists."
         )
     else:
-        cleaned_df = cleanup_and_analyse(df)
         logger.info("Script execution completed.")
@@ -0,0 +1,269 @@
+"""
+api_ingest.py
+
+JSON ingestion backend: pages through the search API behind the Tech in Asia
+listing page instead of scrolling it in Chrome (``--backend api`` /
+``JOBS_SCRAPE_BACKEND=api``).
+
+- Page 0 says how many pages there are (``nbPages``); the rest are fetched
+  concurrently by a small thread pool over one pooled keep-alive session.
+- A shared rate limiter spaces requests out, and 429 / 5xx responses are
+  retried with exponential backoff (honouring ``Retry-After``).
+- Hits are mapped to the same fields ``extract_job_data_from_card`` reads off
+  a job card, so the rest of the pipeline cannot tell the backends apart.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.constants import (
+    ALGOLIA_API_KEY,
+    ALGOLIA_APP_ID,
+    ALGOLIA_INDEX,
+    API_HITS_PER_PAGE,
+    API_MAX_RETRIES,
+    API_MAX_WORKERS,
+    API_REQUESTS_PER_SECOND,
+    API_TIMEOUT,
+    SCRAPE_TIMEZONE,
+)
+from scraper.shards import DEFAULT_SEARCH, SearchShard
+from utils.enums import URL
+from utils.functions import get_logger
+
+logger = get_logger(__name__)
+
+ALGOLIA_QUERIES_URL = URL.ALGOLIA_QUERIES.value
+JOB_PAGE_URL = URL.JOB_PAGE.value
+
+HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "X-Algolia-Application-Id": ALGOLIA_APP_ID,
+    "X-Algolia-API-Key": ALGOLIA_API_KEY,
+    "Origin": "https://www.techinasia.com",
+    "Referer": URL.TECH_IN_ASIA.value,
+}
+
+
+class RateLimiter:
+    """
+    Spaces ``wait()`` calls at least ``1 / rate`` seconds apart, across all
+    threads sharing it (``rate <= 0`` disables it).
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def make_session(
+    workers: int = API_MAX_WORKERS, retries: int = API_MAX_RETRIES
+) -> requests.Session:
+    """
+    A keep-alive session with one connection per worker, retrying 429 / 5xx
+    with exponential backoff (search queries are safe to repeat).
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=workers, pool_block=True, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+def search_payload(
+    page: int,
+    hits_per_page: int = API_HITS_PER_PAGE,
+    shard: SearchShard = DEFAULT_SEARCH,
+) -> dict:
+    # Same filters as the listing page the browser backend opens.
+    params = {
+        "query": "",
+        "hitsPerPage": hits_per_page,
+        "page": page,
+        "tagFilters": json.dumps(shard.tag_filters, separators=(",", ":")),
+    }
+    return {"requests": [{"indexName": ALGOLIA_INDEX, "params": urlencode(params)}]}
+
+
+def fetch_page(
+    session: requests.Session,
+    limiter: RateLimiter,
+    page: int,
+    url: str = ALGOLIA_QUERIES_URL,
+    shard: SearchShard = DEFAULT_SEARCH,
+) -> tuple[dict, str]:
+    """``(search result, fetch time)`` of one page of listings."""
+    limiter.wait()
+    payload = search_payload(page, shard=shard)
+    response = session.post(url, json=payload, timeout=API_TIMEOUT)
+    response.raise_for_status()
+    return response.json()["results"][0], _utc_now()
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# HIT → JOB CARD FIELDS
+# ────────────────────────────────────────────────────────────────────────────────
+def _text(value) -> str:
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _location(hit: dict) -> str:
+    # Cards read "Singapore, Singapore" / "Singapore, Singapore (Remote)".
+    city = hit.get("city") or {}
+    parts = [_text(city.get("name")), _text(city.get("work_country_name"))]
+    location = ", ".join(part for part in parts if part)
+    return f"{location} (Remote)" if hit.get("is_remote") else location
+
+
+def _compensation(hit: dict) -> str:
+    # Cards read "SGD 6,000 – 12,000", "… with equity", or just "Equity".
+    low, high = hit.get("salary_min"), hit.get("salary_max")
+    salary = ""
+    if hit.get("is_salary_visible", True) and low is not None and high is not None:
+        currency = _text((hit.get("currency") or {}).get("currency_code")) or "SGD"
+        salary = f"{currency} {float(low):,.0f} – {float(high):,.0f}"
+    if hit.get("has_equity"):
+        return f"{salary} with equity" if salary else "Equity"
+    return salary
+
+
+def _published_date(value) -> str:
+    # Cards show the local calendar date, e.g. "7 May 2025".
+    try:
+        if isinstance(value, (int, float)):
+            published = datetime.fromtimestamp(value, tz=timezone.utc)
+        else:
+            published = datetime.fromisoformat(_text(value))
+    except (TypeError, ValueError, OverflowError, OSError):
+        return ""
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    local = published.astimezone(ZoneInfo(SCRAPE_TIMEZONE))
+    return f"{local.day} {local:%b %Y}"
+
+
+def _metadata(hit: dict) -> str:
+    # Cards list position, industry and job type, e.g.
+    # "Software Engineer,Software,Full-time".
+    industries = hit.get("industries") or []
+    if isinstance(industries, dict):
+        industries = [industries]
+    tags = [
+        _text((hit.get("position") or {}).get("name")),
+        _text(industries[0].get("vertical_name")) if industries else "",
+        _text((hit.get("job_type") or {}).get("name")),
+    ]
+    return ",".join(tag for tag in tags if tag)
+
+
+def job_from_hit(hit: dict) -> dict:
+    """
+    Map one search hit to the fields ``extract_job_data_from_card`` returns;
+    an empty dict (and a warning) for a malformed hit.
+    """
+    try:
+        job_id = str(hit["id"])
+        company = hit.get("company") or {}
+        job_info = {
+            "id": job_id,
+            "title": _text(hit.get("title")),
+            "company": _text(company.get("name")),
+            "location": _location(hit),
+            "link": f"{JOB_PAGE_URL}/{job_id}",
+            "image_url": _text(company.get("avatar")),
+            "compensation": _compensation(hit),
+            "published_date": _published_date(hit.get("published_at")),
+            "metadata": _metadata(hit),
+        }
+    except Exception as e:
+        logger.warning(f"Failed to parse a search hit: {e}")
+        return {}
+    return job_info
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# MAIN INGESTION LOGIC
+# ────────────────────────────────────────────────────────────────────────────────
+def scrape_all_jobs_api(
+    url: str = ALGOLIA_QUERIES_URL,
+    workers: int = API_MAX_WORKERS,
+    rate: float = API_REQUESTS_PER_SECOND,
+    shard: SearchShard = DEFAULT_SEARCH,
+) -> pd.DataFrame:
+    """
+    Fetch every listing page of the ``shard`` search from the search API and
+    return the same DataFrame ``scrape_all_jobs`` builds (one row per job id,
+    plus ``scraped_at``).
+    """
+    limiter = RateLimiter(rate)
+    with make_session(workers) as session:
+        first = fetch_page(session, limiter, 0, url, shard)
+        nb_pages = int(first[0].get("nbPages", 1))
+        logger.info(
+            f"Search API ({shard.name}): {first[0].get('nbHits', '?')} hits on "
+            f"{nb_pages} pages ({workers} workers, ≤{rate:g} requests/s)"
+        )
+        pages = [first]
+        if nb_pages > 1:
+            with ThreadPoolExecutor(workers, thread_name_prefix="api-page") as pool:
+                try:
+                    pages += pool.map(
+                        lambda page: fetch_page(session, limiter, page, url, shard),
+                        range(1, nb_pages),
+                    )
+                except Exception:
+                    pool.shutdown(cancel_futures=True)
+                    raise
+
+    all_jobs = []
+    seen_ids = set()  # a posting can shift across a page boundary mid-run
+    for result, scraped_at in pages:
+        for hit in result.get("hits", []):
+            data = job_from_hit(hit)
+            if data and data["id"] not in seen_ids:
+                data["scraped_at"] = scraped_at
+                all_jobs.append(data)
+                seen_ids.add(data["id"])
+
+    if not all_jobs:
+        logger.warning("No jobs were returned; returning an empty DataFrame.")
+        return pd.DataFrame()
+
+    logger.info(f"Total jobs collected: {len(all_jobs)}")
+    return pd.DataFrame(all_jobs)
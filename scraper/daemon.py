@@ -0,0 +1,284 @@
+"""
+daemon.py
+
+Long-lived replacement for the */5 cron job: ``python -m scraper.daemon``.
+
+- Runs the scraper pipeline (see selenium_scraper.build_pipeline) on an
+  internal schedule, every DAEMON_INTERVAL_SECONDS ± DAEMON_JITTER_SECONDS,
+  backing off exponentially after failed cycles.
+- Keeps one headless Chrome warm between cycles (and Python with pandas and
+  the processing modules loaded), so a cycle is just the scrape itself.
+- Restarts the browser after BROWSER_MAX_CYCLES scrapes, once its process
+  tree grows past BROWSER_MAX_RSS_MB, or after a failed cycle.
+- With several search shards (see scraper/shards.py) it keeps their worker
+  pool warm instead – one Chrome per worker process – and replaces the pool
+  after a failed cycle.
+- Appends one telemetry line per cycle to data/daemon_runs.jsonl (per-stage
+  timings stay in data/pipeline_runs.jsonl, under the same run id).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import signal
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from scraper.selenium_scraper import build_pipeline, configure_webdriver
+from scraper.shards import configured_shards, shard_pool
+from utils.constants import (
+    BROWSER_MAX_CYCLES,
+    BROWSER_MAX_RSS_MB,
+    DAEMON_INTERVAL_SECONDS,
+    DAEMON_JITTER_SECONDS,
+    DAEMON_LOG_MAX_ENTRIES,
+    DAEMON_MAX_BACKOFF_SECONDS,
+    OUTPUT_PATH_DAEMON_LOG,
+    SCRAPE_BACKEND,
+)
+from utils.functions import atomic_path, get_logger
+from utils.process_tree import process_tree_usage
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CycleRecord:
+    """One line of the daemon's telemetry log."""
+
+    cycle: int
+    started_at: str
+    status: str  # "ok" or "failed"
+    run_id: str | None = None  # matches data/pipeline_runs.jsonl
+    wall_s: float = 0.0
+    rows: int | None = None  # jobs scraped
+    browser_cycle: int | None = None  # scrapes done by this browser so far
+    browser_rss_mb: float | None = None
+    browser_recycled: bool = False
+    bytes_received: int | None = None  # by the browser during the scrape
+    requests_blocked: int | None = None  # by the lean profile
+    next_in_s: float | None = None
+    error: str | None = None
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# WARM BROWSER
+# ────────────────────────────────────────────────────────────────────────────────
+class BrowserSession:
+    """
+    One WebDriver kept open across scrape cycles, started on first use and
+    replaced after ``max_cycles`` scrapes or once Chrome uses ``max_rss_mb``.
+    """
+
+    def __init__(
+        self,
+        factory=configure_webdriver,
+        max_cycles: int = BROWSER_MAX_CYCLES,
+        max_rss_mb: float = BROWSER_MAX_RSS_MB,
+    ):
+        self.factory = factory
+        self.max_cycles = max_cycles
+        self.max_rss_mb = max_rss_mb
+        self.driver = None
+        self.cycles = 0
+
+    def get(self):
+        if self.driver is None:
+            logger.info("Starting a warm browser")
+            self.driver = self.factory()
+            self.cycles = 0
+        return self.driver
+
+    def memory_mb(self) -> float | None:
+        """Chrome's memory: its process tree on Linux, else the page's JS heap."""
+        if self.driver is None:
+            return None
+        try:
+            usage = process_tree_usage(self.driver.service.process.pid)
+            if usage is not None:
+                return usage.rss_mb
+        except (AttributeError, TypeError, OSError):
+            pass
+        try:
+            heap = self.driver.execute_script(
+                "return performance.memory && performance.memory.usedJSHeapSize"
+            )
+        except Exception:
+            return None
+        return heap / 2**20 if isinstance(heap, (int, float)) else None
+
+    def finish_cycle(self, failed: bool = False) -> tuple[float | None, bool]:
+        """Count a scrape; ``(memory in MB, whether the browser was recycled)``."""
+        if self.driver is None:
+            return None, False
+        self.cycles += 1
+        rss = self.memory_mb()
+        if failed:
+            reason = "a failed cycle"
+        elif self.cycles >= self.max_cycles:
+            reason = f"{self.cycles} cycles"
+        elif rss is not None and rss >= self.max_rss_mb:
+            reason = f"reaching {rss:.0f} MB"
+        else:
+            return rss, False
+        logger.info(f"Recycling the browser after {reason}")
+        self.close()
+        return rss, True
+
+    def close(self) -> None:
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception as e:  # a crashed browser is being replaced anyway
+                logger.warning(f"Could not quit the browser cleanly: {e}")
+            self.driver = None
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# SCHEDULER
+# ────────────────────────────────────────────────────────────────────────────────
+def next_delay(
+    failures: int,
+    interval: float = DAEMON_INTERVAL_SECONDS,
+    jitter: float = DAEMON_JITTER_SECONDS,
+    max_backoff: float = DAEMON_MAX_BACKOFF_SECONDS,
+    rng: random.Random = random,
+) -> float:
+    """
+    Seconds until the next cycle: the interval (doubled per consecutive
+    failure, up to ``max_backoff``) plus uniform jitter.
+    """
+    delay = interval if not failures else min(interval * 2**failures, max_backoff)
+    return max(0.0, delay + rng.uniform(-jitter, jitter))
+
+
+def _log_cycle(record: CycleRecord, path, max_entries: int) -> None:
+    path = Path(path)
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        lines = []
+    lines = (lines + [json.dumps(asdict(record))])[-max_entries:]
+    with atomic_path(path) as tmp_path:
+        tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def run_daemon(
+    pipeline=None,
+    session: BrowserSession | None = None,
+    backend: str = SCRAPE_BACKEND,
+    interval: float = DAEMON_INTERVAL_SECONDS,
+    jitter: float = DAEMON_JITTER_SECONDS,
+    cycles: int | None = None,
+    stop: threading.Event | None = None,
+    log_path=OUTPUT_PATH_DAEMON_LOG,
+    max_log_entries: int = DAEMON_LOG_MAX_ENTRIES,
+    shards=None,
+    pool_factory=shard_pool,
+) -> list[CycleRecord]:
+    """
+    Run scrape cycles until ``stop`` is set (or ``cycles`` have run); returns
+    the telemetry records of the last ``max_log_entries`` cycles.
+    """
+    pipeline = pipeline or build_pipeline()
+    session = session or BrowserSession()
+    stop = stop or threading.Event()
+    shards = shards or configured_shards()
+    sharded = backend != "api" and len(shards) > 1
+    pool = None
+    records: deque[CycleRecord] = deque(maxlen=max_log_entries)
+    cycle = failures = 0
+
+    try:
+        while not stop.is_set() and (cycles is None or cycle < cycles):
+            cycle += 1
+            record = CycleRecord(
+                cycle=cycle,
+                started_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                status="ok",
+            )
+            records.append(record)
+            started = time.perf_counter()
+            context = {"backend": backend, "shards": shards}
+            try:
+                if sharded:
+                    pool = pool or pool_factory()
+                    context["shard_pool"] = pool
+                elif backend != "api":
+                    context["driver"] = session.get()
+                stage_records = pipeline.run(context=context)
+                failures = 0
+                record.run_id = stage_records[0].run_id if stage_records else None
+                record.rows = next(
+                    (r.rows for r in stage_records if r.stage == "scrape"), None
+                )
+                usage = context.get("browser_usage") or {}
+                record.bytes_received = usage.get("bytes")
+                record.requests_blocked = usage.get("blocked")
+            except Exception as e:
+                failures += 1
+                record.status, record.error = "failed", repr(e)
+                logger.error(f"Scrape cycle {record.cycle} failed → {e}")
+                if pool is not None:  # its browsers may be what failed
+                    pool.shutdown(cancel_futures=True)
+                    pool = None
+            record.wall_s = round(time.perf_counter() - started, 3)
+            used_browser = session.driver is not None
+            record.browser_rss_mb, record.browser_recycled = session.finish_cycle(
+                failed=record.status == "failed"
+            )
+            record.browser_cycle = session.cycles if used_browser else None
+
+            record.next_in_s = round(next_delay(failures, interval, jitter), 1)
+            _log_cycle(record, log_path, max_log_entries)
+            logger.info(
+                f"Cycle {record.cycle} {record.status} in {record.wall_s:.1f}s "
+                f"({record.rows} jobs); next in {record.next_in_s:.0f}s"
+            )
+            if cycles is not None and cycle >= cycles:
+                break
+            stop.wait(record.next_in_s)
+    finally:
+        session.close()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return list(records)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Scrape on an internal schedule with a warm browser."
+    )
+    parser.add_argument("--interval", type=float, default=DAEMON_INTERVAL_SECONDS)
+    parser.add_argument("--jitter", type=float, default=DAEMON_JITTER_SECONDS)
+    parser.add_argument("--backend", choices=("browser", "api"), default=SCRAPE_BACKEND)
+    parser.add_argument(
+        "--cycles", type=int, help="exit after this many cycles (default: run forever)"
+    )
+    args = parser.parse_args(argv)
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    logger.info(
+        f"Scraper daemon started: every {args.interval:.0f}s ± {args.jitter:.0f}s "
+        f"({args.backend} backend)"
+    )
+    run_daemon(
+        backend=args.backend,
+        interval=args.interval,
+        jitter=args.jitter,
+        cycles=args.cycles,
+        stop=stop,
+    )
+    logger.info("Scraper daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
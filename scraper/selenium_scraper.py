@@ -13,25 +13,62 @@ from Tech in Asia, saving results to '<project_root>/data/techinasia_jobs_seleni
 - Captures `image_url` for each job (company logo) and writes/merges into a *master* CSV, deduplicated by the job’s canonical link.
 """
 
+from __future__ import annotations
 
+import argparse
+import importlib
+import json
 import sys
+import threading
 import time
 import traceback
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
-from data_processing import cleanup_and_analyse
-from utils.constants import INITIAL_WAIT_TIMEOUT, SCROLL_PAUSE_TIME
+from utils.constants import (
+    BLOCKED_URL_PATTERNS,
+    BROWSER_PROFILE,
+    DOM_EXTRACTION,
+    FULL_SWEEP_INTERVAL_HOURS,
+    INITIAL_WAIT_TIMEOUT,
+    LEAN_CHROME_ARGUMENTS,
+    OUTPUT_PATH_CHANGES,
+    OUTPUT_PATH_CHANGES_PENDING,
+    OUTPUT_PATH_DB,
+    OUTPUT_PATH_LAST_SCRAPE,
+    OUTPUT_PATH_REPORT_JSON,
+    OUTPUT_PATH_SANITISED,
+    OUTPUT_PATH_SCRAPE_STATE,
+    PROCESSING_CHUNKSIZE,
+    SCRAPE_BACKEND,
+    SCROLL_IDLE_TIME,
+    SCROLL_PAUSE_TIME,
+    SCROLL_WAIT_TIMEOUT,
+    STOP_AFTER_KNOWN,
+    STORAGE_BACKEND,
+)
 from utils.enums import URL, CSSSelector
-from utils.functions import get_csv_path, get_logger
+from utils.functions import atomic_path, get_csv_path, get_logger
+from utils.pipeline import Pipeline, Stage
+from utils.process_tree import process_tree_usage
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = get_logger(__name__)
 
+# pandas and the processing pipeline are only needed once the browser is done.
+# They are imported lazily (see _preload_pipeline) so a cron start reaches
+# Chrome without paying for them first.
+PIPELINE_MODULES = ("pandas", "data_processing", "utils.changelog", "utils.job_store")
+
 # ────────────────────────────────────────────────────────────────────────────────
 # CONSTANTS / CONFIGURATION  (delegated to utils.enums)
 # ────────────────────────────────────────────────────────────────────────────────
@@ -47,10 +84,114 @@ CSS_COMPENSATION = CSSSelector.COMPENSATION.value
 CSS_PUBLISHED_DATE = CSSSelector.PUBLISHED_DATE.value
 CSS_METADATA = CSSSelector.METADATA.value
 
-
-def configure_webdriver() -> webdriver.Chrome:
+# Batch extraction: the page serialises every card from index ``arguments[1]``
+# on (same selectors and rules as extract_job_data_from_card; ``null`` for a
+# card missing its title, company or location) and reports its card count and
+# height, so a scroll round costs one round trip however many cards it reads.
+# Starts over from 0 if the list shrank (cards were unmounted).
+EXTRACT_CARDS_JS = """
+const css = arguments[0];
+const cards = document.querySelectorAll(css.card);
+const start = arguments[1] <= cards.length ? arguments[1] : 0;
+const text = (card, selector) => {
+  const el = card.querySelector(selector);
+  return el ? el.innerText.trim() : null;
+};
+const jobs = [];
+for (let i = start; i < cards.length; i++) {
+  const card = cards[i];
+  const title = card.querySelector(css.title);
+  const company = text(card, css.company);
+  const location = text(card, css.location);
+  if (!title || !title.href || company === null || location === null) {
+    jobs.push(null);
+    continue;
+  }
+  const img = card.querySelector(css.avatar);
+  const meta = card.querySelector(css.metadata);
+  jobs.push({
+    title: title.innerText.trim(),
+    company: company,
+    location: location,
+    link: title.href.trim(),
+    image_url: img ? (img.src || img.getAttribute("data-src") || "").trim() : "",
+    compensation: text(card, css.compensation) || "",
+    published_date: text(card, css.published) || "",
+    metadata: meta
+      ? Array.from(meta.querySelectorAll("li"), li => li.innerText.trim()).join(",")
+      : "",
+  });
+}
+return {count: cards.length, height: document.body.scrollHeight, jobs: jobs};
+"""
+# Scroll to the bottom, then wait in the page (execute_async_script) for the
+# first of: more than ``arguments[1]`` job cards attached ("grew", via a
+# MutationObserver); the page's fetch/XHR traffic idle for ``arguments[3]`` ms
+# with no new card ("end" of the list); ``arguments[2]`` ms passing ("timeout").
+# The network hooks are installed once per page and only count requests.
+SCROLL_AND_WAIT_JS = """
+const [selector, previous, timeoutMs, idleMs] = arguments;
+const done = arguments[arguments.length - 1];
+if (!window.__scrapeNet) {
+  const net = (window.__scrapeNet = {inFlight: 0, lastActivity: performance.now()});
+  const begin = () => { net.inFlight++; net.lastActivity = performance.now(); };
+  const end = () => { net.inFlight--; net.lastActivity = performance.now(); };
+  const fetch = window.fetch;
+  window.fetch = function (...args) {
+    begin();
+    return fetch.apply(this, args).finally(end);
+  };
+  const send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function (...args) {
+    begin();
+    this.addEventListener("loadend", end, {once: true});
+    return send.apply(this, args);
+  };
+}
+const net = window.__scrapeNet;
+const count = () => document.querySelectorAll(selector).length;
+let observer, poll, timer, finished = false;
+const finish = (reason) => {
+  if (finished) return;
+  finished = true;
+  observer.disconnect();
+  clearInterval(poll);
+  clearTimeout(timer);
+  done(reason);
+};
+observer = new MutationObserver(() => { if (count() > previous) finish("grew"); });
+observer.observe(document.body, {childList: true, subtree: true});
+window.scrollTo(0, document.body.scrollHeight);
+const scrolledAt = performance.now();
+net.lastActivity = Math.max(net.lastActivity, scrolledAt);
+timer = setTimeout(() => finish("timeout"), timeoutMs);
+poll = setInterval(() => {
+  if (count() > previous) return finish("grew");
+  if (net.inFlight === 0 && performance.now() - net.lastActivity >= idleMs) {
+    finish("end");
+  }
+}, 50);
+"""
+CARD_SELECTORS = {
+    "card": JOB_CARD_SELECTOR,
+    "title": CSS_TITLE_LINK,
+    "company": CSS_COMPANY_LINK,
+    "location": CSS_LOCATION_DIV,
+    "avatar": CSS_AVATAR_IMG,
+    "compensation": CSS_COMPENSATION,
+    "published": CSS_PUBLISHED_DATE,
+    "metadata": CSS_METADATA,
+}
+
+
+def configure_webdriver(profile: str = BROWSER_PROFILE) -> webdriver.Chrome:
     """
     Instantiate and return a headless Chrome WebDriver.
+
+    The "lean" profile skips everything the scraper never reads: images, media,
+    fonts and analytics hosts are blocked (``.avatar img`` keeps its ``src``
+    attribute) and background Chrome features are off. Either profile logs
+    network events for :func:`browser_usage`.
     """
     chrome_options = Options()
     chrome_options.add_argument("--headless")  # no browser window
@@ -58,6 +199,10 @@ def configure_webdriver() -> webdriver.Chrome:
     chrome_options.add_argument(
         "--disable-dev-shm-usage"
     )  # avoid /dev/shm issues in containers
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    if profile == "lean":
+        for argument in LEAN_CHROME_ARGUMENTS:
+            chrome_options.add_argument(argument)
 
     # You can also set a custom user‐agent here if you want to mimic a real browser more closely:
     # chrome_options.add_argument("user-agent=MyCustomAgent/1.0")
@@ -67,10 +212,46 @@ def configure_webdriver() -> webdriver.Chrome:
     # Give the headless browser a realistic viewport; some lazy‑load
     # triggers depend on a non‑zero window height.
     driver.set_window_size(1920, 1080)
+    if profile == "lean":
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
     # If Chromedriver isn’t on your PATH, pass executable_path=...
     return driver
 
 
+def browser_usage(driver) -> dict:
+    """
+    Requests sent, requests blocked and bytes received since the last call
+    (drained from Chrome's performance log), plus the memory and cumulative
+    CPU time of chromedriver and its Chrome processes (``None`` without /proc).
+    """
+    usage = {"requests": 0, "blocked": 0, "bytes": 0}
+    try:
+        entries = driver.get_log("performance")
+    except Exception as e:  # e.g. a driver started without performance logging
+        logger.debug(f"No performance log: {e}")
+        entries = []
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            usage["requests"] += 1
+        elif method == "Network.loadingFinished":
+            usage["bytes"] += int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            usage["blocked"] += 1
+    try:
+        tree = process_tree_usage(driver.service.process.pid)
+    except (AttributeError, TypeError, OSError):
+        tree = None
+    usage["browser_rss_mb"] = round(tree.rss_mb, 1) if tree else None
+    usage["browser_cpu_s"] = round(tree.cpu_s, 2) if tree else None
+    return usage
+
+
 def extract_job_data_from_card(job_card) -> dict:
     """
     Given a Selenium WebElement for a single job card, extract title, company, location, link.
@@ -137,21 +318,137 @@ def extract_job_data_from_card(job_card) -> dict:
     return job_info
 
 
+def extract_new_jobs(driver, start: int) -> tuple[list[dict], int, int]:
+    """
+    ``(jobs, card count, page height)`` for the cards from index ``start`` on,
+    in a single ``execute_script`` call. Jobs have the same fields as
+    :func:`extract_job_data_from_card` (an empty dict for an unparsable card).
+    """
+    result = driver.execute_script(EXTRACT_CARDS_JS, CARD_SELECTORS, start)
+    jobs = []
+    for row in result["jobs"]:
+        if not row:
+            logger.warning("Failed to parse a job card: no title, company or location")
+            jobs.append({})
+            continue
+        link = row["link"]
+        job_info = {"id": link.rstrip("/").rsplit("/", 1)[-1], **row}
+        logger.debug(f"Extracted job: {job_info['title']} @ {job_info['company']}")
+        jobs.append(job_info)
+    return jobs, result["count"], result["height"]
+
+
+def scroll_and_wait(driver, card_count: int) -> str:
+    """
+    Scroll to the bottom of the listing and return as soon as more than
+    ``card_count`` cards are on the page ("grew"), the page stopped loading
+    without adding any ("end"), or SCROLL_WAIT_TIMEOUT passed ("timeout").
+    """
+    return driver.execute_async_script(
+        SCROLL_AND_WAIT_JS,
+        JOB_CARD_SELECTOR,
+        card_count,
+        int(SCROLL_WAIT_TIMEOUT * 1000),
+        int(SCROLL_IDLE_TIME * 1000),
+    )
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _preload_pipeline() -> threading.Thread:
+    """
+    Import the post-scrape modules on a background thread while the main
+    thread waits on Chrome. Later ``import`` statements simply pick up the
+    finished modules (or block on the import lock until they are).
+    """
+
+    def _load():
+        for name in PIPELINE_MODULES:
+            try:
+                importlib.import_module(name)
+            except Exception as e:  # surfaced again by the real import
+                logger.debug(f"Preloading {name} failed: {e}")
+                return
+
+    thread = threading.Thread(target=_load, name="pipeline-preload", daemon=True)
+    thread.start()
+    return thread
+
+
 # ────────────────────────────────────────────────────────────────────────────────
 # MAIN SCRAPING LOGIC
 # ────────────────────────────────────────────────────────────────────────────────
-def scrape_all_jobs() -> pd.DataFrame:
+def scrape_all_jobs(
+    url: str = TECH_IN_ASIA_URL,
+    extraction: str = DOM_EXTRACTION,
+    known_ids: set[str] | None = None,
+    stop_after_known: int = STOP_AFTER_KNOWN,
+    driver=None,
+    usage: dict | None = None,
+) -> pd.DataFrame:
     """
-    Launches a headless browser, navigates to the Tech in Asia page, waits for
-    initial jobs to load, then scrolls until no new jobs appear. Returns a DataFrame.
+    Launches a headless browser, navigates to the Tech in Asia search ``url``
+    (see scraper/shards.py), waits for initial jobs to load, then scrolls until
+    no new jobs appear. Returns a DataFrame.
+
+    ``extraction="batch"`` reads each round's new cards with one script call
+    (see EXTRACT_CARDS_JS); ``"cards"`` re-reads every card element by element.
+
+    With ``known_ids`` (incremental mode) scrolling also stops once
+    ``stop_after_known`` consecutive cards are known: the listing is sorted
+    newest-first, so everything below them has been scraped before.
+
+    A ``driver`` passed in (the daemon's warm browser) is reused and left
+    open; otherwise a fresh one is started and quit afterwards. ``usage`` is
+    filled with this run's network traffic and browser CPU / memory (see
+    :func:`browser_usage`).
     """
-    driver = configure_webdriver()
+    owns_driver = driver is None
+    if owns_driver:
+        driver = configure_webdriver()
+    before = browser_usage(driver)  # also drops events of earlier runs
     all_jobs = []  # Accumulate job‐dicts here
     seen_ids = set()  # Keep track of which job IDs we've already scraped
+    known_run = 0  # consecutive cards, in page order, already in known_ids
+
+    def read_round(start: int) -> tuple[list[dict], int, int]:
+        """(jobs on the page, card count, page height) after a scroll."""
+        if extraction == "batch":
+            return extract_new_jobs(driver, start)
+        height = driver.execute_script("return document.body.scrollHeight")
+        cards = driver.find_elements(By.CSS_SELECTOR, JOB_CARD_SELECTOR)
+        return [extract_job_data_from_card(card) for card in cards], len(cards), height
+
+    def collect(jobs: list[dict]) -> int:
+        # Each row records when it was seen: relative dates ("1d ago") are
+        # resolved against it later.
+        nonlocal known_run
+        scraped_at = _utc_now()
+        added = 0
+        for data in jobs:
+            if data and data.get("id") not in seen_ids:
+                data["scraped_at"] = scraped_at
+                all_jobs.append(data)
+                seen_ids.add(data["id"])
+                added += 1
+                if known_ids is not None:
+                    known_run = known_run + 1 if data["id"] in known_ids else 0
+        return added
+
+    def caught_up() -> bool:
+        if known_ids is None or known_run < stop_after_known:
+            return False
+        logger.info(
+            f"Reached {known_run} consecutive known jobs; stopping the "
+            f"incremental scrape"
+        )
+        return True
 
     try:
-        logger.info(f"Navigating to {TECH_IN_ASIA_URL}")
-        driver.get(TECH_IN_ASIA_URL)
+        logger.info(f"Navigating to {url}")
+        driver.get(url)
 
         # 1) Wait for the first batch of job cards to appear
         logger.debug(
@@ -163,52 +460,43 @@ def scrape_all_jobs() -> pd.DataFrame:
         )
         logger.info(f"Initial load: found {len(initial_cards)} job cards")
 
-        # 2) Scrape whatever's already on screen
-        for card in initial_cards:
-            data = extract_job_data_from_card(card)
-            if data and data.get("id") not in seen_ids:
-                all_jobs.append(data)
-                seen_ids.add(data["id"])
+        # 2) Scrape whatever's already on screen.
+        jobs, previous_count, previous_height = read_round(0)
+        collect(jobs)
 
         # 3) Scroll to the bottom repeatedly until no new cards are added.
         #
         # Strategy:
-        #   • Grab the current document.body.scrollHeight.
-        #   • Scroll to the very bottom.
-        #   • Wait a few seconds for network requests / DOM mutations.
-        #   • Count job cards; if the count grows, scrape the new ones and repeat.
+        #   • Scroll to the very bottom and wait in the page until new cards
+        #     are attached, the page's requests go idle without any (the end
+        #     of the list), or SCROLL_WAIT_TIMEOUT passes.
+        #   • Read the cards past the ones already processed (batch mode) or
+        #     all of them (cards mode), with the new height and card count.
         #   • If the DOM height AND the job‑card count both stay constant for
         #     `MAX_NO_GROWTH_ROUNDS` consecutive rounds, assume we’re done.
-        previous_height = driver.execute_script("return document.body.scrollHeight")
-        previous_count = len(seen_ids)
+        #   • Incremental mode: also done once a run of known jobs is reached.
         no_growth_rounds = 0
         MAX_NO_GROWTH_ROUNDS = 2
+        driver.set_script_timeout(SCROLL_WAIT_TIMEOUT + 5)
+        last_scroll = time.monotonic()  # the page load was the first request
 
-        while no_growth_rounds < MAX_NO_GROWTH_ROUNDS:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            logger.debug("Scrolled to bottom; waiting for potential new content...")
-
+        while no_growth_rounds < MAX_NO_GROWTH_ROUNDS and not caught_up():
             # --- Politeness / throttling ------------------------------------------------
-            # We deliberately pause 2s between scroll-fetch cycles (SCROLL_PAUSE_TIME)
-            # and cap the browser’s max scroll rate so we don’t hammer techinasia.com
-            # with rapid-fire requests.  This keeps our footprint light and avoids
-            # triggering any rate-limit or CAPTCHA.
-            time.sleep(SCROLL_PAUSE_TIME)
-
-            # Recompute height and card count
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            current_cards = driver.find_elements(By.CSS_SELECTOR, JOB_CARD_SELECTOR)
-            current_count = len(current_cards)
+            # Scrolls – and so the fetches they trigger – start at least
+            # SCROLL_PAUSE_TIME (2s) apart, so we don’t hammer techinasia.com with
+            # rapid-fire requests. A round that loads slower than that is not
+            # delayed further: the wait below returns when the cards arrive.
+            time.sleep(max(0.0, last_scroll + SCROLL_PAUSE_TIME - time.monotonic()))
+            last_scroll = time.monotonic()
+            outcome = scroll_and_wait(driver, previous_count)
+            logger.debug(f"Scrolled to bottom → {outcome}")
+            if outcome == "end":
+                logger.info(f"End of the list reached at {previous_count} job cards")
+                break
 
             # Extract any *new* cards this round
-            new_jobs_this_round = 0
-            for card in current_cards:
-                data = extract_job_data_from_card(card)
-
-                if data and data.get("id") not in seen_ids:
-                    all_jobs.append(data)
-                    seen_ids.add(data["id"])
-                    new_jobs_this_round += 1
+            jobs, current_count, new_height = read_round(previous_count)
+            new_jobs_this_round = collect(jobs)
 
             if new_height == previous_height and current_count == previous_count:
                 no_growth_rounds += 1
@@ -227,6 +515,8 @@ def scrape_all_jobs() -> pd.DataFrame:
                 no_growth_rounds = 0
 
         # 4) Once scrolling is done, convert to DataFrame
+        import pandas as pd
+
         if not all_jobs:
             logger.warning("No jobs were scraped; returning an empty DataFrame.")
             return pd.DataFrame()
@@ -246,39 +536,226 @@ def scrape_all_jobs() -> pd.DataFrame:
         raise
 
     finally:
-        # Always quit the browser
-        logger.debug("Quitting WebDriver")
-        driver.quit()
+        after = browser_usage(driver)
+        if before["browser_cpu_s"] is not None and after["browser_cpu_s"] is not None:
+            after["browser_cpu_s"] = round(
+                after["browser_cpu_s"] - before["browser_cpu_s"], 2
+            )
+        logger.info(
+            f"Browser: {after['requests']} requests ({after['blocked']} blocked), "
+            f"{after['bytes'] / 2**20:.2f} MB received, "
+            f"{after['browser_cpu_s']} s CPU, {after['browser_rss_mb']} MB resident"
+        )
+        if usage is not None:
+            usage.update(after)
+        # Always quit the browser (unless it belongs to the caller)
+        if owns_driver:
+            logger.debug("Quitting WebDriver")
+            driver.quit()
 
 
-def main():
+def upsert_into_store(
+    scraped_df: pd.DataFrame, legacy_csv_path, chunksize: int = 0
+) -> tuple:
     """
-    The main entry point. Calls scrape_all_jobs(), then writes to CSV under <project_root>/data/.
+    Upsert a scrape into the SQLite master store in one transaction.
+
+    Returns ``(master_df, existing_df)``: the full master dataset after the
+    upsert and the pre-upsert rows of the scraped ids (for the change log).
+    On first use the store is seeded from the legacy master CSV. With a
+    ``chunksize`` the seeding is streamed and ``master_df`` is ``None``; the
+    caller reads the store back in chunks instead.
     """
-    # 1) Figure out project root, ensure <project_root>/data/ exists
-    output_path = get_csv_path()
+    import pandas as pd
 
-    try:
-        # 2) Run the scraper
-        df_jobs = scrape_all_jobs()
+    from utils.job_store import JobStore
+    from utils.streaming import iter_csv_chunks
 
-        # ── UPSERT into master CSV ───────────────────────────────────────────
-        if output_path.exists() and not output_path.is_dir():
-            try:
-                existing_df = pd.read_csv(output_path)
-                combined_df = pd.concat([existing_df, df_jobs], ignore_index=True)
-                # Use the UUID‑based 'id' column as primary key for deduplication
-                combined_df.drop_duplicates(subset="id", inplace=True)
-                df_jobs = combined_df
-                logger.info(
-                    f"Upsert complete → {len(existing_df)} existing rows + "
-                    f"{len(df_jobs) - len(existing_df)} new or updated rows "
-                    f"= {len(df_jobs)} total"
+    with JobStore() as store:
+        if store.count() == 0 and legacy_csv_path.exists():
+            if chunksize:
+                seeded = sum(
+                    store.upsert(chunk)
+                    for chunk in iter_csv_chunks(legacy_csv_path, chunksize)
                 )
-            except Exception as merge_e:
-                logger.warning(f"Could not merge with existing CSV: {merge_e}")
+            else:
+                seeded = store.upsert(pd.read_csv(legacy_csv_path))
+            logger.info(f"Seeded job store with {seeded} rows from {legacy_csv_path}")
+
+        existing_df = pd.DataFrame()
+        if not scraped_df.empty:
+            existing_df = store.fetch(scraped_df["id"])
+            store.upsert(scraped_df)
+            logger.info(
+                f"Upsert complete → {len(existing_df)} existing + "
+                f"{len(scraped_df) - len(existing_df)} new rows "
+                f"= {store.count()} total"
+            )
+        return (None if chunksize else store.read_all()), existing_df
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# PIPELINE STAGES  (scrape → upsert → process → changelog, see utils.pipeline)
+# ────────────────────────────────────────────────────────────────────────────────
+def _master_path() -> str:
+    return OUTPUT_PATH_DB if STORAGE_BACKEND == "sqlite" else str(get_csv_path())
+
+
+def _read_scrape_state() -> dict:
+    try:
+        return json.loads(Path(OUTPUT_PATH_SCRAPE_STATE).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
 
-        # 3) Save to CSV
+
+def _full_sweep_due(state: dict) -> bool:
+    last = state.get("last_full_sweep_at")
+    if FULL_SWEEP_INTERVAL_HOURS <= 0 or last is None:
+        return True
+    age = datetime.now(timezone.utc) - datetime.fromisoformat(last)
+    return age >= timedelta(hours=FULL_SWEEP_INTERVAL_HOURS)
+
+
+def _known_ids() -> set[str]:
+    """Ids already in the master store (empty if there is none yet)."""
+    import pandas as pd
+
+    if STORAGE_BACKEND == "sqlite":
+        from utils.job_store import JobStore
+
+        with JobStore() as store:
+            return store.ids()
+    try:
+        ids = pd.read_csv(get_csv_path(), usecols=["id"], dtype=str)["id"]
+    except (FileNotFoundError, ValueError, pd.errors.EmptyDataError):
+        return set()
+    return set(ids.dropna())
+
+
+def scrape_stage(context: dict) -> int:
+    """
+    Scrape the listings into data/last_scrape.csv, with Chrome ("browser") or
+    from the site's search API ("api", see scraper/api_ingest.py).
+
+    Each configured search shard (see scraper/shards.py) is scraped – several
+    browser shards concurrently in a process pool – and the results merged
+    by job id, with the searches that listed each job in the ``shard`` column.
+
+    Browser scrapes are incremental – they stop at the first run of jobs
+    already in the master store – except for a full sweep every
+    FULL_SWEEP_INTERVAL_HOURS (or with ``--full-sweep``). Whether the scrape
+    was complete goes to data/scrape_state.json for the upsert stage, with the
+    browser's traffic and CPU / memory use.
+    """
+    from scraper.shards import (
+        configured_shards,
+        merge_shards,
+        scrape_shards,
+        total_usage,
+    )
+    from utils.functions import write_csv_atomic
+
+    state = _read_scrape_state()
+    shards = context.get("shards") or configured_shards()
+    known_ids = None
+    failed = []
+    if context.get("backend", SCRAPE_BACKEND) == "api":
+        from scraper.api_ingest import scrape_all_jobs_api
+
+        # Every page of a shard in seconds, so shards simply run in turn.
+        df_jobs = merge_shards(
+            [(shard, scrape_all_jobs_api(shard=shard)) for shard in shards]
+        )
+        state.pop("last_scrape_browser", None)
+    else:
+        if not (context.get("full_sweep") or _full_sweep_due(state)):
+            known_ids = _known_ids() or None
+        logger.info(
+            f"{'Incremental' if known_ids else 'Full'} scrape of {len(shards)} "
+            f"shard(s) (last full sweep: {state.get('last_full_sweep_at', 'never')})"
+        )
+        usage = context["browser_usage"] = {}
+        if len(shards) == 1:
+            jobs = scrape_all_jobs(
+                url=shards[0].url,
+                known_ids=known_ids,
+                driver=context.get("driver"),
+                usage=usage,
+            )
+            df_jobs = merge_shards([(shards[0], jobs)])
+        else:
+            results = scrape_shards(
+                shards, known_ids=known_ids, pool=context.get("shard_pool")
+            )
+            df_jobs, failed = results.jobs, results.failed
+            usage.update(total_usage(results.usage.values()))
+        state["last_scrape_browser"] = usage
+    write_csv_atomic(df_jobs, OUTPUT_PATH_LAST_SCRAPE, index=False)
+
+    # A failed shard's listings are missing, not removed.
+    complete = known_ids is None and not failed
+    state["last_scrape_complete"] = complete
+    state["last_scrape_shards"] = {
+        shard.name: "failed" if shard.name in failed else "ok" for shard in shards
+    }
+    if complete and not df_jobs.empty:
+        state["last_full_sweep_at"] = _utc_now()
+    with atomic_path(OUTPUT_PATH_SCRAPE_STATE) as tmp_path:
+        tmp_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    context["scraped_df"] = df_jobs
+    return len(df_jobs)
+
+
+def upsert_stage(context: dict) -> int:
+    """
+    Upsert the last scrape into the master store, and diff it against the
+    rows it replaced. The change set is only parked here; changelog_stage
+    records it once the sanitised data is published.
+    """
+    import pandas as pd
+
+    from utils.changelog import diff_scrape, read_listed_ids, write_pending_change_set
+    from utils.streaming import stream_upsert_csv
+
+    output_path = get_csv_path()
+    df_jobs = context.get("scraped_df")
+    if df_jobs is None:
+        try:
+            df_jobs = pd.read_csv(OUTPUT_PATH_LAST_SCRAPE)
+        except pd.errors.EmptyDataError:  # a scrape that found nothing
+            df_jobs = pd.DataFrame()
+    scraped_df = df_jobs
+    existing_df = pd.DataFrame()
+
+    # ── UPSERT into the master store ─────────────────────────────────────────
+    if STORAGE_BACKEND == "sqlite":
+        df_jobs, existing_df = upsert_into_store(
+            df_jobs, output_path, chunksize=PROCESSING_CHUNKSIZE
+        )
+    elif PROCESSING_CHUNKSIZE and not df_jobs.empty:
+        # Master too large to hold in memory: rewrite it chunk by chunk
+        existing_df = stream_upsert_csv(output_path, df_jobs, PROCESSING_CHUNKSIZE)
+        df_jobs = None
+    elif PROCESSING_CHUNKSIZE and output_path.exists():
+        df_jobs = None  # nothing scraped, nothing to rewrite
+    elif output_path.exists() and not output_path.is_dir():
+        try:
+            existing_df = pd.read_csv(output_path)
+            combined_df = pd.concat([existing_df, df_jobs], ignore_index=True)
+            # Use the UUID‑based 'id' column as primary key for deduplication;
+            # keep the freshly scraped copy so field updates land in master.
+            combined_df.drop_duplicates(subset="id", keep="last", inplace=True)
+            df_jobs = combined_df
+            logger.info(
+                f"Upsert complete → {len(existing_df)} existing rows + "
+                f"{len(df_jobs) - len(existing_df)} new or updated rows "
+                f"= {len(df_jobs)} total"
+            )
+        except Exception as merge_e:
+            logger.warning(f"Could not merge with existing CSV: {merge_e}")
+
+    # Save to CSV (the SQLite backend / streamed upsert already persisted rows)
+    if df_jobs is not None and STORAGE_BACKEND != "sqlite":
         if not df_jobs.empty:
             df_jobs.to_csv(output_path, index=False)
             logger.info(f"CSV written successfully to: {output_path}")
@@ -286,9 +763,136 @@ def main():
             # Even if it’s empty, write an empty CSV (or decide not to write at all)
             df_jobs.to_csv(output_path, index=False)
             logger.warning(f"Wrote an empty CSV to {output_path} (no jobs found)")
+    context["master_df"] = df_jobs
+
+    # An empty scrape is a failed run, not "every listing disappeared".
+    if not scraped_df.empty:
+        _, previously_listed = read_listed_ids()
+        # An incremental scrape only saw the top of the listing; the rest is
+        # assumed to be still listed until the next full sweep.
+        complete = _read_scrape_state().get("last_scrape_complete", True)
+        change_set = diff_scrape(
+            existing_df, scraped_df, previously_listed, complete=complete
+        )
+        listed_ids = set(scraped_df["id"])
+        if not complete:
+            listed_ids |= previously_listed or set()
+        write_pending_change_set(change_set, listed_ids=listed_ids)
+    return len(scraped_df)
+
+
+def process_stage(context: dict) -> int:
+    """Clean the master dataset, publish it with its report and charts."""
+    import pandas as pd
+
+    from data_processing import cleanup_and_analyse, stream_cleanup_and_analyse
+    from utils.job_store import JobStore
+    from utils.streaming import iter_csv_chunks
+
+    if PROCESSING_CHUNKSIZE:
+        if STORAGE_BACKEND == "sqlite":
+            with JobStore() as store:
+                return stream_cleanup_and_analyse(
+                    store.iter_chunks(PROCESSING_CHUNKSIZE)
+                )
+        return stream_cleanup_and_analyse(
+            iter_csv_chunks(get_csv_path(), PROCESSING_CHUNKSIZE)
+        )
+
+    df_jobs = context.get("master_df")
+    if df_jobs is None:
+        if STORAGE_BACKEND == "sqlite":
+            with JobStore() as store:
+                df_jobs = store.read_all()
+        else:
+            df_jobs = pd.read_csv(get_csv_path())
+    return len(cleanup_and_analyse(df_jobs, incremental=True))  # charts + clean CSV
 
-        cleanup_and_analyse(df_jobs)  # produces charts + clean CSV
 
+def changelog_stage(context: dict) -> int:
+    """
+    Record what this run changed, for /api/v1/jobs/changes. Runs after the
+    sanitised CSV is published, so the log never points at rows the API
+    cannot serve yet.
+    """
+    from utils.changelog import read_pending_change_set, record_change_set
+
+    change_set, listed_ids = read_pending_change_set()
+    change_set = record_change_set(change_set, listed_ids=listed_ids)
+    Path(OUTPUT_PATH_CHANGES_PENDING).unlink()
+    return len(change_set.added) + len(change_set.changed) + len(change_set.removed)
+
+
+def build_pipeline() -> Pipeline:
+    master = _master_path()
+    return Pipeline(
+        [
+            Stage("scrape", scrape_stage, outputs=[OUTPUT_PATH_LAST_SCRAPE]),
+            Stage(
+                "upsert",
+                upsert_stage,
+                inputs=[OUTPUT_PATH_LAST_SCRAPE],
+                outputs=[master],
+            ),
+            Stage(
+                "process",
+                process_stage,
+                inputs=[master],
+                outputs=[OUTPUT_PATH_SANITISED, OUTPUT_PATH_REPORT_JSON],
+            ),
+            # Identical pending change sets (e.g. two quiet runs) must each
+            # still be recorded to advance the sequence.
+            Stage(
+                "changelog",
+                changelog_stage,
+                inputs=[OUTPUT_PATH_CHANGES_PENDING],
+                outputs=[OUTPUT_PATH_CHANGES],
+                cached=False,
+            ),
+        ]
+    )
+
+
+def main(argv=None):
+    """
+    The main entry point: scrape, upsert into the master store, clean and
+    publish, then log the changes – as pipeline stages that are skipped when
+    their inputs did not change. Per-stage timings go to data/pipeline_runs.jsonl.
+    """
+    pipeline = build_pipeline()
+    parser = argparse.ArgumentParser(description="Scrape and publish jobs.")
+    parser.add_argument(
+        "--from-stage",
+        choices=pipeline.stage_names,
+        help="start here, reusing earlier outputs (e.g. 'process' to reprocess "
+        "without rescraping)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="rerun every stage even if its inputs are unchanged",
+    )
+    parser.add_argument(
+        "--full-sweep",
+        action="store_true",
+        help="scroll the whole listing even if a full sweep ran recently",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=("browser", "api"),
+        default=SCRAPE_BACKEND,
+        help="scroll the listing page in Chrome, or page through the search API "
+        "(default: $JOBS_SCRAPE_BACKEND or 'browser')",
+    )
+    args = parser.parse_args(argv)
+
+    _preload_pipeline()
+    try:
+        pipeline.run(
+            start=args.from_stage,
+            force=args.force,
+            context={"backend": args.backend, "full_sweep": args.full_sweep},
+        )
     except Exception as e:
         logger.error(f"Aborting: could not complete scraping → {e}")
         sys.exit(1)
@@ -0,0 +1,264 @@
+"""
+shards.py
+
+Sharded scraping: a scrape is a list of searches (shards) built from the
+``Country`` / ``JobType`` / ``Currency`` filters in utils/enums.py, e.g. one
+per country × job type via ``JOBS_SEARCH_COUNTRIES`` / ``JOBS_SEARCH_JOB_TYPES``.
+
+- Browser shards run concurrently in a bounded process pool
+  (``JOBS_SCRAPE_WORKERS``); each worker process starts one Chrome on its
+  first shard and reuses it for the next ones, so wall-clock time follows
+  the number of workers rather than the number of shards.
+- Results are merged with cross-shard dedupe by ``id``; the ``shard``
+  column records every search that listed the job (``;``-separated, in
+  shard order).
+- A failed shard does not sink the others: the scrape is only reported as
+  incomplete (see ``ShardResults.failed``).
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass, field
+from urllib.parse import urlencode
+
+import pandas as pd
+
+from utils.constants import (
+    BROWSER_MAX_CYCLES,
+    SCRAPE_WORKERS,
+    SEARCH_COUNTRIES,
+    SEARCH_CURRENCY,
+    SEARCH_JOB_TYPES,
+)
+from utils.enums import URL, Country, Currency, JobType
+from utils.functions import get_logger
+
+logger = get_logger(__name__)
+
+SEARCH_URL = URL.TARGET.value
+
+
+@dataclass(frozen=True)
+class SearchShard:
+    """One search of the listing: the countries and job types it OR-s."""
+
+    countries: tuple[Country, ...]
+    job_types: tuple[JobType, ...]
+    currency: Currency = Currency.SGD
+
+    @property
+    def name(self) -> str:
+        """Provenance label, e.g. ``"Singapore+Remote/Full-time/SGD"``."""
+        countries = "+".join(country.value for country in self.countries)
+        job_types = "+".join(job_type.value for job_type in self.job_types)
+        return f"{countries}/{job_types}/{self.currency.value}"
+
+    @property
+    def url(self) -> str:
+        """The listing page the browser backend opens."""
+        params = [("country_name[]", country.value) for country in self.countries]
+        params += [("job_type[]", job_type.value) for job_type in self.job_types]
+        params.append(("currency", self.currency.value))
+        return f"{SEARCH_URL}?{urlencode(params, safe='[]')}"
+
+    @property
+    def tag_filters(self) -> list[list[str]]:
+        """The same search for the API backend (inner lists OR-ed, lists AND-ed)."""
+        return [
+            [f"job_type.name:{job_type.value}" for job_type in self.job_types],
+            [f"city.work_country_name:{country.value}" for country in self.countries],
+        ]
+
+
+# What the scraper searched before sharding: URL.TECH_IN_ASIA.
+DEFAULT_SEARCH = SearchShard(
+    countries=(Country.SINGAPORE, Country.REMOTE),
+    job_types=(JobType.FULL_TIME, JobType.FREELANCE),
+    currency=Currency.SGD,
+)
+
+
+def build_shards(
+    countries, job_types, currency: Currency = Currency.SGD
+) -> list[SearchShard]:
+    """One shard per country × job type pair (duplicates dropped)."""
+    countries = list(dict.fromkeys(countries))
+    job_types = list(dict.fromkeys(job_types))
+    return [
+        SearchShard((country,), (job_type,), currency)
+        for country in countries
+        for job_type in job_types
+    ]
+
+
+def _parse(enum, values: str) -> list:
+    # "Singapore, Malaysia" → [Country.SINGAPORE, Country.MALAYSIA]; a typo
+    # raises ValueError naming the bad value.
+    return [enum(value.strip()) for value in values.split(",") if value.strip()]
+
+
+def configured_shards(
+    countries: str = SEARCH_COUNTRIES,
+    job_types: str = SEARCH_JOB_TYPES,
+    currency: str = SEARCH_CURRENCY,
+) -> list[SearchShard]:
+    """
+    The shards to scrape: ``[DEFAULT_SEARCH]`` unless countries or job types
+    are configured; either one left empty falls back to the default search's.
+    """
+    if not countries.strip() and not job_types.strip():
+        return [DEFAULT_SEARCH]
+    return build_shards(
+        _parse(Country, countries) or DEFAULT_SEARCH.countries,
+        _parse(JobType, job_types) or DEFAULT_SEARCH.job_types,
+        Currency(currency.strip()),
+    )
+
+
+def merge_shards(frames: list[tuple[SearchShard, pd.DataFrame]]) -> pd.DataFrame:
+    """
+    Concatenate per-shard scrapes, one row per job ``id``: the first shard's
+    copy wins and ``shard`` lists every shard that returned the job.
+    """
+    tagged = [df.assign(shard=shard.name) for shard, df in frames if not df.empty]
+    if not tagged:
+        return pd.DataFrame()
+    combined = pd.concat(tagged, ignore_index=True)
+    provenance = combined.groupby("id", sort=False)["shard"].agg(";".join)
+    merged = combined.drop_duplicates(subset="id", keep="first").reset_index(drop=True)
+    merged["shard"] = merged["id"].map(provenance)
+    return merged
+
+
+def total_usage(usages) -> dict:
+    """
+    Per-shard :func:`browser_usage` figures added up; memory is the largest
+    browser's (shards on one worker share it). ``None`` where any is missing.
+    """
+    usages = list(usages)
+    totals = {}
+    for key in dict.fromkeys(key for usage in usages for key in usage):
+        values = [usage.get(key) for usage in usages]
+        if any(value is None for value in values):
+            totals[key] = None
+        elif key == "browser_rss_mb":
+            totals[key] = max(values)
+        else:
+            totals[key] = round(sum(values), 2)
+    return totals
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# WORKER POOL  (one Chrome per worker process)
+# ────────────────────────────────────────────────────────────────────────────────
+_worker = threading.local()  # per process (or per thread, for a thread pool)
+
+
+def _worker_driver():
+    """This worker's browser, started on its first shard."""
+    driver = getattr(_worker, "driver", None)
+    if driver is None:
+        from multiprocessing.util import Finalize
+
+        from scraper.selenium_scraper import configure_webdriver
+
+        driver = _worker.driver = configure_webdriver()
+        # Quit Chrome when the worker process exits (pool shutdown / recycle).
+        Finalize(driver, driver.quit, exitpriority=10)
+    return driver
+
+
+def _scrape_shard(
+    shard: SearchShard, known_ids: set[str] | None
+) -> tuple[pd.DataFrame, dict, float]:
+    """Runs in a worker: ``(jobs, browser usage, seconds)`` of one shard."""
+    from scraper.selenium_scraper import scrape_all_jobs
+
+    started = time.perf_counter()
+    usage = {}
+    try:
+        df = scrape_all_jobs(
+            url=shard.url, known_ids=known_ids, driver=_worker_driver(), usage=usage
+        )
+    except Exception:
+        # The browser may be what broke; the worker's next shard starts afresh.
+        driver, _worker.driver = getattr(_worker, "driver", None), None
+        if driver is not None:
+            with suppress(Exception):
+                driver.quit()
+        raise
+    return df, usage, time.perf_counter() - started
+
+
+def shard_pool(workers: int = SCRAPE_WORKERS) -> ProcessPoolExecutor:
+    """
+    Worker processes for :func:`scrape_shards`, recycled (with their Chrome)
+    after BROWSER_MAX_CYCLES shards. Spawned, not forked: the parent may be
+    running threads (see selenium_scraper._preload_pipeline).
+    """
+    return ProcessPoolExecutor(
+        max_workers=max(1, workers),
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=BROWSER_MAX_CYCLES,
+    )
+
+
+@dataclass
+class ShardResults:
+    jobs: pd.DataFrame  # merged, with the ``shard`` provenance column
+    usage: dict[str, dict] = field(default_factory=dict)  # shard → browser_usage
+    failed: list[str] = field(default_factory=list)  # names of failed shards
+
+
+def scrape_shards(
+    shards: list[SearchShard],
+    workers: int = SCRAPE_WORKERS,
+    known_ids: set[str] | None = None,
+    pool: Executor | None = None,
+) -> ShardResults:
+    """
+    Scrape every shard with the browser backend, at most ``workers`` at once.
+
+    A ``pool`` passed in (the daemon's, kept warm between cycles) is reused
+    and left running; otherwise one is started and shut down afterwards.
+    Raises the first error only if every shard failed.
+    """
+    owns_pool = pool is None
+    if owns_pool:
+        pool = shard_pool(min(workers, len(shards)))
+    started = time.perf_counter()
+    results = ShardResults(jobs=pd.DataFrame())
+    frames, errors = [], []
+    try:
+        futures = [
+            (shard, pool.submit(_scrape_shard, shard, known_ids)) for shard in shards
+        ]
+        for shard, future in futures:  # merged in shard order, not completion order
+            try:
+                df, usage, seconds = future.result()
+            except Exception as e:
+                logger.error(f"Shard {shard.name} failed → {e}")
+                results.failed.append(shard.name)
+                errors.append(e)
+                continue
+            logger.info(f"Shard {shard.name}: {len(df)} jobs in {seconds:.1f}s")
+            frames.append((shard, df))
+            results.usage[shard.name] = usage
+    finally:
+        if owns_pool:
+            pool.shutdown(cancel_futures=True)
+    if errors and not frames:
+        raise errors[0]
+
+    results.jobs = merge_shards(frames)
+    logger.info(
+        f"{len(shards)} shards ({len(results.failed)} failed) → "
+        f"{sum(len(df) for _, df in frames)} rows, {len(results.jobs)} unique jobs "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return results
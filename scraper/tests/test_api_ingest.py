@@ -0,0 +1,108 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from scraper.api_ingest import job_from_hit, scrape_all_jobs_api
+
+
+def _hit(n):
+    return {
+        "id": f"job-{n}",
+        "title": f" Engineer {n} ",
+        "company": {"name": "Acme Pte Ltd", "avatar": "https://cdn.example/a.png"},
+        "city": {"name": "Singapore", "work_country_name": "Singapore"},
+        "salary_min": 6000,
+        "salary_max": 12000,
+        "currency": {"currency_code": "SGD"},
+        "is_salary_visible": True,
+        "has_equity": n % 2 == 0,
+        "published_at": "2025-05-06T20:00:00Z",  # already the 7th in Singapore
+        "position": {"name": "Software Engineer"},
+        "industries": [{"vertical_name": "Software"}],
+        "job_type": {"name": "Full-time"},
+    }
+
+
+@pytest.fixture
+def stub_api():
+    """Local stand-in for the search API: 5 pages of 3 hits, one 429 first."""
+    state = {"in_flight": 0, "max_in_flight": 0, "requests": 0, "throttled": False}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            page = int(parse_qs(body["requests"][0]["params"])["page"][0])
+            with lock:
+                state["requests"] += 1
+                throttle = page == 3 and not state["throttled"]
+                state["throttled"] |= throttle
+                state["in_flight"] += 1
+                state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            time.sleep(0.05)
+            with lock:
+                state["in_flight"] -= 1
+            if throttle:
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            # Page 4 repeats the last hit of page 3 (a posting that shifted)
+            hits = [_hit(page * 3 + i) for i in range(3)]
+            if page == 4:
+                hits[0] = _hit(11)
+            payload = json.dumps(
+                {"results": [{"hits": hits, "nbPages": 5, "nbHits": 15}]}
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/1/indexes/*/queries", state
+    server.shutdown()
+    server.server_close()
+
+
+def test_scrape_all_jobs_api_fetches_every_page(stub_api):
+    url, state = stub_api
+
+    df = scrape_all_jobs_api(url=url, workers=2, rate=0)
+
+    assert len(df) == 14  # 15 hits, one duplicated across pages
+    assert df["id"].is_unique
+    assert set(df["id"]) == {f"job-{n}" for n in range(15)} - {"job-12"}
+    assert state["requests"] == 6  # 5 pages + the retried 429
+    assert state["max_in_flight"] <= 2
+    assert df["scraped_at"].notna().all()
+
+
+def test_job_from_hit_matches_card_fields():
+    job = job_from_hit(_hit(2))
+
+    assert job == {
+        "id": "job-2",
+        "title": "Engineer 2",
+        "company": "Acme Pte Ltd",
+        "location": "Singapore, Singapore",
+        "link": "https://www.techinasia.com/jobs/job-2",
+        "image_url": "https://cdn.example/a.png",
+        "compensation": "SGD 6,000 – 12,000 with equity",
+        "published_date": "7 May 2025",
+        "metadata": "Software Engineer,Software,Full-time",
+    }
+    assert job_from_hit({"title": "no id"}) == {}
@@ -0,0 +1,85 @@
+import json
+import random
+from unittest.mock import MagicMock
+
+from scraper.daemon import BrowserSession, next_delay, run_daemon
+from scraper.shards import build_shards
+from utils.enums import Country, JobType
+from utils.pipeline import StageRecord
+
+
+class FakePipeline:
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.drivers = []
+
+    def run(self, context):
+        self.drivers.append(context.get("driver"))
+        if len(self.drivers) in self.fail_on:
+            raise RuntimeError("site down")
+        return [StageRecord(run_id=f"run{len(self.drivers)}", stage="scrape",
+                            status="ran", started_at="", rows=25)]
+
+
+
+def test_daemon_reuses_and_recycles_the_browser(tmp_path):
+    drivers = [MagicMock(name=f"driver{i}") for i in range(3)]
+    factory = MagicMock(side_effect=drivers)
+    session = BrowserSession(factory=factory, max_cycles=2, max_rss_mb=float("inf"))
+    pipeline = FakePipeline(fail_on={2})
+    log = tmp_path / "daemon_runs.jsonl"
+
+    records = run_daemon(
+        pipeline, session, backend="browser", interval=0, jitter=0, cycles=4,
+        log_path=log,
+    )
+
+    # 1 ok, 2 fails → fresh browser, 3 ok, 4 ok → recycled after 2 cycles
+    assert pipeline.drivers == [drivers[0], drivers[0], drivers[1], drivers[1]]
+    assert [r.status for r in records] == ["ok", "failed", "ok", "ok"]
+    assert [r.browser_cycle for r in records] == [1, 2, 1, 2]
+    assert [r.browser_recycled for r in records] == [False, True, False, True]
+    assert records[0].rows == 25 and records[0].run_id == "run1"
+    assert factory.call_count == 2
+    drivers[0].quit.assert_called_once()
+    drivers[1].quit.assert_called_once()
+
+    logged = [json.loads(line) for line in log.read_text().splitlines()]
+    assert [entry["cycle"] for entry in logged] == [1, 2, 3, 4]
+    assert "site down" in logged[1]["error"]
+
+
+
+def test_next_delay_jitters_and_backs_off():
+    rng = random.Random(0)
+    delays = [next_delay(0, interval=300, jitter=30, rng=rng) for _ in range(100)]
+    assert all(270 <= d <= 330 for d in delays) and len(set(delays)) > 1
+
+    assert next_delay(1, interval=300, jitter=0) == 600
+    assert next_delay(5, interval=300, jitter=0, max_backoff=3600) == 3600
+
+
+def test_daemon_keeps_a_warm_shard_pool(tmp_path):
+    pools = [MagicMock(name=f"pool{i}") for i in range(2)]
+    pool_factory = MagicMock(side_effect=pools)
+    session = BrowserSession(factory=MagicMock())
+    contexts = []
+
+    class ShardedPipeline(FakePipeline):
+        def run(self, context):
+            contexts.append(context)
+            return super().run(context)
+
+    run_daemon(
+        ShardedPipeline(fail_on={2}), session, backend="browser", interval=0,
+        jitter=0, cycles=3, log_path=tmp_path / "daemon_runs.jsonl",
+        shards=build_shards([Country.SINGAPORE, Country.MALAYSIA], [JobType.FULL_TIME]),
+        pool_factory=pool_factory,
+    )
+
+    # 1 ok, 2 fails → fresh pool for 3; no single warm browser meanwhile
+    assert [c["shard_pool"] for c in contexts] == [pools[0], pools[0], pools[1]]
+    assert all("driver" not in c for c in contexts)
+    session.factory.assert_not_called()
+    pools[0].shutdown.assert_called_once()
+    pools[1].shutdown.assert_called_once()
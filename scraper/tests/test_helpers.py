@@ -1,9 +1,14 @@
+from utils.constants import BLOCKED_URL_PATTERNS
 from utils.functions import get_csv_path
 from scraper.selenium_scraper import extract_job_data_from_card
 from scraper.selenium_scraper import scrape_all_jobs
+from scraper.selenium_scraper import EXTRACT_CARDS_JS
+from scraper.selenium_scraper import browser_usage, configure_webdriver
 from selenium.webdriver.remote.webelement import WebElement
 from unittest.mock import MagicMock
 
+import json
+
 import pandas as pd
 
 
@@ -71,7 +76,7 @@ def test_scrape_all_jobs_returns_dataframe(monkeypatch):
     monkeypatch.setattr('scraper.selenium_scraper.configure_webdriver', lambda: mock_driver)
 
     # Call the function
-    df = scrape_all_jobs()
+    df = scrape_all_jobs(extraction="cards")
 
     # Assertions
     assert isinstance(df, pd.DataFrame)
@@ -90,5 +95,132 @@ def test_dedup_by_id(monkeypatch):
     mock_driver.find_elements.return_value = [dup_card, dup_card]
     monkeypatch.setattr("scraper.selenium_scraper.configure_webdriver", lambda: mock_driver)
 
-    df = scrape_all_jobs()
+    df = scrape_all_jobs(extraction="cards")
     assert len(df) == 1      # only one row kept
+
+
+
+def _batch_driver(pages):
+    """Mock driver whose page grows by one list of card rows per scroll."""
+    state = {"loaded": 1, "starts": []}
+
+    def scroll_and_wait(script, *args):
+        if state["loaded"] == len(pages):
+            return "end"
+        state["loaded"] += 1
+        return "grew"
+
+    def execute_script(script, *args):
+        assert script == EXTRACT_CARDS_JS
+        rows = [row for page in pages[: state["loaded"]] for row in page]
+        start = args[1]
+        state["starts"].append(start)
+        return {"count": len(rows), "height": 100 * len(rows), "jobs": rows[start:]}
+
+    mock_driver = MagicMock()
+    mock_driver.find_elements.return_value = [MagicMock(spec=WebElement)]
+    mock_driver.execute_script.side_effect = execute_script
+    mock_driver.execute_async_script.side_effect = scroll_and_wait
+    return mock_driver, state
+
+
+
+def _row(n):
+    return {
+        "title": f"Engineer {n}",
+        "company": "Acme",
+        "location": "Singapore, Singapore",
+        "link": f"https://www.techinasia.com/jobs/job-{n}",
+        "image_url": "",
+        "compensation": "",
+        "published_date": "1d ago",
+        "metadata": "Software Engineer,Software,Full-time",
+    }
+
+
+
+def test_batch_extraction_reads_each_card_once(monkeypatch):
+    pages = [[_row(0), _row(1)], [_row(2), None], [_row(1), _row(3)]]
+    mock_driver, state = _batch_driver(pages)
+    monkeypatch.setattr("scraper.selenium_scraper.configure_webdriver", lambda: mock_driver)
+    monkeypatch.setattr("scraper.selenium_scraper.SCROLL_PAUSE_TIME", 0)
+
+    df = scrape_all_jobs(extraction="batch")
+
+    assert df["id"].tolist() == ["job-0", "job-1", "job-2", "job-3"]
+    assert df.loc[0, "title"] == "Engineer 0"
+    assert state["starts"] == [0, 2, 4]  # only cards past the last read
+    assert mock_driver.execute_async_script.call_count == 3  # the last one: "end"
+
+
+
+def test_incremental_scrape_stops_at_known_jobs(monkeypatch):
+    # Newest first: two new jobs, then jobs scraped on earlier runs.
+    pages = [[_row(n), _row(n + 1)] for n in range(0, 20, 2)]
+    mock_driver, state = _batch_driver(pages)
+    monkeypatch.setattr("scraper.selenium_scraper.configure_webdriver", lambda: mock_driver)
+    monkeypatch.setattr("scraper.selenium_scraper.SCROLL_PAUSE_TIME", 0)
+
+    known = {f"job-{n}" for n in range(1, 20)} - {"job-2"}
+    df = scrape_all_jobs(extraction="batch", known_ids=known, stop_after_known=3)
+
+    # job-1 is known but job-2 is not, so the run restarts; job-3..5 end it.
+    assert df["id"].tolist() == [f"job-{n}" for n in range(6)]
+    assert state["loaded"] == 3  # 10 pages on the site, 3 loaded
+
+
+
+def test_lean_profile_blocks_unused_resources(monkeypatch):
+    chrome = MagicMock()
+    monkeypatch.setattr("scraper.selenium_scraper.webdriver.Chrome", chrome)
+
+    driver = configure_webdriver(profile="lean")
+
+    options = chrome.call_args.kwargs["options"]
+    assert "--blink-settings=imagesEnabled=false" in options.arguments
+    driver.execute_cdp_cmd.assert_any_call(
+        "Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS}
+    )
+    assert "*.woff2*" in BLOCKED_URL_PATTERNS
+
+    configure_webdriver(profile="full")
+    options = chrome.call_args.kwargs["options"]
+    assert "--blink-settings=imagesEnabled=false" not in options.arguments
+
+
+
+def test_browser_usage_counts_requests_and_bytes():
+    def event(method, **params):
+        return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+    driver = MagicMock()
+    driver.service.process.pid = -1  # no such process: no CPU / memory figures
+    driver.get_log.return_value = [
+        event("Network.requestWillBeSent"),
+        event("Network.requestWillBeSent"),
+        event("Network.requestWillBeSent"),
+        event("Network.loadingFinished", encodedDataLength=1500),
+        event("Network.loadingFinished", encodedDataLength=500),
+        event("Network.loadingFailed", blockedReason="inspector"),
+        event("Network.loadingFailed", errorText="net::ERR_ABORTED"),
+        {"message": "not json"},
+    ]
+
+    usage = browser_usage(driver)
+
+    assert usage == {
+        "requests": 3,
+        "blocked": 1,
+        "bytes": 2000,
+        "browser_rss_mb": None,
+        "browser_cpu_s": None,
+    }
+
+
+
+def test_scraper_import_does_not_load_pipeline():
+    from benchmarks.bench_startup import BUDGETS, measure
+
+    _, forbidden = BUDGETS["scraper.selenium_scraper"]
+    result = measure("scraper.selenium_scraper", forbidden)
+    assert result.forbidden == []      # pandas / plotting load after the scrape
@@ -0,0 +1,101 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+import scraper.selenium_scraper as selenium_scraper
+from scraper.shards import (
+    DEFAULT_SEARCH,
+    build_shards,
+    configured_shards,
+    scrape_shards,
+    total_usage,
+)
+from utils.enums import URL, Country, Currency, JobType
+
+
+def test_shards_are_built_from_the_enums():
+    assert DEFAULT_SEARCH.url == URL.TECH_IN_ASIA.value
+    assert configured_shards("", "") == [DEFAULT_SEARCH]
+
+    shards = configured_shards("Singapore, Malaysia", "Full-time,Internship", "MYR")
+    assert [shard.name for shard in shards] == [
+        "Singapore/Full-time/MYR",
+        "Singapore/Internship/MYR",
+        "Malaysia/Full-time/MYR",
+        "Malaysia/Internship/MYR",
+    ]
+    assert shards[3].url.endswith(
+        "?country_name[]=Malaysia&job_type[]=Internship&currency=MYR"
+    )
+    assert shards[1].tag_filters == [
+        ["job_type.name:Internship"],
+        ["city.work_country_name:Singapore"],
+    ]
+    # Job types default to the default search's
+    assert configured_shards("Vietnam", "") == build_shards(
+        [Country.VIETNAM], DEFAULT_SEARCH.job_types, Currency.SGD
+    )
+    with pytest.raises(ValueError):
+        configured_shards("Atlantis", "")
+
+
+def test_scrape_shards_runs_on_bounded_workers_and_merges(monkeypatch):
+    drivers = []
+
+    def configure_webdriver():
+        drivers.append(MagicMock(name=f"driver{len(drivers)}"))
+        return drivers[-1]
+
+    def scrape_all_jobs(url, known_ids, driver, usage):
+        time.sleep(0.2)
+        usage.update(requests=10, bytes=1000, browser_rss_mb=300.0)
+        country = url.split("country_name[]=")[1].split("&")[0]
+        ids = ["shared", f"{country}-1", f"{country}-2"]
+        return pd.DataFrame({"id": ids, "title": [f"{country} job"] * 3})
+
+    monkeypatch.setattr(selenium_scraper, "configure_webdriver", configure_webdriver)
+    monkeypatch.setattr(selenium_scraper, "scrape_all_jobs", scrape_all_jobs)
+    shards = build_shards(
+        [Country.SINGAPORE, Country.MALAYSIA, Country.INDONESIA, Country.VIETNAM],
+        [JobType.FULL_TIME],
+    )
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(2) as pool:
+        results = scrape_shards(shards, pool=pool)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.6  # 2 rounds of 2 shards, not 4 shards in a row
+    assert len(drivers) == 2  # one per worker, reused for its second shard
+    df = results.jobs
+    assert len(df) == 9 and df["id"].is_unique  # 12 rows, "shared" in every shard
+    shared = df.set_index("id").loc["shared"]
+    assert shared["title"] == "Singapore job"  # the first shard's copy
+    assert shared["shard"] == ";".join(shard.name for shard in shards)
+    assert df.set_index("id").loc["Vietnam-2", "shard"] == "Vietnam/Full-time/SGD"
+    assert results.failed == []
+    assert total_usage(results.usage.values()) == {
+        "requests": 40, "bytes": 4000, "browser_rss_mb": 300.0
+    }
+
+
+def test_a_failed_shard_leaves_the_others(monkeypatch):
+    def scrape_all_jobs(url, known_ids, driver, usage):
+        if "Malaysia" in url:
+            raise RuntimeError("no cards")
+        return pd.DataFrame({"id": [url]})
+
+    monkeypatch.setattr(selenium_scraper, "configure_webdriver", MagicMock)
+    monkeypatch.setattr(selenium_scraper, "scrape_all_jobs", scrape_all_jobs)
+    shards = build_shards([Country.SINGAPORE, Country.MALAYSIA], [JobType.FULL_TIME])
+
+    with ThreadPoolExecutor(1) as pool:
+        results = scrape_shards(shards, pool=pool)
+        assert results.failed == ["Malaysia/Full-time/SGD"]
+        assert list(results.jobs["shard"]) == ["Singapore/Full-time/SGD"]
+
+        with pytest.raises(RuntimeError, match="no cards"):
+            scrape_shards(shards[1:], pool=pool)
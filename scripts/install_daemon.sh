@@ -0,0 +1,31 @@
+#!/bin/bash
+
+# Define the project directory
+PROJECT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+
+# Define the path to the Python executable within the virtual environment
+PYTHON_EXEC="$PROJECT_DIR/.venv/bin/python"
+
+# Define the log and pid file paths
+LOG_FILE="$PROJECT_DIR/logs/daemon.log"
+PID_FILE="$PROJECT_DIR/logs/daemon.pid"
+
+# Ensure the logs directory exists
+mkdir -p "$PROJECT_DIR/logs"
+
+# The daemon schedules its own runs: drop the */5 cron job if it is installed
+CRON_JOB="*/5 * * * * cd \"$PROJECT_DIR\" && \"$PYTHON_EXEC\" -m scraper.selenium_scraper >> \"$PROJECT_DIR/logs/cron.log\" 2>&1"
+
+# Start the daemon again after a reboot
+START_CMD="cd \"$PROJECT_DIR\" && nohup \"$PYTHON_EXEC\" -m scraper.daemon >> \"$LOG_FILE\" 2>&1 & echo \$! > \"$PID_FILE\""
+REBOOT_JOB="@reboot $START_CMD"
+
+(crontab -l 2>/dev/null | grep -vF "$CRON_JOB" | grep -vF "$REBOOT_JOB"; echo "$REBOOT_JOB") | crontab -
+
+# Start it now unless it is already running
+if [ -f "$PID_FILE" ] && kill -0 "$(cat "$PID_FILE")" 2>/dev/null; then
+    echo "Scraper daemon already running (pid $(cat "$PID_FILE"))"
+else
+    bash -c "$START_CMD"
+    echo "Scraper daemon started (pid $(cat "$PID_FILE")), logging to $LOG_FILE"
+fi
@@ -0,0 +1,25 @@
+#!/bin/bash
+
+# Define the project directory
+PROJECT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+
+# Define the path to the Python executable within the virtual environment
+PYTHON_EXEC="$PROJECT_DIR/.venv/bin/python"
+
+# Define the log and pid file paths
+LOG_FILE="$PROJECT_DIR/logs/daemon.log"
+PID_FILE="$PROJECT_DIR/logs/daemon.pid"
+
+# Define the @reboot entry to remove
+START_CMD="cd \"$PROJECT_DIR\" && nohup \"$PYTHON_EXEC\" -m scraper.daemon >> \"$LOG_FILE\" 2>&1 & echo \$! > \"$PID_FILE\""
+REBOOT_JOB="@reboot $START_CMD"
+
+# Remove the @reboot entry
+crontab -l 2>/dev/null | grep -vF "$REBOOT_JOB" | crontab -
+
+# Stop the daemon (SIGTERM: it finishes the current cycle and quits Chrome)
+if [ -f "$PID_FILE" ] && kill -0 "$(cat "$PID_FILE")" 2>/dev/null; then
+    kill "$(cat "$PID_FILE")"
+    echo "Stopping scraper daemon (pid $(cat "$PID_FILE"))"
+fi
+rm -f "$PID_FILE"
@@ -0,0 +1,248 @@
+import gzip
+import json
+import os
+
+import pandas as pd
+import pytest
+
+import app as app_module
+from utils.changelog import ChangeSet, record_change_set
+from utils.dataset_cache import DatasetCache
+from utils.job_store import JobStore
+
+
+@pytest.fixture
+def sanitised(tmp_path):
+    path = tmp_path / "sanitised.csv"
+    pd.DataFrame(
+        {
+            "id": ["a", "b", "c"],
+            "company_name": ["grab", "grab", "shopee"],
+            "salary_min": [3000, 5000, None],
+            "published_date_parsed": ["2025-05-01", "2025-05-02", None],
+        }
+    ).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def client(sanitised, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        app_module, "jobs_cache", DatasetCache(sanitised, app_module.read_sanitised)
+    )
+    monkeypatch.setattr(
+        app_module,
+        "report_cache",
+        DatasetCache(tmp_path / "missing.csv", app_module.read_quality_report),
+    )
+    monkeypatch.setattr(
+        app_module,
+        "report_history_cache",
+        DatasetCache(tmp_path / "missing.jsonl", app_module.read_report_history),
+    )
+    return app_module.app.test_client()
+
+
+def test_stats_top_companies(client):
+    response = client.get("/api/v1/stats/top-companies?limit=1")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["data"] == [{"company": "grab", "count": 2}]
+    assert body["version"]
+
+
+def test_stats_are_cached_per_version(client, monkeypatch):
+    client.get("/api/v1/stats/salary-histogram")
+    calls = []
+    monkeypatch.setattr(app_module, "salary_histogram", lambda *a, **k: calls.append(1))
+    response = client.get("/api/v1/stats/salary-histogram")
+    assert response.get_json()["data"]["buckets"] == [1, 1]
+    assert calls == []
+
+
+def test_dataset_cache_reloads_on_publish(client, sanitised):
+    assert len(client.get("/api/v1/jobs").get_json()) == 3
+    assert len(client.get("/api/v1/jobs").get_json()) == 3
+
+    replacement = sanitised.with_suffix(".tmp")
+    pd.DataFrame({"id": ["z"], "company_name": ["zendesk"]}).to_csv(
+        replacement, index=False
+    )
+    os.replace(replacement, sanitised)
+
+    assert client.get("/api/v1/jobs").get_json() == [
+        {"id": "z", "company_name": "zendesk"}
+    ]
+    counters = client.get("/api/v1/cache").get_json()["jobs"]
+    assert (counters["misses"], counters["hits"], counters["reloads"]) == (1, 1, 1)
+
+
+def test_without_pyarrow_the_csv_twin_is_served(client, sanitised, monkeypatch):
+    arrow = sanitised.with_suffix(".arrow")
+    arrow.write_bytes(b"ARROW1")  # written by an environment that has pyarrow
+    monkeypatch.setattr("utils.storage.feather", None)
+    monkeypatch.setattr(
+        app_module,
+        "jobs_cache",
+        DatasetCache([arrow, sanitised], app_module.read_sanitised),
+    )
+
+    assert len(client.get("/api/v1/jobs").get_json()) == 3
+    assert client.get("/api/v1/stats/top-companies").status_code == 200
+    counters = client.get("/api/v1/cache").get_json()["jobs"]
+    assert (counters["errors"], counters["misses"], counters["hits"]) == (1, 1, 1)
+
+
+def test_missing_dataset_returns_404(client, sanitised):
+    sanitised.unlink()
+    assert client.get("/api/v1/jobs").status_code == 404
+    assert client.get("/").status_code == 200
+
+
+def test_jobs_conditional_get_and_gzip(client):
+    first = client.get("/api/v1/jobs", headers={"Accept-Encoding": "gzip"})
+    assert first.status_code == 200
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert first.headers["Last-Modified"]
+    assert json.loads(gzip.decompress(first.data))[0]["id"] == "a"
+
+    etag = first.headers["ETag"]
+    second = client.get("/api/v1/jobs", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.data == b""
+
+
+def test_jobs_filters_projection_and_pagination(client):
+    body = client.get(
+        "/api/v1/jobs?company_name=grab&fields=id,salary_min&limit=1"
+    ).get_json()
+    assert body["total"] == 2
+    assert body["data"] == [{"id": "a", "salary_min": 3000.0}]
+
+    page_two = client.get(
+        f"/api/v1/jobs?company_name=grab&fields=id&limit=1&cursor={body['next_cursor']}"
+    ).get_json()
+    assert page_two["data"] == [{"id": "b"}]
+    assert page_two["next_cursor"] is None
+
+    ranged = client.get("/api/v1/jobs?min_salary=4000&fields=id").get_json()
+    assert ranged["data"] == [{"id": "b"}]
+
+    dated = client.get("/api/v1/jobs?published_before=2025-05-01&fields=id").get_json()
+    assert dated["data"] == [{"id": "a"}]
+
+
+def test_jobs_rejects_bad_query(client):
+    assert client.get("/api/v1/jobs?fields=nope").status_code == 400
+    assert client.get("/api/v1/jobs?min_salary=lots").status_code == 400
+    assert client.get("/api/v1/jobs?cursor=!!!").status_code == 400
+
+
+def test_events_stream_announces_new_versions(client, sanitised, monkeypatch):
+    watcher = app_module.VersionWatcher(app_module.jobs_cache, interval=0.05)
+    monkeypatch.setattr(app_module, "jobs_watcher", watcher)
+
+    response = client.get("/api/v1/events")
+    assert response.mimetype == "text/event-stream"
+    chunks = iter(response.response)
+    assert next(chunks).startswith(b"retry:")
+    first = next(chunks)
+    assert b'"rows": 3' in first
+
+    replacement = sanitised.with_suffix(".tmp")
+    pd.DataFrame({"id": ["z"]}).to_csv(replacement, index=False)
+    os.replace(replacement, sanitised)
+
+    second = next(chunks)
+    assert b'"rows": 1' in second
+    assert second != first
+    response.close()
+
+
+def test_jobs_changes_feed(client, tmp_path, monkeypatch):
+    log, state = tmp_path / "changes.jsonl", tmp_path / "state.json"
+    record_change_set(ChangeSet(added=["a"], changed=["c"]), {"a"}, log, state)
+    monkeypatch.setattr(
+        app_module, "changes_cache", DatasetCache(log, app_module.read_change_sets)
+    )
+
+    body = client.get("/api/v1/jobs/changes?since=0&fields=id").get_json()
+    assert body["latest"] == 1
+    assert body["added"] == [{"id": "a"}]
+    assert body["changed"] == [{"id": "c"}]
+
+    assert client.get("/api/v1/jobs/changes?since=1").get_json()["added"] == []
+    ahead = client.get("/api/v1/jobs/changes?since=5")
+    assert ahead.status_code == 400  # not the 410 of a trimmed log
+    assert b"from 0 to 1" in ahead.data
+
+    record_change_set(ChangeSet(changed=["a"]), {"a"}, log, state, max_runs=1)
+    assert client.get("/api/v1/jobs/changes?since=0").status_code == 410
+    assert client.get("/api/v1/jobs/changes?since=1").get_json()["latest"] == 2
+    assert client.get("/api/v1/jobs/changes").status_code == 400
+
+
+def test_quality_report_and_history(client, sanitised, tmp_path, monkeypatch):
+    from utils.reporting import log_quality_report
+
+    assert client.get("/api/v1/quality").status_code == 404
+
+    report_csv = tmp_path / "quality_report.csv"
+    df = app_module.read_sanitised(sanitised)
+    log_quality_report(df, output_path=report_csv)
+    log_quality_report(df.iloc[:2], output_path=report_csv)
+    monkeypatch.setattr(
+        app_module,
+        "report_cache",
+        DatasetCache(report_csv.with_suffix(".json"), app_module.read_quality_report),
+    )
+    monkeypatch.setattr(
+        app_module,
+        "report_history_cache",
+        DatasetCache(
+            tmp_path / "quality_report_history.jsonl", app_module.read_report_history
+        ),
+    )
+
+    report = client.get("/api/v1/quality").get_json()
+    assert report["schema_version"] == 1
+    assert report["missing_values"]["salary_min"] == 0
+
+    history = client.get("/api/v1/quality/history?limit=5").get_json()["data"]
+    assert [entry["rows"] for entry in history] == [3, 2]
+    assert b"Missing Values Salary Min" in client.get("/").data
+
+
+def test_listings_come_from_the_job_store(client, tmp_path, monkeypatch):
+    db = tmp_path / "jobs.sqlite3"
+    monkeypatch.setattr(app_module, "OUTPUT_PATH_DB", str(db))
+    assert client.get("/api/v1/listings").status_code == 404
+
+    with JobStore(db) as store:
+        store.upsert(
+            pd.DataFrame(
+                {
+                    "id": ["a", "b", "c"],
+                    "company": ["Grab", "Shopee", "Grab"],
+                    "compensation": ["SGD 4,000 – 8,000", "", "SGD 9,000 – 12,000"],
+                    "published_date": ["9 May 2025", "12 May 2025", "2 Apr 2025"],
+                }
+            )
+        )
+    body = client.get(
+        "/api/v1/listings?company_name=grab&published_after=2025-05-01&min_salary=5000"
+    ).get_json()
+    assert body["count"] == 1
+    assert body["data"][0]["id"] == "a"
+    assert body["data"][0]["published_on"] == "2025-05-09"
+    assert "first_seen_at" in body["data"][0]
+    assert client.get("/api/v1/listings?tag=python").status_code == 400
+    assert client.get("/api/v1/listings?published_after=soon").status_code == 400
+
+    with JobStore(db) as store:  # a store the scraper has not migrated yet
+        store.conn.executescript(
+            "DROP INDEX idx_jobs_published_on;"
+            "ALTER TABLE jobs DROP COLUMN published_on;"
+        )
+    assert client.get("/api/v1/listings").status_code == 503
+    assert client.get("/api/v1/jobs/a").status_code == 200
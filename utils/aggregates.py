@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from utils.companies import company_key
+
+# Company names that carry no information and must never reach the ranking.
+PLACEHOLDER_COMPANIES = {"", "nan", "none", "unknown"}
+
+
+def jobs_per_day(
+    df: pd.DataFrame, days: int = 30, today: pd.Timestamp | None = None
+) -> list[dict]:
+    """
+    Count postings per calendar day for the ``days`` days ending ``today``.
+
+    Days without postings are filled with 0 so the series always has exactly
+    ``days`` points, mirroring what the dashboard used to build client-side.
+    """
+    if today is None:
+        today = pd.Timestamp.today()
+    end = pd.Timestamp(today).normalize()
+    index = pd.date_range(end=end, periods=days, freq="D")
+
+    if "published_date_parsed" in df.columns:
+        dates = pd.to_datetime(df["published_date_parsed"], errors="coerce")
+        counts = dates.dropna().dt.normalize().value_counts()
+    else:
+        counts = pd.Series(dtype="int64")
+
+    series = counts.reindex(index, fill_value=0).astype("int64")
+    return [
+        {"date": day.strftime("%Y-%m-%d"), "count": int(count)}
+        for day, count in series.items()
+    ]
+
+
+def salary_histogram(
+    df: pd.DataFrame, max_bins: int = 20, currency: str = "SGD"
+) -> dict:
+    """
+    Bucket ``salary_min`` into at most ``max_bins`` bins (Sturges' rule) whose
+    width is rounded up to the nearest 1,000.
+
+    Returns ``{"labels": [...], "edges": [...], "buckets": [...]}`` where
+    ``edges`` has one more element than ``buckets``.
+    """
+    empty = {"labels": [], "edges": [], "buckets": []}
+    if "salary_min" not in df.columns:
+        return empty
+
+    if "salary_currency" in df.columns:
+        # Salaries are monthly but not FX-converted; only chart one currency.
+        df = df[df["salary_currency"].astype("string") == currency]
+    values = pd.to_numeric(df["salary_min"], errors="coerce").to_numpy(dtype="float64")
+    values = values[np.isfinite(values) & (values > 0)]
+    if values.size == 0:
+        return empty
+
+    low, high = values.min(), values.max()
+    bin_count = int(min(np.ceil(np.log2(values.size) + 1), max_bins))
+    bin_size = max(1000, int(np.ceil((high - low) / bin_count / 1000) * 1000))
+
+    indexes = np.minimum(((values - low) // bin_size).astype("int64"), bin_count - 1)
+    buckets = np.bincount(indexes, minlength=bin_count)
+    edges = low + bin_size * np.arange(bin_count + 1)
+
+    labels = [
+        f"${edges[i] / 1000:.0f}k–${edges[i + 1] / 1000:.0f}k"
+        for i in range(bin_count)
+    ]
+    return {
+        "labels": labels,
+        "edges": [float(edge) for edge in edges],
+        "buckets": [int(count) for count in buckets],
+    }
+
+
+def top_companies(df: pd.DataFrame, n: int = 10) -> list[dict]:
+    """
+    Rank companies by number of postings and return the ``n`` largest.
+
+    Counts the resolved ``company_id`` (so "Grab" and "GRAB PTE. LTD." are one
+    company); datasets from before entity resolution fall back to
+    :func:`~utils.companies.company_key` of ``company_name``.
+    """
+    if "company_id" in df.columns:
+        names = df["company_id"].dropna().astype(str)
+    elif "company_name" in df.columns:
+        names = df["company_name"].dropna().astype(str)
+        names = names[~names.str.strip().str.lower().isin(PLACEHOLDER_COMPANIES)]
+        keys = {name: company_key(name) for name in names.unique()}
+        names = names.map(keys).dropna()
+    else:
+        return []
+    names = names[~names.isin(PLACEHOLDER_COMPANIES)]
+    counts = names.value_counts().head(n)
+    return [
+        {"company": company, "count": int(count)} for company, count in counts.items()
+    ]
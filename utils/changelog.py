@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from utils.constants import (
+    CHANGELOG_MAX_RUNS,
+    OUTPUT_PATH_CHANGES,
+    OUTPUT_PATH_CHANGES_PENDING,
+    OUTPUT_PATH_CHANGES_STATE,
+)
+from utils.functions import atomic_path, get_logger
+
+logger = get_logger(__name__)
+
+# Refreshed on every scrape, or only about how the job was found (its search
+# shard), so they say nothing about the listing changing.
+VOLATILE_COLUMNS = {"scraped_at", "shard"}
+
+
+@dataclass
+class ChangeSet:
+    """
+    What one scrape run did to the master dataset, as lists of job ids.
+
+    ``removed`` holds ids that were listed on the previous run but not on this
+    one; the master CSV keeps their rows as history.
+    """
+
+    seq: int = 0
+    recorded_at: str = ""
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+
+def _as_text(df: pd.DataFrame) -> pd.DataFrame:
+    # CSV round trips turn "" into NaN and ints into floats; compare as text.
+    return df.fillna("").astype(str)
+
+
+def diff_scrape(
+    existing_df: pd.DataFrame,
+    scraped_df: pd.DataFrame,
+    previously_listed: set[str] | None = None,
+    complete: bool = True,
+) -> ChangeSet:
+    """
+    Compare a fresh scrape with the master rows it is about to be upserted into.
+
+    ``previously_listed`` is the id set of the previous run; when it is
+    ``None`` (first run) nothing is reported as removed. Neither is anything
+    when the scrape is not ``complete`` (an incremental scrape that stopped at
+    known listings): the rest of the listing was simply not looked at.
+    """
+    if scraped_df.empty or "id" not in scraped_df.columns:
+        return ChangeSet()
+
+    scraped = scraped_df.drop_duplicates(subset="id", keep="last").set_index("id")
+    if existing_df.empty or "id" not in existing_df.columns:
+        existing = scraped.iloc[0:0]
+    else:
+        existing = existing_df.drop_duplicates(subset="id", keep="last").set_index("id")
+
+    added = scraped.index.difference(existing.index)
+    common = scraped.index.intersection(existing.index)
+
+    removed = []
+    if previously_listed is not None:
+        if complete:
+            removed = sorted(previously_listed - set(scraped.index))
+        # A listing that comes back after dropping off counts as added again.
+        relisted = common[~common.isin(list(previously_listed))]
+        added = added.append(relisted)
+        common = common.difference(relisted)
+
+    columns = [
+        c
+        for c in scraped.columns
+        if c in existing.columns and c not in VOLATILE_COLUMNS
+    ]
+    differs = (
+        _as_text(scraped.loc[common, columns]) != _as_text(existing.loc[common, columns])
+    ).any(axis=1)
+    changed = common[differs.to_numpy()]
+
+    return ChangeSet(
+        added=[str(i) for i in added],
+        changed=[str(i) for i in changed],
+        removed=[str(i) for i in removed],
+    )
+
+
+def read_change_sets(path=OUTPUT_PATH_CHANGES) -> list[ChangeSet]:
+    """Load the change log (oldest first). Raises ``FileNotFoundError``."""
+    with open(path, encoding="utf-8") as handle:
+        return [ChangeSet(**json.loads(line)) for line in handle if line.strip()]
+
+
+def read_listed_ids(
+    state_path=OUTPUT_PATH_CHANGES_STATE,
+) -> tuple[int, set[str] | None]:
+    """Return ``(last_seq, ids listed on the last run)`` or ``(0, None)``."""
+    try:
+        state = json.loads(Path(state_path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return 0, None
+    return state["seq"], set(state["listed_ids"])
+
+
+def record_change_set(
+    change_set: ChangeSet,
+    listed_ids: set[str],
+    path=OUTPUT_PATH_CHANGES,
+    state_path=OUTPUT_PATH_CHANGES_STATE,
+    max_runs: int = CHANGELOG_MAX_RUNS,
+) -> ChangeSet:
+    """
+    Assign the next sequence number to ``change_set`` and append it to the log,
+    keeping only the newest ``max_runs`` entries. Empty runs still advance the
+    sequence so ``since`` cursors stay comparable with the run history.
+    """
+    last_seq, _ = read_listed_ids(state_path)
+    change_set.seq = last_seq + 1
+    change_set.recorded_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        lines = []
+    lines.append(json.dumps(asdict(change_set)))
+    lines = lines[-max_runs:]
+
+    with atomic_path(path) as tmp_path:
+        tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    state = {"seq": change_set.seq, "listed_ids": sorted(listed_ids)}
+    with atomic_path(state_path) as tmp_path:
+        tmp_path.write_text(json.dumps(state), encoding="utf-8")
+
+    logger.info(
+        "Recorded change set #%d: %d added, %d changed, %d removed",
+        change_set.seq,
+        len(change_set.added),
+        len(change_set.changed),
+        len(change_set.removed),
+    )
+    return change_set
+
+
+def write_pending_change_set(
+    change_set: ChangeSet, listed_ids: set[str], path=OUTPUT_PATH_CHANGES_PENDING
+) -> None:
+    """
+    Park a diffed change set until the sanitised data it refers to is
+    published; :func:`read_pending_change_set` picks it up.
+    """
+    document = {"change_set": asdict(change_set), "listed_ids": sorted(listed_ids)}
+    with atomic_path(path) as tmp_path:
+        tmp_path.write_text(json.dumps(document), encoding="utf-8")
+
+
+def read_pending_change_set(
+    path=OUTPUT_PATH_CHANGES_PENDING,
+) -> tuple[ChangeSet, set[str]]:
+    """Return ``(change_set, listed_ids)``. Raises ``FileNotFoundError``."""
+    document = json.loads(Path(path).read_text(encoding="utf-8"))
+    return ChangeSet(**document["change_set"]), set(document["listed_ids"])
+
+
+def merge_change_sets(change_sets: list[ChangeSet], since: int) -> ChangeSet | None:
+    """
+    Fold every change set newer than ``since`` into one net change set.
+
+    Returns ``None`` when ``since`` predates the retained log, i.e. the caller
+    can no longer be brought up to date incrementally. Raises ``ValueError``
+    for a ``since`` that was never a run number (negative or past the latest).
+    """
+    latest = change_sets[-1].seq if change_sets else 0
+    oldest = change_sets[0].seq if change_sets else 1
+    if since < 0 or since > latest:
+        raise ValueError(f"'since' must be a run number from 0 to {latest}.")
+    if since < oldest - 1:
+        return None
+
+    added: dict[str, None] = {}
+    changed: dict[str, None] = {}
+    removed: dict[str, None] = {}
+    for change_set in change_sets:
+        if change_set.seq <= since:
+            continue
+        for job_id in change_set.added:
+            removed.pop(job_id, None)
+            added[job_id] = None
+        for job_id in change_set.changed:
+            if job_id not in added:
+                changed[job_id] = None
+        for job_id in change_set.removed:
+            added.pop(job_id, None)
+            changed.pop(job_id, None)
+            removed[job_id] = None
+
+    return ChangeSet(
+        seq=latest,
+        added=list(added),
+        changed=list(changed),
+        removed=list(removed),
+    )
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from utils.constants import (
+    OUTPUT_PATH_CHART_CACHE,
+    OUTPUT_PATH_CHART_JOBS_PER_DAY,
+    OUTPUT_PATH_CHART_SALARY,
+    OUTPUT_PATH_CHART_TOP_COMPANIES,
+)
+from utils.functions import atomic_path, get_logger
+
+logger = get_logger(__name__)
+
+# Part of every input hash: bump when a renderer's styling changes so the
+# existing PNGs are redrawn even though their data did not move.
+RENDER_VERSION = 1
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# CHART INPUTS
+# ────────────────────────────────────────────────────────────────────────────────
+def sgd_salaries(df: pd.DataFrame) -> pd.Series:
+    """The salary_min values the salary histogram plots (SGD rows only)."""
+    return df.loc[df["salary_currency"] == "SGD", "salary_min"].dropna()
+
+
+def chart_inputs(
+    salaries: pd.Series, jobs_per_day: dict[str, int], companies: dict[str, int]
+) -> dict[str, dict | None]:
+    """
+    The exact data each chart plots, as JSON-able payloads (``None`` when a
+    chart has nothing to show). Rendering is a pure function of these.
+
+    ``salaries`` is :func:`sgd_salaries` of the sanitised data (or of its
+    chunks, concatenated), so no chart needs the full frame.
+    """
+    inputs: dict[str, dict | None] = {}
+
+    # 1) Salary histogram – only SGD rows with salary_min
+    inputs["salary"] = (
+        {"salary_min": sorted(float(v) for v in salaries)} if len(salaries) else None
+    )
+
+    # 2) Top‑companies bar chart
+    top = pd.Series(companies, dtype="int64")
+    top = top.sort_values(ascending=False, kind="stable").head(10)
+    inputs["companies"] = (
+        {"company": list(top.index), "count": [int(n) for n in top]}
+        if len(top)
+        else None
+    )
+
+    # 3) Jobs‑per‑day line chart – last 30 days of the daily series
+    inputs["jobs_per_day"] = None
+    if jobs_per_day:
+        daily = pd.Series(jobs_per_day, dtype="int64")
+        daily.index = pd.to_datetime(daily.index)
+        daily = daily.sort_index().asfreq("D", fill_value=0)
+        daily = daily[daily.index >= daily.index.max() - pd.Timedelta(days=30)]
+        inputs["jobs_per_day"] = {
+            "date": [day.strftime("%Y-%m-%d") for day in daily.index],
+            "count": [int(n) for n in daily],
+        }
+    return inputs
+
+
+def input_hash(name: str, payload: dict) -> str:
+    blob = json.dumps([RENDER_VERSION, name, payload], sort_keys=True)
+    return hashlib.blake2b(blob.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# RENDERERS (run in worker processes; plotting libraries load here only)
+# ────────────────────────────────────────────────────────────────────────────────
+def _pyplot():
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def _render_salary(payload: dict, path: str) -> None:
+    plt = _pyplot()
+    import seaborn as sns
+
+    plt.figure(figsize=(10, 6))
+    sns.histplot(payload["salary_min"], bins=20, kde=True)
+    plt.title("Salary Distribution (posts w/ salary only)")
+    plt.xlabel("Minimum Monthly Salary (SGD)")
+    plt.ylabel("Frequency")
+    plt.tight_layout()
+    plt.savefig(path, format="png")
+    plt.close()
+
+
+def _render_companies(payload: dict, path: str) -> None:
+    plt = _pyplot()
+    import seaborn as sns
+
+    plt.figure(figsize=(10, 6))
+    sns.barplot(x=payload["count"], y=payload["company"])
+    plt.title("Top 10 Companies by Job Postings")
+    plt.xlabel("# Postings")
+    plt.ylabel("Company")
+    plt.tight_layout()
+    plt.savefig(path, format="png")
+    plt.close()
+
+
+def _render_jobs_per_day(payload: dict, path: str) -> None:
+    plt = _pyplot()
+
+    plt.figure(figsize=(12, 4))
+    plt.plot(
+        pd.to_datetime(payload["date"]),
+        payload["count"],
+        marker="o",
+        linestyle="-",
+    )
+    plt.title("Job postings per day (last 30 days)")
+    plt.xlabel("Date")
+    plt.ylabel("# jobs scraped")
+    plt.tight_layout()
+    plt.savefig(path, format="png")
+    plt.close()
+
+
+# name → (output path, renderer, message when there is nothing to plot)
+CHARTS = {
+    "salary": (
+        OUTPUT_PATH_CHART_SALARY,
+        _render_salary,
+        "No rows with salary_min; salary histogram skipped.",
+    ),
+    "companies": (
+        OUTPUT_PATH_CHART_TOP_COMPANIES,
+        _render_companies,
+        "No company_name values; top‑companies chart skipped.",
+    ),
+    "jobs_per_day": (
+        OUTPUT_PATH_CHART_JOBS_PER_DAY,
+        _render_jobs_per_day,
+        "No valid dates; jobs‑per‑day chart skipped.",
+    ),
+}
+
+
+def _render(name: str, payload: dict) -> str:
+    path, renderer, _ = CHARTS[name]
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    # Write beside the target and swap in, so the app never serves half a PNG.
+    with atomic_path(path) as tmp_path:
+        renderer(payload, str(tmp_path))
+    return name
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# STAGE
+# ────────────────────────────────────────────────────────────────────────────────
+def _read_render_cache(path) -> dict[str, str]:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def render_charts(
+    inputs: dict[str, dict | None],
+    cache_path=OUTPUT_PATH_CHART_CACHE,
+    max_workers: int | None = None,
+) -> list[str]:
+    """
+    Render every chart whose input hash differs from the one recorded when its
+    PNG was last written (or whose PNG is missing), and return their names.
+
+    Two or more stale charts are rendered in a process pool – matplotlib is
+    single-threaded and holds the GIL – a single one inline.
+    """
+    cache = _read_render_cache(cache_path)
+    stale = {}
+    for name, payload in inputs.items():
+        path, _, empty_message = CHARTS[name]
+        if payload is None:
+            logger.warning(empty_message)
+            continue
+        digest = input_hash(name, payload)
+        if cache.get(name) == digest and Path(path).exists():
+            logger.debug("Chart %s unchanged; skipping render", name)
+            continue
+        stale[name] = (payload, digest)
+
+    if not stale:
+        logger.info("All charts up to date.")
+        return []
+
+    rendered = []
+    if len(stale) == 1:
+        for name, (payload, _) in stale.items():
+            try:
+                rendered.append(_render(name, payload))
+            except Exception:
+                logger.exception("Could not render chart %s", name)
+    else:
+        workers = min(len(stale), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                name: pool.submit(_render, name, payload)
+                for name, (payload, _) in stale.items()
+            }
+            for name, future in futures.items():
+                try:
+                    rendered.append(future.result())
+                except Exception:
+                    logger.exception("Could not render chart %s", name)
+
+    for name in rendered:
+        cache[name] = stale[name][1]
+        logger.info("Saved %s chart → %s", name, CHARTS[name][0])
+    with atomic_path(cache_path) as tmp_path:
+        tmp_path.write_text(json.dumps(cache, indent=2), encoding="utf-8")
+    return rendered
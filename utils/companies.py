@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.constants import OUTPUT_PATH_COMPANY_ALIASES
+from utils.functions import atomic_path, get_logger
+
+logger = get_logger(__name__)
+
+# Bump when company_key() changes, so stored aliases are resolved afresh.
+ALIASES_VERSION = 1
+
+# Trailing tokens that name the legal form rather than the company
+# ("Grab Holdings Pte. Ltd." → "grab"); "PT" is a leading one ("PT Tokopedia").
+LEGAL_SUFFIXES = {
+    "ag", "bhd", "bv", "co", "company", "corp", "corporation", "gmbh", "holding",
+    "holdings", "inc", "incorporated", "kk", "limited", "llc", "llp", "ltd",
+    "nv", "plc", "private", "pte", "pty", "sa", "sdn", "tbk",
+}  # fmt: skip
+LEGAL_PREFIXES = {"pt"}
+# Trailing local-entity qualifiers on this site's listings ("Shopee Singapore").
+REGION_SUFFIXES = {"singapore", "sg"}
+
+_TRAILING = LEGAL_SUFFIXES | REGION_SUFFIXES
+_PARENTHESES = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_NON_WORD = re.compile(r"[\W_]+")
+
+# Trigram Jaccard similarity above which two keys are the same company.
+SIMILARITY_THRESHOLD = 0.8
+# Block keys shared by more canonical names than this ("labs", "tech") are
+# too common to narrow anything down and are skipped.
+MAX_BLOCK_SIZE = 50
+
+
+def company_key(name) -> str | None:
+    """
+    Canonical form of a company name: case-folded, without parenthesised
+    remarks, punctuation or legal-form words. ``None`` for missing names.
+    """
+    if not isinstance(name, str):
+        return None
+    text = _PARENTHESES.sub(" ", name.casefold().replace("&", " and "))
+    tokens = _NON_WORD.sub(" ", text).split()
+    if not tokens:
+        return None
+    core = list(tokens)
+    while len(core) > 1 and core[-1] in _TRAILING:
+        core.pop()
+    while len(core) > 1 and core[0] in LEGAL_PREFIXES:
+        core.pop(0)
+    return " ".join(core)
+
+
+def _trigrams(key: str) -> set[str]:
+    squashed = f"#{key.replace(' ', '')}#"
+    return {squashed[i : i + 3] for i in range(len(squashed) - 2)}
+
+
+def _blocks(key: str) -> set[str]:
+    # Names sharing a word, or starting alike once spaces are dropped
+    # ("byte dance" / "bytedance"), are the only pairs ever compared.
+    return set(key.split()) | {"^" + key.replace(" ", "")[:4]}
+
+
+class CompanyAliases:
+    """
+    Persistent ``company_key → canonical key`` map.
+
+    Names whose key has been seen before are a dictionary lookup. Unseen keys
+    are compared – by trigram similarity, only against canonical names sharing
+    a block (a word or a 4-character prefix) – with the known canonical names
+    and join the best match above :data:`SIMILARITY_THRESHOLD`; otherwise they
+    start a new company. Mappings are never rewritten, so a company keeps its
+    id across runs (incremental runs rely on that).
+    """
+
+    def __init__(self, aliases: dict[str, str] | None = None):
+        self.aliases: dict[str, str] = dict(aliases or {})
+        self._block_index: dict[str, list[str]] = defaultdict(list)
+        self._grams: dict[str, set[str]] = {}
+        for canonical in sorted(set(self.aliases.values())):
+            self._index(canonical)
+        self.added = 0
+
+    def _index(self, canonical: str) -> None:
+        self._grams[canonical] = _trigrams(canonical)
+        for block in _blocks(canonical):
+            self._block_index[block].append(canonical)
+
+    def _match(self, key: str) -> str | None:
+        grams = _trigrams(key)
+        best, best_score = None, SIMILARITY_THRESHOLD
+        candidates = set()
+        for block in _blocks(key):
+            members = self._block_index.get(block, [])
+            if len(members) <= MAX_BLOCK_SIZE:
+                candidates.update(members)
+        for canonical in sorted(candidates):
+            other = self._grams[canonical]
+            score = len(grams & other) / len(grams | other)
+            if score >= best_score:
+                best, best_score = canonical, score
+        return best
+
+    def resolve(self, names: pd.Series) -> pd.Series:
+        """Canonical company id of each name (``NA`` for missing names)."""
+        codes, uniques = pd.factorize(names.astype("string"), use_na_sentinel=True)
+        keys = pd.Series([company_key(name) for name in uniques], dtype=object)
+
+        unseen = keys[keys.notna() & ~keys.isin(self.aliases)]
+        if len(unseen):
+            # Most frequent spelling first, so it becomes the canonical one.
+            frequency = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            weight = pd.Series(frequency).groupby(keys).sum()
+            order = sorted(set(unseen), key=lambda key: (-weight[key], key))
+            for key in order:
+                canonical = self._match(key)
+                if canonical is None:
+                    canonical = key
+                    self._index(key)
+                self.aliases[key] = canonical
+            self.added += len(order)
+
+        ids = keys.map(self.aliases).to_numpy(dtype=object)
+        resolved = np.where(codes < 0, None, ids[np.where(codes < 0, 0, codes)])
+        return pd.Series(resolved, index=names.index, dtype="string")
+
+    @classmethod
+    def load(cls, path=OUTPUT_PATH_COMPANY_ALIASES) -> CompanyAliases:
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return cls()
+        except ValueError:
+            logger.warning("Unreadable company alias map %s; starting afresh", path)
+            return cls()
+        if data.get("version") != ALIASES_VERSION:
+            logger.info("Company alias map %s is outdated; starting afresh", path)
+            return cls()
+        return cls(data["aliases"])
+
+    def save(self, path=OUTPUT_PATH_COMPANY_ALIASES) -> None:
+        if not self.added and Path(path).exists():
+            return
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        document = {"version": ALIASES_VERSION, "aliases": self.aliases}
+        with atomic_path(path) as tmp_path:
+            tmp_path.write_text(
+                json.dumps(document, indent=2, sort_keys=True, ensure_ascii=False),
+                encoding="utf-8",
+            )
+        logger.info(
+            "Saved %d company aliases (%d new) → %s",
+            len(self.aliases),
+            self.added,
+            path,
+        )
+        self.added = 0
@@ -1,8 +1,64 @@
 import logging
+import os
 
 INITIAL_WAIT_TIMEOUT = 15
+# Minimum seconds between two scrolls of the listing (each may trigger a fetch)
 SCROLL_PAUSE_TIME = 2
+# After a scroll, wait for new job cards at most this long (seconds)...
+SCROLL_WAIT_TIMEOUT = 10
+# ...and call it the end of the list once the page's own requests have been idle
+# this long without any new card.
+SCROLL_IDLE_TIME = 1.5
+# How the browser backend reads job cards: "batch" serialises the new cards of
+# each scroll round in one execute_script call, "cards" walks every card with
+# WebDriver element lookups (several round trips per card).
+DOM_EXTRACTION = os.environ.get("JOBS_DOM_EXTRACTION", "batch")
+# Headless Chrome profile: "lean" skips what the scraper never reads (images,
+# media, fonts, analytics; CSS stays since layout drives the infinite scroll),
+# "full" loads the page like a normal browser.
+BROWSER_PROFILE = os.environ.get("JOBS_BROWSER_PROFILE", "lean")
+_BLOCKED_EXTENSIONS = (
+    "png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico",  # images
+    "mp4", "webm", "mp3",  # media
+    "woff", "woff2", "ttf", "otf",  # fonts
+)  # fmt: skip
+BLOCKED_URL_PATTERNS = [  # CDP Network.setBlockedURLs wildcards
+    *(f"*.{ext}*" for ext in _BLOCKED_EXTENSIONS),
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*segment.io*",
+    "*segment.com*", "*mixpanel.com*", "*amplitude.com*", "*clarity.ms*",
+    "*intercom.io*", "*intercomcdn.com*", "*linkedin.com/px*", "*licdn.com*",
+    "*tiktok.com*", "*twitter.com/i/adsct*", "*ads-twitter.com*",
+]  # fmt: skip
+LEAN_CHROME_ARGUMENTS = [
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+    "--mute-audio",
+    "--no-first-run",
+]
+# Incremental scrapes stop scrolling the (newest-first) listing after this many
+# consecutive cards already in the master store...
+STOP_AFTER_KNOWN = int(os.environ.get("JOBS_STOP_AFTER_KNOWN", "40"))
+# ...and a full sweep (which also detects removed listings) runs when the last
+# one is older than this; 0 makes every run a full sweep.
+FULL_SWEEP_INTERVAL_HOURS = float(os.environ.get("JOBS_FULL_SWEEP_HOURS", "6"))
+# Searches to scrape, as comma-separated filter values from utils.enums (e.g.
+# JOBS_SEARCH_COUNTRIES="Singapore,Malaysia,Indonesia"). Unset, the default
+# search runs on its own; set, every country × job type pair is one shard...
+SEARCH_COUNTRIES = os.environ.get("JOBS_SEARCH_COUNTRIES", "")
+SEARCH_JOB_TYPES = os.environ.get("JOBS_SEARCH_JOB_TYPES", "")
+SEARCH_CURRENCY = os.environ.get("JOBS_SEARCH_CURRENCY", "SGD")
+# ...and shards are scraped by this many worker processes, one Chrome each.
+SCRAPE_WORKERS = int(os.environ.get("JOBS_SCRAPE_WORKERS", "2"))
 LOG_LEVEL = logging.DEBUG
+# Relative listing dates ("1d ago") are resolved against the scrape time in
+# the site's local time zone.
+SCRAPE_TIMEZONE = "Asia/Singapore"
 
 DIRECTORY_DATA = "data"
 DIRECTORY_CHARTS = f"{DIRECTORY_DATA}/charts"
@@ -10,9 +66,60 @@ DIRECTORY_CHARTS = f"{DIRECTORY_DATA}/charts"
 OUTPUT_FILENAME = "techinasia_jobs_master.csv"
 OUTPUT_FILENAME_SANITISED = "techinasia_jobs_sanitised.csv"
 OUTPUT_PATH_REPORT = f"{DIRECTORY_DATA}/quality_report.csv"
+# Written next to the CSV by log_quality_report()
+OUTPUT_PATH_REPORT_JSON = f"{DIRECTORY_DATA}/quality_report.json"
+OUTPUT_PATH_REPORT_HISTORY = f"{DIRECTORY_DATA}/quality_report_history.jsonl"
+REPORT_HISTORY_MAX_RUNS = 2000
 OUTPUT_PATH_SANITISED = f"{DIRECTORY_DATA}/{OUTPUT_FILENAME_SANITISED}"
+OUTPUT_PATH_SANITISED_ARROW = f"{DIRECTORY_DATA}/techinasia_jobs_sanitised.arrow"
+OUTPUT_PATH_CHANGES = f"{DIRECTORY_DATA}/changes.jsonl"
+OUTPUT_PATH_CHANGES_STATE = f"{DIRECTORY_DATA}/changes_state.json"
+CHANGELOG_MAX_RUNS = 2000  # ~1 week of 5-minute cron runs
+OUTPUT_PATH_PROCESSING_STATE = f"{DIRECTORY_DATA}/processing_state.json"
+OUTPUT_PATH_COMPANY_ALIASES = f"{DIRECTORY_DATA}/company_aliases.json"
+OUTPUT_PATH_DUPLICATE_INDEX = f"{DIRECTORY_DATA}/duplicate_index.npz"
 
 OUTPUT_PATH = f"{DIRECTORY_DATA}/{OUTPUT_FILENAME}"
+OUTPUT_PATH_DB = f"{DIRECTORY_DATA}/jobs.sqlite3"
 OUTPUT_PATH_CHART_JOBS_PER_DAY = f"{DIRECTORY_CHARTS}/bar_jobs_per_day.png"
 OUTPUT_PATH_CHART_SALARY = f"{DIRECTORY_CHARTS}/histogram_salary.png"
 OUTPUT_PATH_CHART_TOP_COMPANIES = f"{DIRECTORY_CHARTS}/bar_top_companies.png"
+OUTPUT_PATH_CHART_CACHE = f"{DIRECTORY_CHARTS}/render_cache.json"
+
+# Where the scraper keeps the master dataset: "csv" rewrites
+# techinasia_jobs_master.csv every run, "sqlite" upserts into OUTPUT_PATH_DB.
+STORAGE_BACKEND = os.environ.get("JOBS_STORAGE_BACKEND", "csv")
+
+# Rows per chunk when streaming the master dataset through data_processing /
+# the scraper's upsert; 0 loads it into memory in one go.
+PROCESSING_CHUNKSIZE = int(os.environ.get("JOBS_PROCESSING_CHUNKSIZE", "0"))
+
+# Stage runner behind scraper.selenium_scraper (utils/pipeline.py)
+OUTPUT_PATH_LAST_SCRAPE = f"{DIRECTORY_DATA}/last_scrape.csv"
+# Whether last_scrape.csv is a full sweep, and when the last full sweep ran
+OUTPUT_PATH_SCRAPE_STATE = f"{DIRECTORY_DATA}/scrape_state.json"
+OUTPUT_PATH_CHANGES_PENDING = f"{DIRECTORY_DATA}/changes_pending.json"
+OUTPUT_PATH_PIPELINE_STATE = f"{DIRECTORY_DATA}/pipeline_state.json"
+OUTPUT_PATH_PIPELINE_LOG = f"{DIRECTORY_DATA}/pipeline_runs.jsonl"
+PIPELINE_LOG_MAX_ENTRIES = 8000  # 4 stages x ~1 week of 5-minute cron runs
+
+# JSON ingestion backend (scraper/api_ingest.py). "browser" scrolls the listing
+# page in Chrome, "api" pages through the site's search API directly.
+SCRAPE_BACKEND = os.environ.get("JOBS_SCRAPE_BACKEND", "browser")
+ALGOLIA_APP_ID = "219WX3MPV4"
+ALGOLIA_API_KEY = "b528008a75dc1c4402bfe0d8db8b3f8e"
+ALGOLIA_INDEX = "job_postings"
+API_HITS_PER_PAGE = 20  # what the listing page asks for
+API_MAX_WORKERS = 4  # pages in flight at once (and pooled connections)
+API_REQUESTS_PER_SECOND = 4.0  # across all workers
+API_TIMEOUT = 15  # seconds per request
+API_MAX_RETRIES = 3  # on 429 / 5xx, with exponential backoff
+
+# Long-lived scraper (scraper/daemon.py), replacing the */5 cron job
+DAEMON_INTERVAL_SECONDS = 300
+DAEMON_JITTER_SECONDS = 30  # ± random offset so runs don't hit the site on a grid
+DAEMON_MAX_BACKOFF_SECONDS = 3600  # after consecutive failed cycles
+BROWSER_MAX_CYCLES = 50  # restart the warm Chrome after this many scrapes...
+BROWSER_MAX_RSS_MB = 1500  # ...or once its process tree uses this much memory
+OUTPUT_PATH_DAEMON_LOG = f"{DIRECTORY_DATA}/daemon_runs.jsonl"
+DAEMON_LOG_MAX_ENTRIES = 2000  # ~1 week of 5-minute cycles
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from utils.functions import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Snapshot:
+    """
+    One parsed version of a file on disk.
+
+    ``value`` is shared by every request that sees this version, so treat it as
+    read-only. ``memo`` lets callers hang values derived from ``value`` off the
+    snapshot; they are dropped together with it on the next reload.
+    """
+
+    version: str
+    mtime: float
+    value: Any
+    memo: dict = field(default_factory=dict)
+    # Re-entrant: a derived value may itself be built from other derived values.
+    _memo_lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+
+    @property
+    def last_modified(self) -> datetime:
+        return datetime.fromtimestamp(self.mtime)
+
+    def derive(self, key, compute: Callable[[Any], Any]):
+        """Return ``compute(value)``, computing it at most once per snapshot."""
+        try:
+            return self.memo[key]
+        except KeyError:
+            pass
+        with self._memo_lock:
+            if key not in self.memo:
+                self.memo[key] = compute(self.value)
+            return self.memo[key]
+
+
+def file_version(path: Path) -> tuple[str, float]:
+    """
+    Fingerprint ``path`` by inode, mtime and size.
+
+    Files are published with ``os.replace`` (see ``write_csv_atomic``), which
+    always yields a new inode, so the fingerprint changes on every publish
+    even if mtime resolution is coarse. Raises ``FileNotFoundError``.
+    """
+    stat = os.stat(path)
+    return f"{stat.st_ino:x}-{stat.st_mtime_ns:x}-{stat.st_size:x}", stat.st_mtime
+
+
+class DatasetCache:
+    """
+    Process-wide cache of a parsed file, keyed on the file's identity.
+
+    ``path`` may be a list of candidates in order of preference; the first one
+    that exists is served (e.g. a columnar artefact, then its CSV twin), and
+    one the loader fails on is skipped until its version changes.
+
+    Each ``get()`` costs one ``stat`` per candidate tried. The loader only
+    runs when the file's fingerprint differs from the cached one; the new
+    snapshot is then swapped in with a single reference assignment, so
+    concurrent readers see either the old or the new version, never a mix.
+    """
+
+    def __init__(self, path, loader: Callable[[Path], Any]):
+        candidates = path if isinstance(path, (list, tuple)) else [path]
+        self.paths = [Path(p) for p in candidates]
+        self.loader = loader
+        self._snapshot: Snapshot | None = None
+        self._lock = threading.Lock()
+        self._unreadable: dict[Path, str] = {}  # candidate → version that failed
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.errors = 0
+
+    @property
+    def path(self) -> Path:
+        """The preferred candidate path."""
+        return self.paths[0]
+
+    def _candidates(self) -> Iterator[tuple[Path, str, float]]:
+        """``(path, version, mtime)`` of the existing candidates, preferred first."""
+        for path in self.paths[:-1]:
+            try:
+                version, mtime = file_version(path)
+            except FileNotFoundError:
+                continue
+            if self._unreadable.get(path) != version:
+                yield path, version, mtime
+        yield (self.paths[-1], *file_version(self.paths[-1]))
+
+    def get(self) -> Snapshot:
+        """Return the snapshot for the file currently on disk."""
+        for path, version, mtime in self._candidates():
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.version == version:
+                self.hits += 1
+                return snapshot
+
+            with self._lock:
+                # Another thread may have finished the reload while we waited.
+                snapshot = self._snapshot
+                if snapshot is not None and snapshot.version == version:
+                    self.hits += 1
+                    return snapshot
+
+                try:
+                    value = self.loader(path)
+                except Exception as e:
+                    self.errors += 1
+                    if path != self.paths[-1]:
+                        # E.g. an Arrow file without pyarrow installed: fall
+                        # back to the next candidate until this version changes.
+                        self._unreadable[path] = version
+                        logger.warning("Could not load %s (%s); falling back", path, e)
+                        continue
+                    if snapshot is None:
+                        raise
+                    logger.warning(
+                        "Could not reload %s (%s); serving version %s",
+                        path,
+                        e,
+                        snapshot.version,
+                    )
+                    return snapshot
+
+                if snapshot is None:
+                    self.misses += 1
+                else:
+                    self.reloads += 1
+                self._snapshot = Snapshot(version=version, mtime=mtime, value=value)
+                logger.info("Loaded %s (version %s)", path, version)
+                return self._snapshot
+
+    def peek(self) -> Snapshot | None:
+        """Return the cached snapshot without touching the file system."""
+        return self._snapshot
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "paths": [str(p) for p in self.paths],
+            "version": snapshot.version if snapshot else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "errors": self.errors,
+        }
+
+
+class VersionWatcher:
+    """
+    Polls a :class:`DatasetCache` from one background thread and wakes every
+    waiter when the published version changes.
+
+    However many clients are subscribed, the file is stat-ed once per
+    ``interval`` seconds. The thread starts lazily on the first ``wait``.
+    """
+
+    def __init__(self, cache: DatasetCache, interval: float = 2.0):
+        self.cache = cache
+        self.interval = interval
+        self._condition = threading.Condition()
+        self._snapshot: Snapshot | None = None
+        self._thread: threading.Thread | None = None
+
+    def current(self) -> Snapshot | None:
+        """The latest snapshot, or ``None`` while nothing is published."""
+        self._ensure_started()
+        return self._snapshot
+
+    def wait(self, known_version: str | None, timeout: float) -> bool:
+        """
+        Block until the published version differs from ``known_version`` or
+        ``timeout`` seconds pass. Returns whether the version changed.
+        """
+        self._ensure_started()
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._version() != known_version, timeout=timeout
+            )
+
+    def _version(self) -> str | None:
+        return self._snapshot.version if self._snapshot else None
+
+    def _poll(self) -> None:
+        try:
+            snapshot = self.cache.get()
+        except FileNotFoundError:
+            snapshot = None
+        except Exception as e:
+            logger.warning("Version watcher could not read %s: %s", self.cache.path, e)
+            return
+        if (snapshot.version if snapshot else None) != self._version():
+            with self._condition:
+                self._snapshot = snapshot
+                self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            self._poll()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._condition:
+            if self._thread is None:
+                self._poll()
+                self._thread = threading.Thread(
+                    target=self._run, name="dataset-version-watcher", daemon=True
+                )
+                self._thread.start()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils.constants import SCRAPE_TIMEZONE
+
+# ────────────────────────────────────────────────────────────────────────────────
+# PATTERNS
+# ────────────────────────────────────────────────────────────────────────────────
+# "3d ago", "2 weeks ago", "an hour ago", "30+ days ago", "yesterday", "just now"
+RELATIVE_PATTERN = re.compile(
+    r"^\s*(?:(?P<count>\d+|an?|one)\+?\s*"
+    r"(?P<unit>s|secs?|seconds?|m|mins?|minutes?|h|hrs?|hours?|d|days?"
+    r"|w|wks?|weeks?|mo|mos|months?|y|yrs?|years?)\s+ago"
+    r"|(?P<word>just now|now|today|yesterday))\s*$",
+    re.IGNORECASE,
+)
+
+_DAY = 86_400
+UNIT_SECONDS = {
+    "s": 1,
+    "m": 60,
+    "h": 3_600,
+    "d": _DAY,
+    "w": 7 * _DAY,
+    "mo": 30 * _DAY,  # listings only say "1mo ago"; a calendar month is overkill
+    "y": 365 * _DAY,
+}
+WORD_SECONDS = {"just now": 0, "now": 0, "today": 0, "yesterday": _DAY}
+
+
+def _unit_key(unit: str) -> str:
+    unit = unit.lower()
+    if unit.startswith("mo"):
+        return "mo"
+    return unit[0]
+
+
+def _offsets(texts: pd.Series) -> pd.Series:
+    """Age in seconds of each relative expression (NaN for anything else)."""
+    parts = texts.str.extract(RELATIVE_PATTERN).astype(object)
+    count = parts["count"].str.lower()
+    count = count.mask(count.isin(["a", "an", "one"]), "1")
+    unit = parts["unit"].map(_unit_key, na_action="ignore").map(UNIT_SECONDS)
+    seconds = pd.to_numeric(count, errors="coerce") * unit
+    words = parts["word"].str.lower().map(WORD_SECONDS)
+    return seconds.where(seconds.notna(), words).astype("float64")
+
+
+def _anchors(scraped_at, index: pd.Index) -> pd.Series:
+    """Scrape times as naive wall-clock datetimes in ``SCRAPE_TIMEZONE``."""
+    if scraped_at is None:
+        return pd.Series(pd.NaT, index=index, dtype="datetime64[ns]")
+    if not isinstance(scraped_at, pd.Series):
+        scraped_at = pd.Series(scraped_at, index=index)
+    anchors = pd.to_datetime(scraped_at, utc=True, errors="coerce", format="ISO8601")
+    return anchors.dt.tz_convert(SCRAPE_TIMEZONE).dt.tz_localize(None)
+
+
+def parse_published_dates(published: pd.Series, scraped_at=None) -> pd.Series:
+    """
+    Resolve the site's ``published_date`` strings to calendar dates.
+
+    Absolute dates ("9 May 2025", "2025-05-09") are parsed as such; relative
+    ones ("1d ago", "2 weeks ago", "yesterday") are subtracted from the row's
+    ``scraped_at`` timestamp (a Series aligned with ``published`` or a single
+    timestamp for the whole batch), in the site's time zone. Relative strings
+    without a scrape time stay ``NaT``.
+
+    Each distinct string is classified and parsed once; only the final
+    anchor arithmetic runs per row, and it is a single vectorised subtraction.
+    """
+    codes, uniques = pd.factorize(published.astype("string"), use_na_sentinel=True)
+    texts = pd.Series(np.asarray(uniques, dtype=object))
+
+    offsets = _offsets(texts)
+    absolute = pd.to_datetime(
+        texts.where(offsets.isna()), errors="coerce", format="mixed", dayfirst=True
+    )
+
+    # Broadcast the per-string results back to rows; code -1 (missing) → NaT.
+    missing = codes < 0
+    take = np.where(missing, 0, codes)
+    if len(texts):
+        row_offsets = np.where(missing, np.nan, offsets.to_numpy()[take])
+        row_absolute = np.where(
+            missing, np.datetime64("NaT"), absolute.to_numpy()[take]
+        )
+    else:
+        row_offsets = np.full(len(codes), np.nan)
+        row_absolute = np.full(len(codes), np.datetime64("NaT"), "datetime64[ns]")
+
+    resolved = (
+        _anchors(scraped_at, published.index)
+        - pd.Series(pd.to_timedelta(row_offsets, unit="s"), index=published.index)
+    ).dt.normalize()
+    absolute_rows = pd.Series(
+        row_absolute, index=published.index, dtype="datetime64[ns]"
+    )
+    return absolute_rows.where(absolute_rows.notna(), resolved)
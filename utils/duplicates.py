@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.constants import OUTPUT_PATH_DUPLICATE_INDEX
+from utils.functions import atomic_path, get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the shingles or hash functions change (stored signatures would
+# no longer be comparable with new ones) or when the saved arrays do.
+DUPLICATES_VERSION = 2
+
+# 64 MinHash values in 16 bands of 4: two postings share a bucket with
+# probability 1 - (1 - s**4)**16, i.e. ~50% at Jaccard similarity s = 0.47 and
+# >99.9% from s = 0.85, so true reposts are almost never missed.
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+# Estimated Jaccard similarity from which a candidate counts as a repost
+# ("Talent Acquisition Partner" vs "…, Technology" is ~0.75).
+DUPLICATE_THRESHOLD = 0.85
+# Rows hashed per block when building signatures (bounds the NUM_PERM x
+# shingles matrix).
+SIGNATURE_BLOCK_ROWS = 2_000
+# Candidate pairs compared per block (bounds the pairs x NUM_PERM matrix).
+COMPARE_BLOCK_PAIRS = 100_000
+
+_rng = np.random.default_rng(0x5EED)
+# Multiply-shift hash family: h_i(x) = (a_i * x + b_i) mod 2**64, top 32 bits.
+_A = _rng.integers(1, 2**63, NUM_PERM, dtype="uint64") | np.uint64(1)
+_B = _rng.integers(0, 2**63, NUM_PERM, dtype="uint64")
+
+# FNV-1a constants, for the band keys
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_FNV_PRIME = np.uint64(0x100000001B3)
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def _shingles(title, location, metadata) -> list[str]:
+    """
+    Character trigrams of the title (so it outweighs the rest), plus location
+    and tag features. The company is compared exactly, not shingled.
+    """
+    features = []
+    if isinstance(title, str):
+        text = " ".join(_NON_WORD.sub(" ", title.casefold()).split())
+        features += [text[i : i + 3] for i in range(max(len(text) - 2, 1))]
+    if isinstance(location, str):
+        features.append(f"location:{location.casefold().strip()}")
+    if isinstance(metadata, str):
+        features += [f"tag:{tag.strip().casefold()}" for tag in metadata.split(",")]
+    return features
+
+
+def minhash_signatures(df: pd.DataFrame) -> np.ndarray:
+    """
+    ``(len(df), NUM_PERM)`` uint32 MinHash signatures of each posting's
+    title, location and metadata shingles.
+    """
+    columns = [
+        df[c] if c in df.columns else pd.Series(None, index=df.index, dtype=object)
+        for c in ("title", "location", "metadata")
+    ]
+    columns = [c.astype(object).where(c.notna(), None).tolist() for c in columns]
+    ids = df["id"].astype(str).tolist()
+
+    signatures = np.empty((len(df), NUM_PERM), dtype="uint32")
+    for start in range(0, len(df), SIGNATURE_BLOCK_ROWS):
+        stop = min(start + SIGNATURE_BLOCK_ROWS, len(df))
+        shingles, offsets = [], []
+        for row in range(start, stop):
+            features = _shingles(*(column[row] for column in columns))
+            offsets.append(len(shingles))
+            # A posting with nothing to compare must not match anything.
+            shingles.extend(set(features) or [f"empty:{ids[row]}"])
+        hashed = pd.util.hash_array(np.asarray(shingles, dtype=object))
+        permuted = _A[:, None] * hashed[None, :]  # in place from here on
+        permuted += _B[:, None]
+        permuted >>= np.uint64(32)
+        signatures[start:stop] = np.minimum.reduceat(
+            permuted.astype("uint32"), offsets, axis=1
+        ).T
+    return signatures
+
+
+def band_hashes(signatures: np.ndarray, companies: np.ndarray) -> np.ndarray:
+    """
+    ``(len(signatures), BANDS)`` uint64 LSH keys: one FNV-style hash of each
+    posting's company hash and the ROWS_PER_BAND values of each band, so only
+    postings at the same company share a key. A collision only adds a
+    candidate, which the comparison of companies and signatures then rejects.
+    """
+    bands = signatures.reshape(len(signatures), BANDS, ROWS_PER_BAND)
+    keys = np.full(bands.shape[:2], _FNV_OFFSET, dtype="uint64")
+    keys = (keys ^ companies[:, None]) * _FNV_PRIME
+    for row in range(ROWS_PER_BAND):
+        keys = (keys ^ bands[:, :, row].astype("uint64")) * _FNV_PRIME
+    return keys
+
+
+def _hash_strings(values) -> np.ndarray:
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+
+def _encode(values) -> np.ndarray:
+    return np.char.encode(np.asarray(values, dtype=str), "utf-8")
+
+
+def _lookup(sorted_keys, sorted_rows, keys) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Every ``(query, row)`` pair whose key equals ``keys[query]`` in a
+    ``searchsorted`` index (``sorted_keys`` with the row of each key).
+    """
+    lo = np.searchsorted(sorted_keys, keys, side="left")
+    counts = np.searchsorted(sorted_keys, keys, side="right") - lo
+    queries = np.repeat(np.arange(len(keys)), counts)
+    offsets = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+    return queries, sorted_rows[np.arange(counts.sum()) + offsets]
+
+
+def _similar(left, left_rows, right, right_rows) -> np.ndarray:
+    """Whether each pair of signatures reaches :data:`DUPLICATE_THRESHOLD`."""
+    similar = np.empty(len(left_rows), dtype=bool)
+    for start in range(0, len(left_rows), COMPARE_BLOCK_PAIRS):
+        block = slice(start, start + COMPARE_BLOCK_PAIRS)
+        equal = left[left_rows[block]] == right[right_rows[block]]
+        similar[block] = equal.mean(axis=1) >= DUPLICATE_THRESHOLD
+    return similar
+
+
+def _insert_sorted(sorted_keys, sorted_rows, keys, rows):
+    order = np.argsort(keys, kind="stable")
+    at = np.searchsorted(sorted_keys, keys[order], side="right")
+    return (
+        np.insert(sorted_keys, at, keys[order]),
+        np.insert(sorted_rows, at, rows[order]),
+    )
+
+
+class DuplicateIndex:
+    """
+    Near-duplicate (repost) detector over every posting seen so far.
+
+    Each group's first posting is indexed by its LSH band keys. A new posting
+    is compared only with the postings sharing one of its keys, and joins the
+    group of the first whose estimated similarity reaches
+    :data:`DUPLICATE_THRESHOLD` at the same company. Otherwise it starts a
+    group named after its own id. Group ids are never reassigned, so a
+    posting keeps its group across runs (incremental runs rely on that).
+
+    Everything lives in numpy arrays (no per-posting Python objects): the
+    postings' ids, company hashes, group rows and signatures grow in blocks,
+    and ids and band keys are found with ``searchsorted`` on sorted copies
+    that are saved as they are, so :meth:`load` rebuilds nothing.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.ids = np.empty(0, dtype="S1")  # utf-8
+        self.companies = np.empty(0, dtype="uint64")  # hash of company_id
+        self.groups = np.empty(0, dtype="int64")  # row of the group's first posting
+        self.signatures = np.empty((0, NUM_PERM), dtype="uint32")
+        self.id_keys = np.empty(0, dtype="uint64")  # sorted hashes of ids...
+        self.id_rows = np.empty(0, dtype="int64")  # ...and their rows
+        # Per band: sorted keys of each group's first posting, and its row. Later
+        # reposts would match through the first one anyway.
+        self.band_keys = np.empty((BANDS, 0), dtype="uint64")
+        self.band_rows = np.empty((BANDS, 0), dtype="int32")
+        self.added = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _rows(self, ids: pd.Series) -> np.ndarray:
+        """Row of each id, -1 where unknown."""
+        keys = _hash_strings(ids)
+        at = np.searchsorted(self.id_keys, keys).clip(max=max(self.size - 1, 0))
+        rows = np.full(len(keys), -1, dtype="int64")
+        if self.size:
+            found = np.flatnonzero(self.id_keys[at] == keys)
+            rows[found] = self.id_rows[at[found]]
+            # Guard against (2**-64) hash collisions between distinct ids.
+            rows[found[self.ids[rows[found]] != _encode(ids.iloc[found])]] = -1
+        return rows
+
+    def _match_stored(self, signatures, keys, companies) -> np.ndarray:
+        """Group row of each new posting's stored original, -1 where none."""
+        matched = np.full(len(signatures), -1, dtype="int64")
+        pairs = [
+            _lookup(self.band_keys[b], self.band_rows[b], keys[:, b])
+            for b in range(BANDS)
+        ]
+        queries = np.concatenate([q for q, _ in pairs])
+        rows = np.concatenate([r for _, r in pairs]).astype("int64")
+        # Candidates in row order, once each, at the same company...
+        pair = np.unique(queries * self.size + rows)
+        queries, rows = pair // max(self.size, 1), pair % max(self.size, 1)
+        same = self.companies[rows] == companies[queries]
+        queries, rows = queries[same], rows[same]
+        # ...and the first similar enough wins.
+        similar = _similar(self.signatures, rows, signatures, queries)
+        queries, first = np.unique(queries[similar], return_index=True)
+        matched[queries] = self.groups[rows[similar][first]]
+        return matched
+
+    def _reserve(self, count: int, width: int) -> None:
+        """Room for ``count`` more postings with ids of up to ``width`` bytes."""
+        capacity = len(self.groups)
+        if self.size + count > capacity:
+            capacity = max(self.size + count, 2 * capacity, 1024)
+        elif width <= self.ids.dtype.itemsize:
+            return
+        width = max(width, self.ids.dtype.itemsize)
+        for name in ("ids", "companies", "groups", "signatures"):
+            old = getattr(self, name)
+            dtype = f"S{width}" if name == "ids" else old.dtype
+            grown = np.zeros((capacity, *old.shape[1:]), dtype=dtype)
+            grown[: self.size] = old[: self.size]
+            setattr(self, name, grown)
+
+    def assign(self, df: pd.DataFrame) -> pd.Series:
+        """
+        ``duplicate_group_id`` of each row of ``df`` (a transformed frame
+        with ``id`` and ``company_id``), in row order, so a repost in the
+        same batch joins the group of its earlier original.
+        """
+        ids = df["id"].astype(str).reset_index(drop=True)
+        companies = df["company_id"].astype(object).where(df["company_id"].notna(), "")
+        companies = companies.astype(str).reset_index(drop=True)
+        new = np.flatnonzero((self._rows(ids) < 0) & ~ids.duplicated().to_numpy())
+        if len(new):
+            self._add(df.iloc[new], ids.iloc[new], companies.iloc[new])
+        rows = self._rows(ids)
+        groups = np.char.decode(self.ids[self.groups[rows]], "utf-8")
+        return pd.Series(groups, index=df.index, dtype="string")
+
+    def _add(self, df: pd.DataFrame, ids: pd.Series, companies: pd.Series) -> None:
+        signatures = minhash_signatures(df)
+        company_keys = _hash_strings(companies)
+        keys = band_hashes(signatures, company_keys)
+        rows = self.size + np.arange(len(df))
+        # An empty company never matches.
+        groups = np.full(len(df), -1, dtype="int64")
+        has_company = (companies != "").to_numpy()
+        groups[has_company] = self._match_stored(
+            signatures[has_company], keys[has_company], company_keys[has_company]
+        )
+
+        # Reposts of an original earlier in this batch: candidate pairs share a
+        # band key, and are resolved in row order (only among these pairs).
+        unmatched = np.flatnonzero(has_company & (groups < 0))
+        bands = pd.DataFrame(
+            {
+                "band": np.tile(np.arange(BANDS), len(unmatched)),
+                "key": keys[unmatched].ravel(),
+                "row": np.repeat(unmatched, BANDS),
+            }
+        )
+        pairs = bands.merge(bands, on=["band", "key"])
+        pairs = pairs.loc[pairs["row_x"] < pairs["row_y"], ["row_x", "row_y"]]
+        pairs = pairs.drop_duplicates().sort_values(["row_y", "row_x"])
+        earlier, later = pairs["row_x"].to_numpy(), pairs["row_y"].to_numpy()
+        keep = company_keys[earlier] == company_keys[later]
+        earlier, later = earlier[keep], later[keep]
+        keep = _similar(signatures, earlier, signatures, later)
+        first = groups < 0
+        for original, repost in zip(earlier[keep].tolist(), later[keep].tolist()):
+            if first[original] and first[repost]:
+                groups[repost] = rows[original]
+                first[repost] = False
+        groups[first] = rows[first]
+
+        encoded = _encode(ids)
+        self._reserve(len(df), encoded.dtype.itemsize)
+        stop = self.size + len(df)
+        self.ids[self.size : stop] = encoded
+        self.companies[self.size : stop] = company_keys
+        self.groups[self.size : stop] = groups
+        self.signatures[self.size : stop] = signatures
+        self.id_keys, self.id_rows = _insert_sorted(
+            self.id_keys, self.id_rows, _hash_strings(ids), rows
+        )
+        band_keys, band_rows = [], []
+        for b in range(BANDS):
+            band = _insert_sorted(
+                self.band_keys[b], self.band_rows[b], keys[first, b], rows[first]
+            )
+            band_keys.append(band[0])
+            band_rows.append(band[1].astype("int32"))
+        self.band_keys, self.band_rows = np.stack(band_keys), np.stack(band_rows)
+        self.size = stop
+        self.added += len(df)
+
+    @classmethod
+    def _from_v1(cls, data) -> DuplicateIndex:
+        # Version 1 kept ids, companies and groups as strings and rebuilt the
+        # buckets on load; its signatures are still valid.
+        index = cls()
+        ids = pd.Series(data["ids"].tolist(), dtype=object)
+        index.size = len(ids)
+        index.ids = _encode(ids)
+        index.companies = _hash_strings(data["companies"].tolist())
+        index.groups = pd.Index(ids).get_indexer(data["groups"].tolist())
+        index.signatures = data["signatures"]
+        rows = np.arange(index.size)
+        index.id_keys, index.id_rows = _insert_sorted(
+            index.id_keys, index.id_rows, _hash_strings(ids), rows
+        )
+        first = index.groups == rows
+        keys = band_hashes(index.signatures[first], index.companies[first])
+        order = np.argsort(keys, axis=0, kind="stable").T
+        index.band_keys = np.take_along_axis(keys.T, order, axis=1)
+        index.band_rows = rows[first][order].astype("int32")
+        index.added = index.size  # rewritten in the current layout
+        return index
+
+    @classmethod
+    def load(cls, path=OUTPUT_PATH_DUPLICATE_INDEX) -> DuplicateIndex:
+        try:
+            with np.load(path) as data:
+                version = int(data["version"])
+                if version == 1:
+                    return cls._from_v1(data)
+                if version != DUPLICATES_VERSION:
+                    logger.info("Duplicate index %s is outdated; starting afresh", path)
+                    return cls()
+                index = cls()
+                for name in _SAVED:
+                    setattr(index, name, data[name])
+                index.size = len(index.groups)
+                return index
+        except FileNotFoundError:
+            return cls()
+        except (ValueError, KeyError, OSError):
+            logger.warning("Unreadable duplicate index %s; starting afresh", path)
+            return cls()
+
+    def save(self, path=OUTPUT_PATH_DUPLICATE_INDEX) -> None:
+        if not self.added and Path(path).exists():
+            return
+        arrays = {name: getattr(self, name) for name in _SAVED}
+        for name in ("ids", "companies", "groups", "signatures"):
+            arrays[name] = arrays[name][: self.size]
+        with atomic_path(path) as tmp_path, open(tmp_path, "wb") as handle:
+            np.savez(handle, version=DUPLICATES_VERSION, **arrays)
+        logger.info(
+            "Saved duplicate index: %d postings (%d new) → %s",
+            self.size,
+            self.added,
+            path,
+        )
+        self.added = 0
+
+
+_SAVED = (
+    "ids",
+    "companies",
+    "groups",
+    "signatures",
+    "id_keys",
+    "id_rows",
+    "band_keys",
+    "band_rows",
+)
+
+
+def unique_postings(df: pd.DataFrame) -> pd.Series:
+    """
+    Mask of the rows that count as distinct postings: the first posting of
+    each duplicate group (and every row of data without groups).
+    """
+    if "duplicate_group_id" not in df.columns:
+        return pd.Series(True, index=df.index)
+    group = df["duplicate_group_id"].astype(object)
+    return (group.isna() | (group == df["id"].astype(object))).astype(bool)
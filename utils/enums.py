@@ -1,19 +1,35 @@
 
 from enum import Enum
 
+# Search filter values, as the listing page spells them (see scraper/shards.py)
 class Country(Enum):
     SINGAPORE = "Singapore"
     REMOTE = "Remote"
+    INDONESIA = "Indonesia"
+    MALAYSIA = "Malaysia"
+    PHILIPPINES = "Philippines"
+    THAILAND = "Thailand"
+    VIETNAM = "Vietnam"
 
 class JobType(Enum):
     FULL_TIME = "Full-time"
     FREELANCE = "Freelance"
+    PART_TIME = "Part-time"
+    CONTRACT = "Contract"
+    INTERNSHIP = "Internship"
 
 class Currency(Enum):
     SGD = "SGD"
+    USD = "USD"
+    IDR = "IDR"
+    MYR = "MYR"
+    PHP = "PHP"
+    THB = "THB"
+    VND = "VND"
 
 class URL(Enum):
     TARGET = "https://www.techinasia.com/jobs/search"
+    # The default search (scraper.shards.DEFAULT_SEARCH builds the same URL)
     TECH_IN_ASIA = (
         f"{TARGET}"
         "?country_name[]=Singapore"
@@ -22,6 +38,9 @@ class URL(Enum):
         "&job_type[]=Freelance"
         "&currency=SGD"
     )
+    JOB_PAGE = "https://www.techinasia.com/jobs"  # + "/<job id>"
+    # Search endpoint behind the listing page (public, search-only key)
+    ALGOLIA_QUERIES = "https://219wx3mpv4-dsn.algolia.net/1/indexes/*/queries"
 
 class CSSSelector(Enum):
     JOB_CARD = "article[data-cy='job-result']"
@@ -1,4 +1,7 @@
 import logging
+import os
+import tempfile
+from contextlib import contextmanager
 
 from pathlib import Path
 from utils.constants import DIRECTORY_DATA, OUTPUT_FILENAME
@@ -40,3 +43,30 @@ def get_csv_path(root_dir: Path = None) -> Path:
     logging.debug(f"CSV path: {csv_path}")
 
     return csv_path
+
+
+@contextmanager
+def atomic_path(path):
+    """
+    Yield a temporary path next to ``path``; on success ``os.replace`` it into
+    place, so readers only ever observe the old or the complete new file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        os.chmod(tmp_path, 0o644)  # mkstemp defaults to 0600
+        yield Path(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def write_csv_atomic(df, path, **kwargs) -> None:
+    """Write ``df`` to ``path`` as CSV without exposing a half-written file."""
+    with atomic_path(path) as tmp_path:
+        df.to_csv(tmp_path, **kwargs)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+from utils.constants import OUTPUT_PATH_PROCESSING_STATE
+from utils.dataset_cache import file_version
+from utils.functions import atomic_path, get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the watermark layout or the transform changes meaning, so the next
+# incremental run rebuilds from scratch instead of merging incompatible rows.
+STATE_VERSION = 3
+
+
+@dataclass
+class ProcessingState:
+    """
+    Watermark left behind by ``cleanup_and_analyse()``.
+
+    ``row_hashes`` maps each processed job id to a hash of its raw row, and
+    ``outputs`` the published sanitised artefacts to their ``file_version``
+    so a run can tell whether they still match the watermark. The counters
+    are the chart aggregates of the published dataset and ``quality`` the
+    serialised ``QualitySummary`` behind its quality report.
+    """
+
+    version: int = STATE_VERSION
+    outputs: dict[str, str] = field(default_factory=dict)
+    row_hashes: dict[str, int] = field(default_factory=dict)
+    jobs_per_day: dict[str, int] = field(default_factory=dict)
+    companies: dict[str, int] = field(default_factory=dict)
+    quality: dict = field(default_factory=dict)
+
+
+@dataclass
+class Increment:
+    """Job ids to (re)transform and ids that dropped out of the raw dataset."""
+
+    changed: pd.Index
+    removed: pd.Index
+
+    @property
+    def is_empty(self) -> bool:
+        return self.changed.empty and self.removed.empty
+
+
+def row_hashes(df: pd.DataFrame, columns: list[str]) -> pd.Series:
+    """
+    One 64-bit hash per raw row, indexed by job id (first occurrence wins,
+    matching the de-duplication in the pipeline).
+    """
+    present = [c for c in columns if c in df.columns]
+    # Compare as text: CSV and SQLite disagree on NaN vs None and int vs float.
+    text = df[present].fillna("").astype(str)
+    hashes = pd.util.hash_pandas_object(text, index=False)
+    hashes.index = df["id"].astype(str)
+    return hashes[~hashes.index.duplicated()]
+
+
+def plan_increment(hashes: pd.Series, state: ProcessingState) -> Increment:
+    """Diff the current raw row hashes against the watermark."""
+    # object dtype: reindexing a uint64 Series would go through float64 and
+    # lose precision.
+    previous = pd.Series(state.row_hashes, dtype=object)
+    known = previous.reindex(hashes.index)
+    differs = known.isna() | (known != hashes.astype(object))
+    changed = hashes.index[differs.to_numpy()]
+    removed = previous.index.difference(hashes.index)
+    return Increment(changed=changed, removed=removed)
+
+
+def count_values(values: pd.Series) -> Counter:
+    return Counter(values.dropna().astype(str).value_counts().to_dict())
+
+
+def apply_delta(counts: dict, stale: pd.Series, fresh: pd.Series) -> dict[str, int]:
+    """Remove the contribution of ``stale`` rows and add that of ``fresh`` ones."""
+    updated = Counter(counts)
+    updated.subtract(count_values(stale))
+    updated.update(count_values(fresh))
+    return {key: int(n) for key, n in updated.items() if n > 0}
+
+
+def read_processing_state(path=OUTPUT_PATH_PROCESSING_STATE) -> ProcessingState | None:
+    """Load the watermark, or ``None`` if it is missing or from an older layout."""
+    try:
+        raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        logger.warning("Unreadable processing state at %s; ignoring it", path)
+        return None
+    if raw.get("version") != STATE_VERSION:
+        return None
+    return ProcessingState(**raw)
+
+
+def write_processing_state(
+    state: ProcessingState, path=OUTPUT_PATH_PROCESSING_STATE
+) -> None:
+    with atomic_path(path) as tmp_path:
+        tmp_path.write_text(json.dumps(asdict(state)), encoding="utf-8")
+
+
+def output_versions(paths) -> dict[str, str]:
+    """``file_version`` of every path that exists."""
+    versions = {}
+    for path in paths:
+        try:
+            versions[str(path)] = file_version(Path(path))[0]
+        except FileNotFoundError:
+            continue
+    return versions
+
+
+def unchanged_output(state: ProcessingState, paths) -> str | None:
+    """First of ``paths`` still exactly as the watermarked run published it."""
+    current = output_versions(paths)
+    for path in paths:
+        path = str(path)
+        if path in current and state.outputs.get(path) == current[path]:
+            return path
+    return None
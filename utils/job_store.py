@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from utils.constants import OUTPUT_PATH_DB
+from utils.dates import parse_published_dates
+from utils.functions import get_logger
+from utils.salary import parse_compensation
+
+logger = get_logger(__name__)
+
+# Scraped fields, in the order extract_job_data_from_card() produces them, then
+# the search shard(s) that listed the job (see scraper/shards.py).
+RAW_COLUMNS = [
+    "id",
+    "title",
+    "company",
+    "location",
+    "link",
+    "image_url",
+    "compensation",
+    "published_date",
+    "metadata",
+    "scraped_at",
+    "shard",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id             TEXT PRIMARY KEY,
+    title          TEXT,
+    company        TEXT,
+    location       TEXT,
+    link           TEXT,
+    image_url      TEXT,
+    compensation   TEXT,
+    published_date TEXT,
+    metadata       TEXT,
+    scraped_at     TEXT,
+    shard          TEXT,
+    salary_min     INTEGER,
+    salary_max     INTEGER,
+    published_on   TEXT,
+    first_seen_at  TEXT NOT NULL,
+    last_seen_at   TEXT NOT NULL
+);
+"""
+
+# Created once _migrate() has added any column they need. published_date holds
+# the site's text ("9 May 2025", "1d ago"), so date ranges go through the ISO
+# published_on ("2025-05-09") it resolves to.
+INDEXES = """
+DROP INDEX IF EXISTS idx_jobs_published_date;
+CREATE INDEX IF NOT EXISTS idx_jobs_published_on ON jobs (published_on);
+CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs (company COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_jobs_salary ON jobs (salary_min, salary_max);
+"""
+
+# Derived on upsert so the indexes work without the full cleaning pipeline.
+_DERIVED_COLUMNS = {
+    "salary_min": "INTEGER",
+    "salary_max": "INTEGER",
+    "published_on": "TEXT",
+}
+_STORED_COLUMNS = RAW_COLUMNS + list(_DERIVED_COLUMNS)
+
+# first_seen_at is only written on insert; everything else tracks the latest scrape.
+UPSERT_SQL = f"""
+INSERT INTO jobs ({", ".join(_STORED_COLUMNS)}, first_seen_at, last_seen_at)
+VALUES ({", ".join("?" for _ in _STORED_COLUMNS)}, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    {", ".join(f"{c} = excluded.{c}" for c in _STORED_COLUMNS[1:])},
+    last_seen_at = excluded.last_seen_at
+"""
+
+
+def _iso_dates(published: pd.Series, anchors: pd.Series) -> pd.Series:
+    """``published_date`` strings as ISO dates ("2025-05-09"), ``None`` if unknown."""
+    dates = parse_published_dates(published, anchors)
+    return dates.dt.strftime("%Y-%m-%d").astype(object).where(dates.notna(), None)
+
+
+class JobStore:
+    """
+    SQLite-backed master store of scraped jobs, keyed on the job ``id``.
+
+    Runs in WAL mode so the scraper can upsert while the app and
+    ``data_processing.py`` read. Each :meth:`upsert` is one transaction that
+    only touches the scraped rows, instead of rewriting the whole history.
+
+    ``readonly=True`` (the app's request handlers) opens an existing store
+    with a read-only connection: no PRAGMAs, schema or migration, which are
+    left to the writer, so readers never take a write lock.
+    """
+
+    def __init__(self, path=OUTPUT_PATH_DB, readonly: bool = False):
+        self.path = Path(path)
+        if readonly:
+            uri = f"{self.path.resolve().as_uri()}?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self.conn.executescript(INDEXES)
+
+    def _migrate(self) -> None:
+        # Stores created before a column existed get it added (as NULLs)...
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        types = {**dict.fromkeys(RAW_COLUMNS, "TEXT"), **_DERIVED_COLUMNS}
+        with self.conn:
+            for column, sql_type in types.items():
+                if column not in existing:
+                    self.conn.execute(
+                        f"ALTER TABLE jobs ADD COLUMN {column} {sql_type}"
+                    )
+        # ...and published_on is resolved for rows stored before it existed.
+        if "published_on" not in existing:
+            rows = pd.read_sql_query(
+                "SELECT id, published_date, scraped_at, last_seen_at FROM jobs",
+                self.conn,
+            )
+            anchors = rows["scraped_at"].fillna(rows["last_seen_at"])
+            rows["published_on"] = _iso_dates(rows["published_date"], anchors)
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE jobs SET published_on = ? WHERE id = ?",
+                    rows[["published_on", "id"]].itertuples(index=False),
+                )
+
+    def __enter__(self) -> JobStore:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def ids(self) -> set[str]:
+        """Every job id in the store."""
+        return {row[0] for row in self.conn.execute("SELECT id FROM jobs")}
+
+    def upsert(self, df: pd.DataFrame, seen_at: str | None = None) -> int:
+        """
+        Insert or update every row of ``df`` in a single transaction.
+
+        Salaries are parsed here when ``df`` doesn't carry them, and the
+        listing date is resolved to ``published_on`` (relative dates against
+        ``scraped_at``, else ``seen_at``), so the indexes are usable without
+        running the full cleaning pipeline.
+        """
+        if df.empty:
+            return 0
+        if seen_at is None:
+            seen_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+        rows = df.drop_duplicates(subset="id", keep="last").reindex(
+            columns=_STORED_COLUMNS
+        )
+        if rows["salary_min"].isna().all() and "compensation" in df.columns:
+            parsed = parse_compensation(rows["compensation"])
+            rows["salary_min"] = parsed["salary_min"]
+            rows["salary_max"] = parsed["salary_max"]
+        rows["published_on"] = _iso_dates(
+            rows["published_date"], rows["scraped_at"].fillna(seen_at)
+        )
+
+        rows = rows.astype(object).where(rows.notna(), None)
+        params = [(*row, seen_at, seen_at) for row in rows.itertuples(index=False)]
+        with self.conn:
+            self.conn.executemany(UPSERT_SQL, params)
+        logger.info("Upserted %d rows into %s", len(params), self.path)
+        return len(params)
+
+    def fetch(self, ids) -> pd.DataFrame:
+        """Rows for the given job ids (primary-key lookups)."""
+        ids = list(ids)
+        frames = []
+        # Stay below SQLite's default limit on bound parameters.
+        for start in range(0, len(ids), 500):
+            chunk = ids[start : start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            frames.append(
+                pd.read_sql_query(
+                    f"SELECT * FROM jobs WHERE id IN ({placeholders})",
+                    self.conn,
+                    params=chunk,
+                )
+            )
+        if not frames:
+            return self.query(limit=0)
+        return pd.concat(frames, ignore_index=True)
+
+    def query(
+        self,
+        company=None,
+        published_after=None,
+        published_before=None,
+        min_salary: float | None = None,
+        max_salary: float | None = None,
+        limit: int | None = None,
+    ) -> pd.DataFrame:
+        """
+        Filter on the indexed columns, newest listings first. ``company`` (one
+        name or several) matches case-insensitively; the published bounds are
+        inclusive dates; salary bounds use range overlap like ``/api/v1/jobs``.
+        """
+        clauses, params = [], []
+        if company is not None:
+            names = [company] if isinstance(company, str) else list(company)
+            placeholders = ", ".join("?" for _ in names)
+            clauses.append(f"company COLLATE NOCASE IN ({placeholders})")
+            params.extend(names)
+        if published_after is not None:
+            clauses.append("published_on >= ?")
+            params.append(pd.Timestamp(published_after).date().isoformat())
+        if published_before is not None:
+            clauses.append("published_on <= ?")
+            params.append(pd.Timestamp(published_before).date().isoformat())
+        if min_salary is not None:
+            clauses.append("COALESCE(salary_max, salary_min) >= ?")
+            params.append(min_salary)
+        if max_salary is not None:
+            clauses.append("salary_min <= ?")
+            params.append(max_salary)
+
+        sql = "SELECT * FROM jobs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY published_on DESC, rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def read_all(self) -> pd.DataFrame:
+        """The whole master dataset in the raw-CSV column layout."""
+        return pd.read_sql_query(
+            f"SELECT {', '.join(RAW_COLUMNS)} FROM jobs ORDER BY rowid", self.conn
+        )
+
+    def iter_chunks(self, chunksize: int) -> Iterator[pd.DataFrame]:
+        """:meth:`read_all`, ``chunksize`` rows at a time."""
+        yield from pd.read_sql_query(
+            f"SELECT {', '.join(RAW_COLUMNS)} FROM jobs ORDER BY rowid",
+            self.conn,
+            chunksize=chunksize,
+        )
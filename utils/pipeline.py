@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from utils.constants import (
+    OUTPUT_PATH_PIPELINE_LOG,
+    OUTPUT_PATH_PIPELINE_STATE,
+    PIPELINE_LOG_MAX_ENTRIES,
+)
+from utils.dataset_cache import file_version
+from utils.functions import atomic_path, get_logger
+
+try:  # Unix only; peak memory is simply not recorded elsewhere
+    import resource
+except ImportError:  # pragma: no cover - depends on the platform
+    resource = None
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Stage:
+    """
+    One step of a :class:`Pipeline`.
+
+    ``run(context)`` does the work and may return the number of rows it
+    produced. Stages hand data to each other through the files named in
+    ``inputs`` / ``outputs`` (``context`` only carries optional in-memory
+    shortcuts), which is what lets any stage be rerun on its own.
+
+    A stage with ``cached=False`` runs whenever its inputs exist, even if
+    they are byte-identical to last time.
+    """
+
+    name: str
+    run: Callable[[dict], int | None]
+    inputs: list[str] = field(default_factory=list)
+    outputs: list[str] = field(default_factory=list)
+    cached: bool = True
+
+
+@dataclass
+class StageRecord:
+    """One line of the run log."""
+
+    run_id: str
+    stage: str
+    status: str  # "ran", "skipped" (inputs unchanged), "no-input" or "failed"
+    started_at: str
+    wall_s: float = 0.0
+    cpu_s: float = 0.0  # this process plus finished child processes
+    peak_rss_mb: float | None = None  # process high-water mark after the stage
+    rows: int | None = None
+    error: str | None = None
+
+
+def _digest(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fingerprint(paths, known: dict | None = None) -> dict[str, dict] | None:
+    """
+    Content digest of every path, or ``None`` if one is missing. Files whose
+    inode/mtime/size match ``known`` reuse its digest instead of being re-read.
+    """
+    known = known or {}
+    prints = {}
+    for path in paths:
+        try:
+            version = file_version(Path(path))[0]
+        except FileNotFoundError:
+            return None
+        previous = known.get(str(path), {})
+        if previous.get("version") == version:
+            prints[str(path)] = previous
+        else:
+            prints[str(path)] = {"version": version, "digest": _digest(Path(path))}
+    return prints
+
+
+def _same_content(a: dict | None, b: dict | None) -> bool:
+    if a is None or b is None or a.keys() != b.keys():
+        return False
+    return all(a[path]["digest"] == b[path]["digest"] for path in a)
+
+
+def _usage() -> tuple[float, float | None]:
+    """(CPU seconds of this process and its reaped children, peak RSS in MB)."""
+    if resource is None:
+        return time.process_time(), None
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+    # ru_maxrss is KiB on Linux (bytes on macOS; close enough for a trend).
+    return cpu, max(own.ru_maxrss, children.ru_maxrss) / 1024
+
+
+class Pipeline:
+    """
+    Run :class:`Stage` objects in order, skipping those whose inputs have the
+    same content as when they last ran and whose outputs are untouched since.
+
+    ``run(start=...)`` begins at a later stage (e.g. reprocess without
+    rescraping) and always reruns that one; ``force=True`` reruns every stage.
+    Each stage's wall time, CPU time, peak memory and row count are appended to
+    a JSON-lines run log.
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        state_path=OUTPUT_PATH_PIPELINE_STATE,
+        log_path=OUTPUT_PATH_PIPELINE_LOG,
+        max_log_entries: int = PIPELINE_LOG_MAX_ENTRIES,
+    ):
+        self.stages = stages
+        self.state_path = Path(state_path)
+        self.log_path = Path(log_path)
+        self.max_log_entries = max_log_entries
+
+    @property
+    def stage_names(self) -> list[str]:
+        return [stage.name for stage in self.stages]
+
+    def _read_state(self) -> dict:
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_state(self, state: dict) -> None:
+        with atomic_path(self.state_path) as tmp_path:
+            tmp_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+
+    def _log(self, records: list[StageRecord]) -> None:
+        try:
+            lines = self.log_path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            lines = []
+        lines = (lines + [json.dumps(asdict(r)) for r in records])[
+            -self.max_log_entries :
+        ]
+        with atomic_path(self.log_path) as tmp_path:
+            tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    def _up_to_date(self, stage: Stage, recorded: dict, inputs) -> bool:
+        if not stage.cached or not stage.inputs or not recorded:
+            return False
+        if not _same_content(inputs, recorded.get("inputs")):
+            return False
+        outputs = fingerprint(stage.outputs, recorded.get("outputs"))
+        return _same_content(outputs, recorded.get("outputs"))
+
+    def run(
+        self, start: str | None = None, force: bool = False, context=None
+    ) -> list[StageRecord]:
+        """Run the pipeline; re-raises the first stage failure after logging it."""
+        if start is not None and start not in self.stage_names:
+            raise ValueError(f"Unknown stage {start!r}; expected {self.stage_names}")
+        context = {} if context is None else context
+        run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+        state = self._read_state()
+        records: list[StageRecord] = []
+        stages = self.stages[self.stage_names.index(start) :] if start else self.stages
+
+        try:
+            for stage in stages:
+                record = StageRecord(
+                    run_id=run_id,
+                    stage=stage.name,
+                    status="ran",
+                    started_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                )
+                records.append(record)
+                recorded = state.get(stage.name, {})
+                inputs = fingerprint(stage.inputs, recorded.get("inputs"))
+                if stage.inputs and inputs is None:
+                    record.status = "no-input"
+                    logger.info("Stage %s: input missing; skipped", stage.name)
+                    continue
+                rerun = force or stage.name == start
+                if not rerun and self._up_to_date(stage, recorded, inputs):
+                    record.status = "skipped"
+                    logger.info("Stage %s: inputs unchanged; skipped", stage.name)
+                    continue
+
+                cpu_before, _ = _usage()
+                wall_before = time.perf_counter()
+                try:
+                    record.rows = stage.run(context)
+                except Exception as e:
+                    record.status, record.error = "failed", repr(e)
+                    raise
+                finally:
+                    record.wall_s = round(time.perf_counter() - wall_before, 3)
+                    cpu_after, record.peak_rss_mb = _usage()
+                    record.cpu_s = round(cpu_after - cpu_before, 3)
+
+                state[stage.name] = {
+                    "inputs": inputs or {},
+                    "outputs": fingerprint(stage.outputs) or {},
+                }
+                self._write_state(state)
+                logger.info(
+                    "Stage %s: %.2fs wall, %.2fs CPU, peak %s MB, %s rows",
+                    stage.name,
+                    record.wall_s,
+                    record.cpu_s,
+                    record.peak_rss_mb,
+                    record.rows,
+                )
+        finally:
+            self._log(records)
+        return records
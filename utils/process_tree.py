@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+@dataclass
+class TreeUsage:
+    """Resources held by a process and all its descendants."""
+
+    processes: int
+    rss_mb: float
+    cpu_s: float  # user + system time of the live processes
+
+
+def process_tree_usage(pid: int, proc=Path("/proc")) -> TreeUsage | None:
+    """
+    Memory and CPU time of ``pid`` plus its descendants (e.g. chromedriver →
+    Chrome → renderers), read from ``/proc``. ``None`` where there is no
+    ``/proc`` (macOS) or the process is gone.
+    """
+    children: dict[int, list[int]] = {}
+    stats: dict[int, tuple[int, int]] = {}  # pid → (rss pages, cpu ticks)
+    for stat in Path(proc).glob("[0-9]*/stat"):
+        try:
+            # Fields after "comm)", starting at field 3 (state); see proc(5).
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue  # exited meanwhile
+        child = int(stat.parent.name)
+        children.setdefault(int(fields[1]), []).append(child)
+        stats[child] = (int(fields[21]), int(fields[11]) + int(fields[12]))
+    if pid not in stats:
+        return None
+
+    processes = pages = ticks = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        rss, cpu = stats.get(current, (0, 0))
+        processes, pages, ticks = processes + 1, pages + rss, ticks + cpu
+        stack.extend(children.get(current, ()))
+    return TreeUsage(processes, pages * _PAGE_SIZE / 2**20, ticks / _CLOCK_TICKS)
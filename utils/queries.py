@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from utils.companies import company_key
+
+
+class QueryError(ValueError):
+    """Raised for a malformed filter or cursor; the API turns it into a 400."""
+
+
+@dataclass
+class JobsQuery:
+    """Server-side filters for ``/api/v1/jobs``. ``None`` means "no filter"."""
+
+    companies: tuple[str, ...] | None = None
+    location: str | None = None
+    tags: tuple[str, ...] | None = None
+    min_salary: float | None = None
+    max_salary: float | None = None
+    published_after: pd.Timestamp | None = None
+    published_before: pd.Timestamp | None = None
+
+
+class JobIndex:
+    """
+    Column arrays pre-normalised once per dataset version so that every filter
+    is a single vectorised comparison.
+
+    ``tag_positions`` is an inverted index from a lower-cased metadata tag to
+    the sorted row positions carrying it.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        n = len(df)
+        self.size = n
+
+        def lowered(column: str) -> np.ndarray:
+            if column not in df.columns:
+                return np.full(n, "", dtype=object)
+            text = df[column].astype("string").fillna("")
+            return text.str.strip().str.lower().to_numpy(dtype=object)
+
+        def numeric(column: str) -> np.ndarray:
+            if column not in df.columns:
+                return np.full(n, np.nan)
+            return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype="float64")
+
+        self.company = lowered("company_name")
+        self.company_id = lowered("company_id")
+        self.location = lowered("location").astype(str)  # for np.char.find
+        self.salary_min = numeric("salary_min")
+        # Postings that list a single figure have no max; use it as both bounds.
+        salary_max = numeric("salary_max")
+        self.salary_max = np.where(np.isnan(salary_max), self.salary_min, salary_max)
+
+        if "published_date_parsed" in df.columns:
+            self.published = pd.to_datetime(
+                df["published_date_parsed"], errors="coerce"
+            ).to_numpy(dtype="datetime64[ns]")
+        else:
+            self.published = np.full(n, np.datetime64("NaT"), dtype="datetime64[ns]")
+
+        self.tag_positions: dict[str, np.ndarray] = {}
+        if "metadata" in df.columns:
+            tags = (
+                df["metadata"]
+                .reset_index(drop=True)
+                .dropna()
+                .astype(str)
+                .str.lower()
+                .str.split(",")
+                .explode()
+                .str.strip()
+            )
+            tags = tags[tags != ""]
+            self.tag_positions = {
+                tag: np.unique(positions.index.to_numpy())
+                for tag, positions in tags.groupby(tags, sort=False)
+            }
+
+    def mask(self, query: JobsQuery) -> np.ndarray:
+        """Boolean mask of rows matching every filter in ``query``."""
+        mask = np.ones(self.size, dtype=bool)
+
+        if query.companies:
+            # Any spelling of a resolved company matches all of its postings.
+            names = [c.strip().lower() for c in query.companies]
+            ids = [company_key(c) for c in query.companies]
+            mask &= np.isin(self.company, names) | np.isin(self.company_id, ids)
+
+        if query.location:
+            needle = query.location.strip().lower()
+            mask &= np.char.find(self.location, needle) >= 0
+
+        if query.tags:
+            for tag in query.tags:
+                tag_mask = np.zeros(self.size, dtype=bool)
+                tag_mask[self.tag_positions.get(tag.strip().lower(), [])] = True
+                mask &= tag_mask
+
+        # Salary filters use range overlap; rows without salary never match.
+        if query.min_salary is not None:
+            mask &= self.salary_max >= query.min_salary
+        if query.max_salary is not None:
+            mask &= self.salary_min <= query.max_salary
+
+        if query.published_after is not None:
+            mask &= self.published >= query.published_after.to_datetime64()
+        if query.published_before is not None:
+            mask &= self.published <= query.published_before.to_datetime64()
+
+        return mask
+
+
+def _split(value: str | None) -> tuple[str, ...] | None:
+    if value is None:
+        return None
+    parts = tuple(part.strip() for part in value.split(",") if part.strip())
+    return parts or None
+
+
+def _number(args, name: str) -> float | None:
+    value = args.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise QueryError(f"'{name}' must be a number, got {value!r}") from None
+
+
+def _date(args, name: str) -> pd.Timestamp | None:
+    value = args.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        return pd.Timestamp(value)
+    except ValueError:
+        raise QueryError(f"'{name}' must be an ISO date, got {value!r}") from None
+
+
+def parse_jobs_query(args) -> JobsQuery:
+    """Build a :class:`JobsQuery` from request query-string ``args``."""
+    return JobsQuery(
+        companies=_split(args.get("company_name")),
+        location=args.get("location") or None,
+        tags=_split(args.get("tag")),
+        min_salary=_number(args, "min_salary"),
+        max_salary=_number(args, "max_salary"),
+        published_after=_date(args, "published_after"),
+        published_before=_date(args, "published_before"),
+    )
+
+
+def parse_fields(args, columns) -> list[str]:
+    """Columns requested via ``fields=a,b``; empty means "all columns"."""
+    fields = [f.strip() for f in args.get("fields", "").split(",") if f.strip()]
+    unknown = sorted(set(fields) - set(columns))
+    if unknown:
+        raise QueryError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def encode_cursor(version: str, position: int) -> str:
+    """Opaque cursor pointing at row ``position`` of dataset ``version``."""
+    raw = f"{version}:{position}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        version, position = base64.urlsafe_b64decode(padded).decode().rsplit(":", 1)
+        return version, int(position)
+    except (ValueError, UnicodeDecodeError):
+        raise QueryError(f"Malformed cursor {cursor!r}") from None
@@ -1,48 +1,266 @@
 from __future__ import annotations
 
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
 import pandas as pd
 
-from utils.constants import OUTPUT_PATH_REPORT
-from utils.functions import get_logger
+from utils.constants import OUTPUT_PATH_REPORT, REPORT_HISTORY_MAX_RUNS
+from utils.functions import atomic_path, get_logger, write_csv_atomic
+from utils.sketches import NumericSummary
 
 logger = get_logger(__name__)
 
+# Bump when the layout of quality_report.json changes.
+REPORT_SCHEMA_VERSION = 1
+
+# Columns the report describes beyond null counts.
+NUMERIC_COLUMNS = ["salary_min"]
+DATE_COLUMNS = ["published_date_parsed"]
+
+
+def _iso(value) -> str | None:
+    return None if pd.isna(value) else pd.Timestamp(value).isoformat()
+
+
+def _date_bounds(values: pd.Series) -> list[str | None]:
+    values = pd.to_datetime(values, errors="coerce").dropna()
+    if values.empty:
+        return [None, None]
+    return [_iso(values.min()), _iso(values.max())]
+
+
+@dataclass
+class QualitySummary:
+    """
+    Mergeable summary behind the quality report.
+
+    Null counts, row count and the Welford moments are exact and can be
+    updated with new rows, combined across chunks (:meth:`merge`) or have
+    rows taken out again (:meth:`remove`, the inverse of Chan's update).
+    Min/max and the quantile sketch cannot forget rows, so removing rows that
+    carried values in those columns asks the caller to :meth:`rescan` their
+    min/max/sketch – one pass over just those columns.
+    """
+
+    rows: int = 0
+    nulls: dict[str, int] = field(default_factory=dict)
+    numeric: dict[str, NumericSummary] = field(default_factory=dict)
+    dates: dict[str, list[str | None]] = field(default_factory=dict)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> QualitySummary:
+        summary = cls()
+        summary.update(df)
+        return summary
+
+    def update(self, df: pd.DataFrame) -> None:
+        """Fold the rows of ``df`` into the summary."""
+        self.merge(self._of(df))
+
+    @classmethod
+    def _of(cls, df: pd.DataFrame) -> QualitySummary:
+        summary = cls(
+            rows=len(df),
+            nulls={c: int(n) for c, n in df.isna().sum().items()},
+        )
+        for column in NUMERIC_COLUMNS:
+            if column in df.columns:
+                numeric = NumericSummary()
+                numeric.update(pd.to_numeric(df[column], errors="coerce"))
+                summary.numeric[column] = numeric
+        for column in DATE_COLUMNS:
+            if column in df.columns:
+                summary.dates[column] = _date_bounds(df[column])
+        return summary
+
+    def merge(self, other: QualitySummary) -> None:
+        """Combine with the summary of a disjoint set of rows."""
+        self.rows += other.rows
+        for column, n in other.nulls.items():
+            self.nulls[column] = self.nulls.get(column, 0) + n
+        for column, numeric in other.numeric.items():
+            self.numeric.setdefault(column, NumericSummary()).merge(numeric)
+        for column, (low, high) in other.dates.items():
+            old_low, old_high = self.dates.get(column, [None, None])
+            self.dates[column] = [
+                min(filter(None, [old_low, low]), default=None),
+                max(filter(None, [old_high, high]), default=None),
+            ]
 
-def log_quality_report(df: pd.DataFrame, output_path: str = OUTPUT_PATH_REPORT) -> None:
+    def remove(self, df: pd.DataFrame) -> set[str]:
+        """
+        Take the rows of ``df`` back out. Returns the columns whose min/max or
+        sketch might have depended on them and therefore need a :meth:`rescan`.
+        """
+        removed = self._of(df)
+        self.rows -= removed.rows
+        for column, n in removed.nulls.items():
+            self.nulls[column] = self.nulls.get(column, 0) - n
+        for column, numeric in removed.numeric.items():
+            if column in self.numeric:
+                self.numeric[column].remove(numeric)
+
+        stale = {c for c, numeric in removed.numeric.items() if numeric.count}
+        for column, (low, high) in removed.dates.items():
+            current_low, current_high = self.dates.get(column, [None, None])
+            # Rows strictly inside the current bounds cannot move them.
+            if low is not None and not (current_low < low and high < current_high):
+                stale.add(column)
+        return stale
+
+    def rescan(self, df: pd.DataFrame, columns) -> None:
+        """
+        Recompute the min/max/sketch state of ``columns`` from all of ``df``;
+        counts and moments are already exact.
+        """
+        fresh = self._of(df[[c for c in columns if c in df.columns]])
+        for column in columns:
+            if column in fresh.numeric:
+                numeric = self.numeric.setdefault(column, NumericSummary())
+                scanned = fresh.numeric[column]
+                numeric.min, numeric.max = scanned.min, scanned.max
+                numeric.sketch = scanned.sketch
+            if column in fresh.dates:
+                self.dates[column] = fresh.dates[column]
+
+    def report(self) -> dict:
+        """The report fields, in the layout of the original CSV report."""
+        report = {"missing_values": dict(self.nulls)}
+        for column in NUMERIC_COLUMNS:
+            if column in self.numeric:
+                report[f"{column}_stats"] = self.numeric[column].describe()
+        for column in DATE_COLUMNS:
+            if column in self.dates:
+                oldest, newest = self.dates[column]
+                report["date_range"] = {"oldest": oldest, "newest": newest}
+        return report
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "nulls": self.nulls,
+            "numeric": {c: n.to_dict() for c, n in self.numeric.items()},
+            "dates": self.dates,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> QualitySummary:
+        return cls(
+            rows=data["rows"],
+            nulls=dict(data["nulls"]),
+            numeric={
+                c: NumericSummary.from_dict(n) for c, n in data["numeric"].items()
+            },
+            dates={c: list(bounds) for c, bounds in data["dates"].items()},
+        )
+
+
+def flatten_report(report: dict) -> dict:
+    """``{"missing_values": {"id": 0}}`` → ``{"missing_values_id": 0}``."""
+    flat = {}
+    for key, value in report.items():
+        if isinstance(value, dict):
+            for inner, item in flatten_report(value).items():
+                flat[f"{key}_{inner}"] = item
+        else:
+            flat[key] = value
+    return flat
+
+
+def read_quality_report(path) -> dict:
+    """Load ``quality_report.json`` (or a legacy single-row CSV report)."""
+    path = Path(path)
+    if path.suffix == ".json":
+        return json.loads(path.read_text(encoding="utf-8"))
+    records = pd.read_csv(path).to_dict(orient="records")
+    return records[0] if records else {}
+
+
+def read_report_history(path) -> list[dict]:
+    """Past quality reports, oldest first. Raises ``FileNotFoundError``."""
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def log_quality_report(
+    df: pd.DataFrame | None = None,
+    output_path: str = OUTPUT_PATH_REPORT,
+    summary: QualitySummary | None = None,
+    max_history: int = REPORT_HISTORY_MAX_RUNS,
+    columns: list[str] | None = None,
+) -> dict:
     """
-    Generate and save a data-quality report to a CSV file.
+    Generate and save a data-quality report.
+
+    Writes the single-row CSV at ``output_path``, the versioned JSON artefact
+    next to it (``.json``) and appends the report to ``*_history.jsonl``,
+    keeping the newest ``max_history`` runs. Returns the JSON document.
 
     Parameters
     ----------
-    df : pandas.DataFrame
-        The **sanitised** DataFrame (after calling cleanup_and_analyse).
+    df : pandas.DataFrame, optional
+        The **sanitised** DataFrame (after calling cleanup_and_analyse). Not
+        needed when both ``summary`` and ``columns`` are given (streamed runs).
     output_path : str
         The file path to save the quality report CSV.
+    summary : QualitySummary, optional
+        Summary maintained by the caller (incremental runs); computed from
+        ``df`` otherwise.
+    columns : list of str, optional
+        Columns of the missing-value report, in order; ``df.columns`` by
+        default.
     """
-    report = {}
+    if summary is None:
+        summary = QualitySummary.from_frame(df)
+    if columns is None:
+        columns = df.columns
+    report = summary.report()
 
     # Missing Value Report
-    missing = df.isna().sum()
-    report["missing_values"] = missing.to_dict()
+    missing = pd.Series(report["missing_values"], dtype="int64")
+    missing = missing.reindex(columns, fill_value=0)
+    report["missing_values"] = {c: int(n) for c, n in missing.items()}
     logger.info("--- Missing-Value Report ---")
     logger.info("\n%s", missing.to_frame("nulls").T)
 
     # Descriptive Stats for salary_min
-    if "salary_min" in df.columns:
-        salary_stats = df["salary_min"].describe()
-        report["salary_min_stats"] = salary_stats.to_dict()
+    if "salary_min_stats" in report:
         logger.info("--- Descriptive Stats (salary_min) ---")
-        logger.info("\n%s", salary_stats)
+        logger.info("\n%s", pd.Series(report["salary_min_stats"]))
 
     # Date Range
-    if "published_date_parsed" in df.columns:
-        oldest = df["published_date_parsed"].min()
-        newest = df["published_date_parsed"].max()
-        report["date_range"] = {"oldest": str(oldest), "newest": str(newest)}
+    if "date_range" in report:
         logger.info("--- Date Range ---")
-        logger.info("oldest=%s   newest=%s", oldest, newest)
+        logger.info(
+            "oldest=%s   newest=%s",
+            report["date_range"]["oldest"],
+            report["date_range"]["newest"],
+        )
 
     # Convert report dictionary to DataFrame for saving
     report_df = pd.json_normalize(report, sep="_")
-    report_df.to_csv(output_path, index=False)
+    write_csv_atomic(report_df, output_path, index=False)
     logger.info("Quality report saved to %s", output_path)
+
+    document = {
+        "schema_version": REPORT_SCHEMA_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "rows": summary.rows,
+        **report,
+    }
+    output_path = Path(output_path)
+    with atomic_path(output_path.with_suffix(".json")) as tmp_path:
+        tmp_path.write_text(json.dumps(document, indent=2), encoding="utf-8")
+
+    history_path = output_path.with_name(f"{output_path.stem}_history.jsonl")
+    try:
+        lines = history_path.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        lines = []
+    lines = (lines + [json.dumps(document)])[-max_history:]
+    with atomic_path(history_path) as tmp_path:
+        tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return document
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# ────────────────────────────────────────────────────────────────────────────────
+# PATTERNS
+# ────────────────────────────────────────────────────────────────────────────────
+# Compiled once at import. Named groups become the columns of Series.str.extract.
+_CURRENCY = r"(?P<currency>[A-Z]{3}|S\$|US\$|A\$|HK\$|\$|€|£|¥|₹|₱|฿|₫)"
+_AMOUNT = r"(?P<{0}>\d[\d,]*(?:\.\d+)?)\s*(?P<{0}_unit>[kKmM](?![a-z]))?"
+_PERIOD = (
+    r"(?:\s*(?:/|per|a|an)\s*(?P<period>month|mth|mo|year|yr|annum)\b"
+    r"|\s*(?P<period_adverb>monthly|annually|yearly|p\.?\s?a\.?|p\.?\s?m\.?)(?!\w))?"
+)
+
+COMPENSATION_PATTERN = re.compile(
+    _CURRENCY
+    + r"\s*"
+    + _AMOUNT.format("low")
+    + r"(?:\s*(?:[–—-]|to)\s*(?:[A-Z]{3}|[A-Z]{0,2}\$)?\s*"
+    + _AMOUNT.format("high")
+    + r")?"
+    + _PERIOD
+)
+
+CURRENCY_SYMBOLS = {
+    "S$": "SGD",
+    "US$": "USD",
+    "A$": "AUD",
+    "HK$": "HKD",
+    "€": "EUR",
+    "£": "GBP",
+    "¥": "JPY",
+    "₹": "INR",
+    "₱": "PHP",
+    "฿": "THB",
+    "₫": "VND",
+}
+UNIT_MULTIPLIERS = {"k": 1_000, "m": 1_000_000}
+PERIODS = {
+    "month": "month",
+    "mth": "month",
+    "mo": "month",
+    "monthly": "month",
+    "pm": "month",
+    "year": "year",
+    "yr": "year",
+    "annum": "year",
+    "annually": "year",
+    "yearly": "year",
+    "pa": "year",
+}
+
+# Listings rarely state the period. A range whose low end is above this is taken
+# to be annual (e.g. "SGD 380,000") and anything else monthly ("SGD 4,000"); the
+# high end alone misreads senior monthly ranges like "SGD 10,000 – 20,000".
+ANNUAL_THRESHOLDS = {
+    "IDR": 80_000_000,
+    "VND": 150_000_000,
+    "INR": 1_000_000,
+    "JPY": 2_000_000,
+    "KRW": 20_000_000,
+    "PHP": 300_000,
+    "THB": 300_000,
+}
+DEFAULT_ANNUAL_THRESHOLD = 20_000
+
+SALARY_COLUMNS = ["salary_min", "salary_max", "salary_currency", "salary_period"]
+
+
+def _amounts(values: pd.Series, units: pd.Series) -> pd.Series:
+    numbers = pd.to_numeric(values.str.replace(",", "", regex=False), errors="coerce")
+    multipliers = units.str.lower().map(UNIT_MULTIPLIERS).fillna(1)
+    return numbers * multipliers
+
+
+def _parse_unique(texts: pd.Series, default_currency: str) -> pd.DataFrame:
+    """Parse distinct compensation strings; see :func:`parse_compensation`."""
+    # object dtype so .str works even when a group never matched (all-NaN).
+    parts = texts.str.extract(COMPENSATION_PATTERN).astype(object)
+
+    low = _amounts(parts["low"], parts["low_unit"])
+    high = _amounts(parts["high"], parts["high_unit"])
+    # "SGD 55,000" – a single figure is both ends of the range.
+    high = high.fillna(low)
+
+    currency = parts["currency"].replace(CURRENCY_SYMBOLS)
+    currency = currency.where(currency != "$", default_currency)
+
+    period_text = parts["period"].where(parts["period"].notna(), parts["period_adverb"])
+    period_text = period_text.str.lower().str.replace(r"[.\s]", "", regex=True)
+    period = period_text.map(PERIODS)
+
+    thresholds = currency.map(ANNUAL_THRESHOLDS).fillna(DEFAULT_ANNUAL_THRESHOLD)
+    inferred = np.where(low > thresholds, "year", "month")
+    period = period.fillna(pd.Series(inferred, index=period.index)).where(low.notna())
+
+    # Normalise everything to monthly figures so pay charts compare like with like.
+    divisor = np.where(period == "year", 12, 1)
+    return pd.DataFrame(
+        {
+            "salary_min": (low / divisor).round(),
+            "salary_max": (high / divisor).round(),
+            "salary_currency": currency.where(low.notna()),
+            "salary_period": period,
+        },
+        index=texts.index,
+    )
+
+
+def parse_compensation(
+    compensation: pd.Series, default_currency: str = "SGD"
+) -> pd.DataFrame:
+    """
+    Vectorised compensation parser.
+
+    Handles ranges and single figures ("SGD 4,000 – 8,000", "SGD 55,000"),
+    ``k``/``m`` suffixes ("S$4.5k - 6k"), currency codes and symbols, and
+    explicit or inferred pay periods. Returns ``SALARY_COLUMNS`` aligned with
+    ``compensation``, where ``salary_min``/``salary_max`` are **monthly**
+    amounts in ``salary_currency`` and ``salary_period`` is the period the
+    listing was quoted in.
+
+    Each distinct string is parsed once: the regex runs over the unique values
+    and the result is broadcast back by position, so cost scales with the
+    number of distinct compensation texts rather than with rows.
+    """
+    codes, uniques = pd.factorize(compensation.astype("string"), use_na_sentinel=True)
+    # Plain object strings keep the numeric results in NumPy float64.
+    parsed = _parse_unique(
+        pd.Series(np.asarray(uniques, dtype=object)), default_currency
+    )
+
+    # Append an all-NA row for missing inputs (code -1 → last row).
+    empty = pd.DataFrame({c: [None] for c in SALARY_COLUMNS}).astype(parsed.dtypes)
+    table = pd.concat([parsed, empty], ignore_index=True)
+    result = table.iloc[np.where(codes < 0, len(table) - 1, codes)]
+    return result.set_axis(compensation.index)
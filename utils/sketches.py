@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang & Liberty, 2016).
+
+    Items live in a stack of compactors; an item at level ``h`` stands for
+    ``2**h`` inputs. When a level overflows it is sorted and every other item
+    is promoted, so memory stays around ``3k`` items whatever the input size,
+    with rank error roughly ``1.7 / k``. Sketches of different partitions
+    merge by concatenating levels. Until a level first overflows (``n`` below
+    ``k``) quantiles are exact.
+
+    Compaction alternates between keeping odd and even items instead of
+    flipping a coin, so the same input always yields the same sketch.
+    """
+
+    def __init__(self, k: int = 200, n: int = 0, compactors=None, flips: int = 0):
+        self.k = k
+        self.n = n
+        self.compactors: list[list[float]] = compactors or [[]]
+        self.flips = flips
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append([])
+                items.sort()
+                keep = [items.pop()] if len(items) % 2 else []
+                offset = self.flips % 2
+                self.flips += 1
+                self.compactors[level + 1].extend(items[offset::2])
+                self.compactors[level] = keep
+            level += 1
+
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self.compactors[0].extend(values.tolist())
+        self.n += int(values.size)
+        self._compress()
+
+    def merge(self, other: KLLSketch) -> None:
+        for level, items in enumerate(other.compactors):
+            if level == len(self.compactors):
+                self.compactors.append([])
+            self.compactors[level].extend(items)
+        self.n += other.n
+        self.flips += other.flips
+        self._compress()
+
+    def quantiles(self, qs) -> list[float | None]:
+        """
+        Approximate quantiles with NumPy's default (linear) interpolation, so
+        an exact sketch agrees with ``Series.quantile``.
+        """
+        values = np.array([v for level in self.compactors for v in level])
+        if values.size == 0:
+            return [None for _ in qs]
+        weights = np.array(
+            [2**h for h, level in enumerate(self.compactors) for _ in level],
+            dtype="float64",
+        )
+        order = np.argsort(values, kind="stable")
+        values, weights = values[order], weights[order]
+        # Item i covers ranks [first[i], last[i]] of the (weighted) input.
+        last = np.cumsum(weights) - 1
+        first = last - weights + 1
+        total = last[-1]
+
+        result = []
+        for q in qs:
+            rank = q * total
+            i = int(np.searchsorted(last, rank, side="left"))
+            if rank >= first[i] or i == 0:
+                result.append(float(values[i]))
+            else:
+                # Between the last rank of item i-1 and the first of item i.
+                frac = (rank - last[i - 1]) / (first[i] - last[i - 1])
+                result.append(float(values[i - 1] + frac * (values[i] - values[i - 1])))
+        return result
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "n": self.n, "compactors": self.compactors, "flips": self.flips}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> KLLSketch:
+        return cls(**data)
+
+
+@dataclass
+class NumericSummary:
+    """
+    Count, mean and variance (Welford / Chan et al. parallel form), min, max
+    and a quantile sketch of one numeric column. Mergeable across chunks.
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float | None = None
+    max: float | None = None
+    sketch: KLLSketch = field(default_factory=KLLSketch)
+
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        batch_mean = float(values.mean())
+        batch = NumericSummary(
+            count=int(values.size),
+            mean=batch_mean,
+            m2=float(((values - batch_mean) ** 2).sum()),
+            min=float(values.min()),
+            max=float(values.max()),
+            sketch=KLLSketch(self.sketch.k),
+        )
+        batch.sketch.update(values)
+        self.merge(batch)
+
+    def merge(self, other: NumericSummary) -> None:
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+        else:
+            total = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / total
+            self.m2 += other.m2 + delta**2 * self.count * other.count / total
+            self.count = total
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    def remove(self, other: NumericSummary) -> None:
+        """
+        Take ``other``'s values (a subset of this summary's) back out of the
+        count and moments – Chan's merge solved for one part. Min, max and the
+        sketch cannot forget values and are left as they are.
+        """
+        if other.count == 0:
+            return
+        remaining = self.count - other.count
+        if remaining <= 0:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        mean = (self.count * self.mean - other.count * other.mean) / remaining
+        delta = other.mean - mean
+        m2 = self.m2 - other.m2 - delta**2 * remaining * other.count / self.count
+        self.count, self.mean, self.m2 = remaining, mean, max(m2, 0.0)
+
+    @property
+    def std(self) -> float | None:
+        # Sample standard deviation, like DataFrame.describe().
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else None
+
+    def describe(self) -> dict:
+        """The fields of ``Series.describe()`` for a numeric column."""
+        q25, q50, q75 = self.sketch.quantiles([0.25, 0.5, 0.75])
+        return {
+            "count": float(self.count),
+            "mean": self.mean if self.count else None,
+            "std": self.std,
+            "min": self.min,
+            "25%": q25,
+            "50%": q50,
+            "75%": q75,
+            "max": self.max,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min,
+            "max": self.max,
+            "sketch": self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> NumericSummary:
+        data = dict(data)
+        data["sketch"] = KLLSketch.from_dict(data["sketch"])
+        return cls(**data)
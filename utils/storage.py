@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from contextlib import ExitStack
+from pathlib import Path
+
+import pandas as pd
+
+from utils.functions import atomic_path, get_logger
+
+try:  # optional: typed, memory-mappable Arrow IPC (Feather v2) artefact
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = feather = None
+
+logger = get_logger(__name__)
+
+# Column → dtype of the sanitised dataset. Salaries are whole numbers that may
+# be missing, hence the nullable Int64; low-cardinality text is categorical.
+SANITISED_DTYPES = {
+    "id": "string",
+    "title": "string",
+    "company_name": "category",
+    "company_id": "category",
+    "location": "category",
+    "link": "string",
+    "image_url": "string",
+    "salary_min": "Int64",
+    "salary_max": "Int64",
+    "salary_currency": "category",
+    "salary_period": "category",
+    "metadata": "string",
+    "duplicate_group_id": "string",
+}
+SANITISED_DATE_COLUMNS = ["published_date_parsed"]
+
+
+def typed_sanitised(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast the columns of ``df`` that appear in the sanitised schema."""
+    df = df.copy()
+    for column, dtype in SANITISED_DTYPES.items():
+        if column not in df.columns:
+            continue
+        if dtype == "Int64":
+            # round() first: CSV round trips store whole numbers as floats.
+            df[column] = pd.to_numeric(df[column], errors="coerce").round().astype(dtype)
+        elif dtype == "category":
+            # Plain-object categories, whether the text arrived as str or string.
+            df[column] = df[column].astype(object).astype(dtype)
+        else:
+            df[column] = df[column].astype(dtype)
+    for column in SANITISED_DATE_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors="coerce")
+    return df
+
+
+def _discard_stale_arrow(path) -> None:
+    # Readers prefer the Arrow file over its CSV twin (see DatasetCache), so
+    # one that is no longer rewritten would be served forever.
+    if path is not None and Path(path).exists():
+        logger.warning("pyarrow not installed; removing stale %s", path)
+        Path(path).unlink(missing_ok=True)
+
+
+def write_arrow_atomic(df: pd.DataFrame, path) -> bool:
+    """
+    Publish ``df`` as an uncompressed Arrow IPC file (so readers can memory-map
+    it) via temp file + ``os.replace``. Returns ``False`` without pyarrow,
+    after removing any Arrow file an earlier run left at ``path``.
+    """
+    if feather is None:
+        logger.debug("pyarrow not installed; skipping %s", path)
+        _discard_stale_arrow(path)
+        return False
+
+    with atomic_path(path) as tmp_path:
+        feather.write_feather(
+            df.reset_index(drop=True), tmp_path, compression="uncompressed"
+        )
+    return True
+
+
+class SanitisedWriter:
+    """
+    Write the sanitised dataset chunk by chunk, to CSV and (with pyarrow) to
+    an Arrow IPC file, publishing both atomically when the ``with`` block
+    exits cleanly. Memory use is bounded by the chunk size.
+
+    An Arrow file carries one dictionary per column, so categorical columns
+    are stored as plain strings here; :func:`read_sanitised` restores them.
+    """
+
+    def __init__(self, columns: list[str], csv_path, arrow_path=None):
+        self.columns = columns
+        self.csv_path = csv_path
+        self.stale_arrow_path = arrow_path if feather is None else None
+        self.arrow_path = arrow_path if feather is not None else None
+        self.rows = 0
+        self._stack = ExitStack()
+        self._csv = None
+        self._arrow = None
+        self._schema = None
+
+    def __enter__(self) -> SanitisedWriter:
+        tmp_csv = self._stack.enter_context(atomic_path(self.csv_path))
+        self._csv = self._stack.enter_context(open(tmp_csv, "w", newline=""))
+        if self.arrow_path is not None:
+            self._tmp_arrow = self._stack.enter_context(atomic_path(self.arrow_path))
+        return self
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        chunk.to_csv(self._csv, index=False, header=self._csv.tell() == 0)
+        self.rows += len(chunk)
+        if self.arrow_path is None:
+            return
+        plain = chunk.astype(
+            {c: "string" for c in chunk.columns if chunk[c].dtype == "category"}
+        ).reset_index(drop=True)
+        if self._arrow is None:
+            self._schema = pa.Schema.from_pandas(plain, preserve_index=False)
+            self._arrow = pa.ipc.new_file(str(self._tmp_arrow), self._schema)
+        self._arrow.write_batch(
+            pa.RecordBatch.from_pandas(plain, schema=self._schema, preserve_index=False)
+        )
+
+    def __exit__(self, *exc) -> None:
+        if self._csv.tell() == 0 and exc[0] is None:
+            # Still publish a header / schema for an empty dataset.
+            self.write(typed_sanitised(pd.DataFrame(columns=self.columns)))
+        if self._arrow is not None:
+            self._arrow.close()
+        self._csv.close()
+        # Unwinding atomic_path with an exception discards its temp file.
+        self._stack.__exit__(*exc)
+        if exc[0] is None:
+            _discard_stale_arrow(self.stale_arrow_path)
+
+
+def read_sanitised(path) -> pd.DataFrame:
+    """
+    Load the sanitised dataset with its proper dtypes, from either format.
+
+    ``.arrow`` files are memory-mapped; CSVs are parsed and cast to the same
+    schema, so callers see identical frames whichever artefact exists.
+    """
+    path = Path(path)
+    if path.suffix == ".arrow":
+        if feather is None:
+            raise ImportError("pyarrow is required to read Arrow datasets")
+        df = feather.read_feather(path, memory_map=True)
+        for column, dtype in SANITISED_DTYPES.items():
+            # Chunked writes (SanitisedWriter) store categoricals as strings.
+            if dtype == "category" and column in df.columns:
+                if df[column].dtype != "category":
+                    df[column] = df[column].astype(object).astype("category")
+        return df
+    return typed_sanitised(pd.read_csv(path))
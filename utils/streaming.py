@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.functions import atomic_path, get_logger
+
+logger = get_logger(__name__)
+
+
+class IdIndex:
+    """
+    Set of job ids seen so far, kept as a sorted array of 64-bit hashes
+    (8 bytes per id instead of a Python string per id) for de-duplicating a
+    stream of chunks.
+    """
+
+    def __init__(self):
+        self._hashes = np.empty(0, dtype="uint64")
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    @staticmethod
+    def _hash(ids: pd.Series) -> np.ndarray:
+        return pd.util.hash_array(ids.astype(str).to_numpy(dtype=object))
+
+    def first_seen(self, ids: pd.Series) -> np.ndarray:
+        """
+        Boolean mask of ``ids`` not seen before (in earlier chunks or earlier
+        in this one), and record them as seen.
+        """
+        hashes = self._hash(ids)
+        _, first = np.unique(hashes, return_index=True)
+        mask = np.zeros(len(hashes), dtype=bool)
+        mask[first] = True
+        mask &= ~np.isin(hashes, self._hashes, assume_unique=False)
+        self._hashes = np.union1d(self._hashes, hashes[mask])
+        return mask
+
+
+def iter_csv_chunks(path, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Raw master rows as text, ``chunksize`` rows at a time."""
+    # dtype=str: type inference per chunk could disagree between chunks.
+    yield from pd.read_csv(path, chunksize=chunksize, dtype=str)
+
+
+def stream_upsert_csv(path, scraped_df: pd.DataFrame, chunksize: int) -> pd.DataFrame:
+    """
+    Upsert ``scraped_df`` into the master CSV at ``path`` without loading it.
+
+    Same result as ``concat([master, scraped]).drop_duplicates("id",
+    keep="last")``: master rows whose id was re-scraped are dropped in
+    stream and the scraped rows appended. Returns the replaced master rows
+    (for the change log).
+    """
+    path = Path(path)
+    scraped = scraped_df.drop_duplicates(subset="id", keep="last")
+    scraped_ids = set(scraped["id"].astype(str))
+
+    columns = list(scraped.columns)
+    if path.exists():
+        header = pd.read_csv(path, nrows=0).columns
+        columns = list(header) + [c for c in scraped.columns if c not in header]
+
+    replaced = []
+    kept = 0
+    with atomic_path(path) as tmp_path, open(tmp_path, "w", newline="") as out:
+        pd.DataFrame(columns=columns).to_csv(out, index=False)
+        if path.exists():
+            for chunk in iter_csv_chunks(path, chunksize):
+                hit = chunk["id"].astype(str).isin(scraped_ids)
+                if hit.any():
+                    replaced.append(chunk[hit])
+                chunk = chunk[~hit].reindex(columns=columns)
+                chunk.to_csv(out, index=False, header=False)
+                kept += len(chunk)
+        scraped.reindex(columns=columns).to_csv(out, index=False, header=False)
+
+    logger.info(
+        "Streamed upsert → %d kept + %d scraped rows (%d replaced) into %s",
+        kept,
+        len(scraped),
+        sum(len(part) for part in replaced),
+        path,
+    )
+    return pd.concat(replaced, ignore_index=True) if replaced else pd.DataFrame()
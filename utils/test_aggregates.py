@@ -0,0 +1,32 @@
+import pandas as pd
+
+from utils.aggregates import jobs_per_day, salary_histogram, top_companies
+
+
+def test_jobs_per_day_fills_missing_days():
+    df = pd.DataFrame(
+        {"published_date_parsed": ["2025-05-30", "2025-05-30", "2025-05-28", None]}
+    )
+    series = jobs_per_day(df, days=3, today=pd.Timestamp("2025-05-30 13:00"))
+    assert series == [
+        {"date": "2025-05-28", "count": 1},
+        {"date": "2025-05-29", "count": 0},
+        {"date": "2025-05-30", "count": 2},
+    ]
+
+
+def test_salary_histogram_matches_dashboard_binning():
+    df = pd.DataFrame({"salary_min": [2500, 4000, 6000, 9000, None, 0]})
+    histogram = salary_histogram(df)
+    # 4 valid values → ceil(log2(4) + 1) = 3 bins, 6,500 / 3 rounded up to 3,000
+    assert histogram["buckets"] == [2, 1, 1]
+    assert histogram["edges"] == [2500.0, 5500.0, 8500.0, 11500.0]
+    assert histogram["labels"][0] == "$2k–$6k"
+
+
+def test_top_companies_skips_placeholders():
+    df = pd.DataFrame({"company_name": ["grab", "Grab ", "nan", None, "shopee"]})
+    assert top_companies(df, n=5) == [
+        {"company": "grab", "count": 2},
+        {"company": "shopee", "count": 1},
+    ]
@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+from utils.changelog import (
+    diff_scrape,
+    merge_change_sets,
+    read_change_sets,
+    record_change_set,
+)
+
+
+def test_diff_scrape_classifies_ids():
+    existing = pd.DataFrame(
+        {"id": ["a", "b", "c"], "title": ["A", "B", "C"], "compensation": [None] * 3}
+    )
+    scraped = pd.DataFrame(
+        {"id": ["a", "b", "d"], "title": ["A", "B v2", "D"], "compensation": [""] * 3}
+    )
+    change_set = diff_scrape(existing, scraped, previously_listed={"a", "b", "c"})
+    assert change_set.added == ["d"]
+    assert change_set.changed == ["b"]  # NaN vs "" is not a change
+    assert change_set.removed == ["c"]
+
+    # An incremental scrape that stopped early proves nothing about "c".
+    partial = diff_scrape(existing, scraped, {"a", "b", "c"}, complete=False)
+    assert (partial.added, partial.changed, partial.removed) == (["d"], ["b"], [])
+
+
+def test_record_and_merge_change_sets(tmp_path):
+    log, state = tmp_path / "changes.jsonl", tmp_path / "state.json"
+    scraped = pd.DataFrame({"id": ["a", "b"], "title": ["A", "B"]})
+    first = diff_scrape(pd.DataFrame(), scraped)
+    record_change_set(first, {"a", "b"}, path=log, state_path=state)
+
+    rescraped = pd.DataFrame({"id": ["b"], "title": ["B v2"]})
+    second = diff_scrape(scraped, rescraped, previously_listed={"a", "b"})
+    record_change_set(second, {"b"}, path=log, state_path=state, max_runs=1)
+
+    change_sets = read_change_sets(log)
+    assert [c.seq for c in change_sets] == [2]
+
+    merged = merge_change_sets(change_sets, since=1)
+    assert (merged.seq, merged.added, merged.changed, merged.removed) == (
+        2,
+        [],
+        ["b"],
+        ["a"],
+    )
+    assert merge_change_sets(change_sets, since=0) is None  # trimmed away
+    with pytest.raises(ValueError):
+        merge_change_sets(change_sets, since=3)  # ahead of the log
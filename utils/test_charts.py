@@ -0,0 +1,38 @@
+import pandas as pd
+
+from utils import charts
+
+SANITISED = pd.DataFrame(
+    {
+        "salary_min": [4000.0, None, 6000.0],
+        "salary_currency": ["SGD", None, "USD"],
+    }
+)
+
+
+def test_chart_inputs_only_plot_what_each_chart_shows():
+    inputs = charts.chart_inputs(
+        charts.sgd_salaries(SANITISED), {"2025-05-01": 2, "2025-05-03": 1}, {"grab": 1, "sea": 3}
+    )
+    assert inputs["salary"] == {"salary_min": [4000.0]}
+    assert inputs["companies"] == {"company": ["sea", "grab"], "count": [3, 1]}
+    assert inputs["jobs_per_day"]["count"] == [2, 0, 1]
+    assert charts.chart_inputs(charts.sgd_salaries(SANITISED), {}, {})["jobs_per_day"] is None
+
+
+def test_render_charts_skips_unchanged_inputs(tmp_path, monkeypatch):
+    png = tmp_path / "jobs.png"
+    monkeypatch.setitem(
+        charts.CHARTS,
+        "jobs_per_day",
+        (str(png), charts._render_jobs_per_day, "no dates"),
+    )
+    cache = tmp_path / "render_cache.json"
+    payload = {"jobs_per_day": {"date": ["2025-05-01"], "count": [3]}}
+
+    assert charts.render_charts(payload, cache_path=cache) == ["jobs_per_day"]
+    assert png.read_bytes().startswith(b"\x89PNG")
+    assert charts.render_charts(payload, cache_path=cache) == []
+
+    payload["jobs_per_day"]["count"] = [4]
+    assert charts.render_charts(payload, cache_path=cache) == ["jobs_per_day"]
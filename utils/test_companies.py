@@ -0,0 +1,27 @@
+import pandas as pd
+
+from utils.companies import CompanyAliases, company_key
+
+
+def test_company_key_drops_legal_forms_and_punctuation():
+    names = ["Grab", "Grab Holdings", "GRAB PTE. LTD.", "Grab (Singapore) Pte Ltd"]
+    assert {company_key(name) for name in names} == {"grab"}
+    assert company_key("PT Tokopedia") == "tokopedia"
+    assert company_key("Ltd") == "ltd"
+    assert company_key(None) is None
+
+
+def test_aliases_merge_near_duplicates_and_persist(tmp_path):
+    path = tmp_path / "aliases.json"
+    aliases = CompanyAliases.load(path)
+    names = pd.Series(["ByteDance", "Byte Dance Inc", "ByteDance", None, "Shopee"])
+    assert aliases.resolve(names).tolist() == [
+        "bytedance", "bytedance", "bytedance", pd.NA, "shopee",
+    ]  # fmt: skip
+    aliases.save(path)
+
+    # A later run reuses the stored ids and only resolves the new spelling.
+    again = CompanyAliases.load(path)
+    later = pd.Series(["Shopee Pte Ltd", "Byte-Dance", "Sho Pee"])
+    assert again.resolve(later).tolist() == ["shopee", "bytedance", "shopee"]
+    assert again.added == 1
@@ -0,0 +1,31 @@
+import pandas as pd
+
+from utils.dates import parse_published_dates
+
+
+def test_relative_dates_resolve_against_scrape_time():
+    published = pd.Series(
+        ["9 May 2025", "1d ago", "yesterday", "2 weeks ago", "5h ago", "soon", None]
+    )
+    # 01:30 on 2 June in Singapore
+    parsed = parse_published_dates(published, "2025-06-01T17:30:00+00:00")
+    assert parsed.dt.strftime("%Y-%m-%d").tolist()[:5] == [
+        "2025-05-09",
+        "2025-06-01",
+        "2025-06-01",
+        "2025-05-19",
+        "2025-06-01",
+    ]
+    assert parsed.iloc[5:].isna().all()
+
+
+def test_each_row_uses_its_own_scrape_time():
+    published = pd.Series(["1d ago", "1d ago", "1d ago"], index=[10, 11, 12])
+    scraped_at = pd.Series(
+        ["2025-05-20T04:00:00+00:00", "2025-05-25T04:00:00+00:00", None],
+        index=[10, 11, 12],
+    )
+    parsed = parse_published_dates(published, scraped_at)
+    assert list(parsed.index) == [10, 11, 12]
+    assert parsed.tolist()[:2] == [pd.Timestamp("2025-05-19"), pd.Timestamp("2025-05-24")]
+    assert pd.isna(parsed.iloc[2])    # no anchor, no date
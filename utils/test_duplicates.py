@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from utils.duplicates import DuplicateIndex, minhash_signatures, unique_postings
+
+POSTINGS = pd.DataFrame(
+    {
+        "id": ["a", "b", "c", "d"],
+        "title": [
+            "Senior Backend Engineer (Payments)",
+            "Senior Backend Engineer - Payments",
+            "Senior Backend Engineer (Payments)",
+            "Product Designer",
+        ],
+        "company_id": ["grab", "grab", "shopee", "grab"],
+        "location": ["Singapore, Singapore"] * 4,
+        "metadata": ["Engineering,Fintech,Full-time"] * 4,
+    }
+)
+
+
+def test_reposts_join_the_group_of_the_first_posting():
+    groups = DuplicateIndex().assign(POSTINGS)
+    # Same role at the same company; the other company and role stay apart.
+    assert groups.tolist() == ["a", "a", "c", "d"]
+    assert unique_postings(POSTINGS.assign(duplicate_group_id=groups)).tolist() == [
+        True, False, True, True,
+    ]  # fmt: skip
+
+
+def test_index_persists_groups_and_checks_only_new_postings(tmp_path):
+    path = tmp_path / "duplicates.npz"
+    index = DuplicateIndex()
+    index.assign(POSTINGS.iloc[:1])
+    index.save(path)
+
+    again = DuplicateIndex.load(path)
+    repost = POSTINGS.iloc[[1, 0]].assign(id=["e", "a"])
+    assert again.assign(repost).tolist() == ["a", "a"]
+    assert again.added == 1 and len(again) == 2
+
+
+def test_a_version_1_index_is_converted(tmp_path):
+    path = tmp_path / "duplicates.npz"
+    np.savez(
+        path,
+        version=1,
+        ids=np.asarray(["a", "d"]),
+        companies=np.asarray(["grab", "grab"]),
+        signatures=minhash_signatures(POSTINGS.iloc[[0, 3]]),
+        groups=np.asarray(["a", "d"]),
+    )
+    index = DuplicateIndex.load(path)
+    reposts = POSTINGS.iloc[[1, 3, 2]].assign(id=["b", "d", "e"], company_id="grab")
+    assert index.assign(reposts).tolist() == ["a", "d", "a"]
+    assert len(index) == 4 and index.added == 4  # saved again in the new layout
+
+    index.save(path)
+    again = DuplicateIndex.load(path)
+    assert again.assign(POSTINGS.iloc[[0, 1]]).tolist() == ["a", "a"]
+    assert again.added == 0
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from utils.incremental import (
+    ProcessingState,
+    apply_delta,
+    plan_increment,
+    read_processing_state,
+    row_hashes,
+    write_processing_state,
+)
+
+RAW = pd.DataFrame(
+    {
+        "id": ["a", "b", "c", "a"],
+        "title": ["Engineer", "Analyst", None, "Engineer (dup)"],
+        "compensation": ["SGD 4,000 – 8,000", None, "Equity", None],
+    }
+)
+
+
+def test_plan_increment_finds_new_changed_and_removed_rows(tmp_path):
+    hashes = row_hashes(RAW, ["id", "title", "compensation"])
+    assert list(hashes.index) == ["a", "b", "c"]
+
+    path = tmp_path / "state.json"
+    write_processing_state(
+        ProcessingState(row_hashes={k: int(v) for k, v in hashes.items()}), path
+    )
+    state = read_processing_state(path)
+    assert plan_increment(hashes, state).is_empty
+
+    current = RAW.iloc[[0, 2]].copy()
+    current.loc[2, "title"] = "Designer"
+    current = pd.concat([current, pd.DataFrame({"id": ["d"], "title": ["PM"]})])
+    increment = plan_increment(row_hashes(current, ["id", "title", "compensation"]), state)
+    assert sorted(increment.changed) == ["c", "d"]
+    assert list(increment.removed) == ["b"]
+
+
+def test_apply_delta_drops_zero_counts():
+    counts = {"grab": 2, "shopee": 1}
+    stale = pd.Series(["shopee", "grab"])
+    fresh = pd.Series(["grab", "sea", None])
+    assert apply_delta(counts, stale, fresh) == {"grab": 2, "sea": 1}
@@ -0,0 +1,107 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from utils.job_store import JobStore
+
+
+def test_upsert_inserts_then_updates(tmp_path):
+    with JobStore(tmp_path / "jobs.sqlite3") as store:
+        first = pd.DataFrame(
+            {
+                "id": ["a", "b"],
+                "title": ["A", "B"],
+                "company": ["Grab", "Shopee"],
+                "compensation": ["SGD 4,000 – 8,000", ""],
+            }
+        )
+        assert store.upsert(first, seen_at="2025-05-01T00:00:00+00:00") == 2
+
+        update = pd.DataFrame({"id": ["a"], "title": ["A v2"], "company": ["Grab"]})
+        store.upsert(update, seen_at="2025-05-02T00:00:00+00:00")
+
+        assert store.count() == 2
+        row = store.fetch(["a"]).iloc[0]
+        assert row["title"] == "A v2"
+        assert row["first_seen_at"].startswith("2025-05-01")
+        assert row["last_seen_at"].startswith("2025-05-02")
+
+        assert list(store.query(company="grab")["id"]) == ["a"]
+        assert list(store.query(min_salary=5000)["id"]) == []  # salary was replaced
+        assert list(store.read_all()["id"]) == ["a", "b"]
+
+
+def test_salary_index_is_populated(tmp_path):
+    with JobStore(tmp_path / "jobs.sqlite3") as store:
+        store.upsert(
+            pd.DataFrame({"id": ["a"], "compensation": ["SGD 4,000 – 8,000"]})
+        )
+        assert list(store.query(min_salary=6000, max_salary=5000)["id"]) == ["a"]
+        plan = store.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM jobs WHERE salary_min <= 5000"
+        ).fetchall()
+        assert "idx_jobs_salary" in str(plan)
+
+
+def test_opening_an_older_store_adds_new_raw_columns(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    with JobStore(path) as store:
+        store.conn.execute("ALTER TABLE jobs DROP COLUMN scraped_at")
+
+    with JobStore(path) as store:
+        store.upsert(pd.DataFrame({"id": ["a"], "scraped_at": ["2025-06-01T00:00:00Z"]}))
+        assert store.read_all()["scraped_at"].tolist() == ["2025-06-01T00:00:00Z"]
+
+
+def test_published_date_ranges_use_the_iso_index(tmp_path):
+    with JobStore(tmp_path / "jobs.sqlite3") as store:
+        store.upsert(
+            pd.DataFrame(
+                {
+                    "id": ["a", "b", "c"],
+                    "company": ["Grab", "Shopee", "grab"],
+                    "published_date": ["9 May 2025", "1d ago", "30 Apr 2025"],
+                    "scraped_at": ["2025-05-20T02:00:00+00:00"] * 3,
+                }
+            )
+        )
+        assert store.fetch(["b"])["published_on"].tolist() == ["2025-05-19"]
+        may = store.query(published_after="2025-05-01", published_before="2025-05-31")
+        assert list(may["id"]) == ["b", "a"]  # newest first
+        assert list(store.query(company=["GRAB", "Lazada"])["id"]) == ["a", "c"]
+
+        plan = store.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM jobs WHERE published_on >= '2025-05-01'"
+        ).fetchall()
+        assert "idx_jobs_published_on" in str(plan)
+
+
+def test_opening_an_older_store_backfills_published_on(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    with JobStore(path) as store:
+        store.upsert(pd.DataFrame({"id": ["a"], "published_date": ["9 May 2025"]}))
+        store.conn.executescript(
+            "DROP INDEX idx_jobs_published_on;"
+            "ALTER TABLE jobs DROP COLUMN published_on;"
+            "CREATE INDEX idx_jobs_published_date ON jobs (published_date);"
+        )
+
+    with JobStore(path) as store:
+        assert list(store.query(published_after="2025-05-09")["id"]) == ["a"]
+        indexes = {row[1] for row in store.conn.execute("PRAGMA index_list(jobs)")}
+        assert "idx_jobs_published_date" not in indexes
+
+
+def test_a_readonly_store_leaves_the_schema_to_the_writer(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    with JobStore(path) as store:
+        store.upsert(pd.DataFrame({"id": ["a"]}))
+        store.conn.execute("ALTER TABLE jobs DROP COLUMN shard")
+
+    with JobStore(path, readonly=True) as store:
+        assert store.fetch(["a"])["id"].tolist() == ["a"]
+        columns = {row[1] for row in store.conn.execute("PRAGMA table_info(jobs)")}
+        assert "shard" not in columns  # not migrated
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            store.conn.execute("DELETE FROM jobs")
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from utils.pipeline import Pipeline, Stage
+
+
+def _pipeline(tmp_path, calls, fail=False):
+    source, middle, final = (tmp_path / name for name in ("a.txt", "b.txt", "c.txt"))
+
+    def copy(src, dst):
+        def run(context):
+            calls.append(dst.name)
+            if fail and dst is final:
+                raise RuntimeError("boom")
+            dst.write_text(src.read_text().upper())
+            return 1
+
+        return run
+
+    stages = [
+        Stage("first", copy(source, middle), [str(source)], [str(middle)]),
+        Stage("second", copy(middle, final), [str(middle)], [str(final)]),
+    ]
+    return source, Pipeline(
+        stages, state_path=tmp_path / "state.json", log_path=tmp_path / "runs.jsonl"
+    )
+
+
+def test_stages_with_unchanged_inputs_are_skipped(tmp_path):
+    calls = []
+    source, pipeline = _pipeline(tmp_path, calls)
+    source.write_text("x")
+
+    assert [r.status for r in pipeline.run()] == ["ran", "ran"]
+    assert [r.status for r in pipeline.run()] == ["skipped", "skipped"]
+    # Same bytes under a new inode/mtime still count as unchanged.
+    source.unlink()
+    source.write_text("x")
+    assert [r.status for r in pipeline.run()] == ["skipped", "skipped"]
+
+    source.write_text("y")
+    assert [r.status for r in pipeline.run()] == ["ran", "ran"]
+    assert [r.status for r in pipeline.run(start="second")] == ["ran"]
+    assert calls == ["b.txt", "c.txt", "b.txt", "c.txt", "c.txt"]
+
+    lines = (tmp_path / "runs.jsonl").read_text().splitlines()
+    log = [json.loads(line) for line in lines]
+    assert len(log) == 9 and log[0]["rows"] == 1 and log[0]["wall_s"] >= 0
+
+
+def test_failed_stage_is_logged_and_reruns_next_time(tmp_path):
+    calls = []
+    source, pipeline = _pipeline(tmp_path, calls, fail=True)
+    source.write_text("x")
+
+    with pytest.raises(RuntimeError):
+        pipeline.run()
+    log = (tmp_path / "runs.jsonl").read_text().splitlines()
+    assert json.loads(log[-1])["status"] == "failed"
+
+    _, fixed = _pipeline(tmp_path, calls)
+    assert [r.status for r in fixed.run()] == ["skipped", "ran"]
@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+
+from utils.process_tree import process_tree_usage
+
+
+def _stat(pid, ppid, rss_pages, utime, stime):
+    # proc(5): pid (comm) state ppid … utime(14) stime(15) … rss(24)
+    fields = ["S", ppid] + [0] * 9 + [utime, stime] + [0] * 8 + [rss_pages]
+    return f"{pid} (chrome (renderer)) " + " ".join(map(str, fields))
+
+
+def test_process_tree_usage_sums_descendants(tmp_path):
+    tree = {10: (1, 100, 50, 50), 11: (10, 200, 100, 0), 12: (11, 300, 0, 100),
+            20: (1, 999, 999, 999)}  # fmt: skip
+    for pid, (ppid, rss, utime, stime) in tree.items():
+        (tmp_path / str(pid)).mkdir()
+        (tmp_path / str(pid) / "stat").write_text(_stat(pid, ppid, rss, utime, stime))
+
+    usage = process_tree_usage(10, proc=tmp_path)
+
+    assert usage.processes == 3
+    assert usage.rss_mb == 600 * os.sysconf("SC_PAGE_SIZE") / 2**20
+    assert usage.cpu_s == 300 / os.sysconf("SC_CLK_TCK")
+    assert process_tree_usage(99, proc=tmp_path) is None
+
+
+def test_process_tree_usage_of_a_live_child():
+    if not os.path.isdir("/proc"):
+        return
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+    try:
+        usage = process_tree_usage(os.getpid())
+        assert usage.processes >= 2 and usage.rss_mb > 0
+    finally:
+        child.kill()
+        child.wait()
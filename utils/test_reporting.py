@@ -1,4 +1,5 @@
 import pandas as pd
+import pytest
 
 from utils.reporting import log_quality_report
 
@@ -41,3 +42,52 @@ def test_log_quality_report_creates_csv(tmp_path):
     # Optionally, read and check contents
     report_df = pd.read_csv(output_path)
     assert "salary_min_stats_count" in report_df.columns
+
+
+def test_log_quality_report_from_a_summary_alone(tmp_path):
+    from utils.reporting import QualitySummary
+
+    df = pd.DataFrame({"id": ["a", "b"], "salary_min": [3000, None]})
+    report = log_quality_report(
+        output_path=tmp_path / "quality_report.csv",
+        summary=QualitySummary.from_frame(df),
+        columns=["salary_min", "id", "title"],
+    )
+    assert report["missing_values"] == {"salary_min": 1, "id": 0, "title": 0}
+    assert report["rows"] == 2
+
+
+def test_quality_summary_merges_and_removes_rows():
+    from utils.reporting import QualitySummary
+
+    df = pd.DataFrame(
+        {
+            "salary_min": [3000.0, None, 5000.0, 9000.0],
+            "published_date_parsed": pd.to_datetime(
+                ["2025-05-01", "2025-05-03", None, "2025-05-02"]
+            ),
+        }
+    )
+    expected = QualitySummary.from_frame(df).report()
+
+    def assert_same(report, expected):
+        stats = report.pop("salary_min_stats")
+        assert stats == pytest.approx(expected.pop("salary_min_stats"))
+        assert report == expected
+
+    # Chunks combine into the same report as one pass over the frame.
+    merged = QualitySummary.from_frame(df.iloc[:2])
+    merged.merge(QualitySummary.from_frame(df.iloc[2:]))
+    assert expected["salary_min_stats"]["50%"] == df["salary_min"].median()
+    assert_same(merged.report(), dict(expected))
+
+    # Taking rows out flags the columns whose min/max/sketch must be rescanned.
+    rescan = merged.remove(df.iloc[[3]])
+    assert rescan == {"salary_min"}    # the date sits inside the current range
+    # ...while count, mean and std are already exact without one.
+    kept = merged.numeric["salary_min"].describe()
+    assert [kept["count"], kept["mean"], kept["std"]] == pytest.approx(
+        [2.0, 4000.0, df["salary_min"].iloc[:3].std()]
+    )
+    merged.rescan(df.iloc[:3], rescan)
+    assert_same(merged.report(), QualitySummary.from_frame(df.iloc[:3]).report())
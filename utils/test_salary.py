@@ -0,0 +1,48 @@
+import pandas as pd
+
+from data_processing import extract_salaries
+from utils.salary import SALARY_COLUMNS, parse_compensation
+
+
+def test_parse_compensation_formats():
+    texts = pd.Series(
+        [
+            "SGD 4,000 – 8,000 with equity",
+            "SGD 55,000",
+            "S$4.5k - 6k per month",
+            "USD 120k/yr",
+            "IDR 15,000,000 – 20,000,000",
+            "Equity",
+            None,
+        ],
+        index=list("abcdefg"),
+    )
+    parsed = parse_compensation(texts)
+    assert list(parsed.columns) == SALARY_COLUMNS
+    assert list(parsed.index) == list("abcdefg")
+    # Large figures with no stated period are annual, normalised to monthly.
+    assert parsed.loc["b", ["salary_min", "salary_period"]].tolist() == [4583, "year"]
+    assert parsed.loc["c", ["salary_min", "salary_max"]].tolist() == [4500, 6000]
+    assert parsed.loc["d"].tolist() == [10000, 10000, "USD", "year"]
+    # Per-currency thresholds: IDR 15m a month is a monthly figure.
+    assert parsed.loc["e", "salary_period"] == "month"
+    assert parsed.loc[["f", "g"]].isna().all().all()
+
+
+def test_parse_compensation_keeps_senior_monthly_ranges_monthly():
+    parsed = parse_compensation(
+        pd.Series(["SGD 10,000 – 20,000", "SGD 15,000 – 25,000 with equity"])
+    )
+    assert parsed.values.tolist() == [
+        [10000, 20000, "SGD", "month"],
+        [15000, 25000, "SGD", "month"],
+    ]
+
+
+def test_parse_compensation_matches_scalar_parser_on_sgd_ranges():
+    texts = pd.Series(["SGD 3,500 – 5,000", "SGD 6,000-9,000 with equity", "Equity"] * 3)
+    parsed = parse_compensation(texts)
+    expected = pd.DataFrame(
+        [extract_salaries(t) for t in texts], columns=["salary_min", "salary_max"]
+    ).astype("float64")
+    pd.testing.assert_frame_equal(parsed[["salary_min", "salary_max"]], expected)
@@ -0,0 +1,45 @@
+import numpy as np
+
+from utils.sketches import KLLSketch, NumericSummary
+
+
+def test_numeric_summary_matches_numpy_across_chunks():
+    values = np.random.default_rng(0).lognormal(8, 0.5, 50_000)
+    parts = [NumericSummary() for _ in range(3)]
+    for i, chunk in enumerate(np.array_split(values, 30)):
+        parts[i % 3].update(chunk)
+    summary = parts[0]
+    summary.merge(parts[1])
+    summary.merge(parts[2])
+
+    stats = summary.describe()
+    assert stats["count"] == values.size
+    assert np.isclose(stats["mean"], values.mean())
+    assert np.isclose(stats["std"], values.std(ddof=1))
+    assert (stats["min"], stats["max"]) == (values.min(), values.max())
+    # Rank error stays well inside 2% of the distribution.
+    for q, estimate in zip((0.25, 0.5, 0.75), (stats["25%"], stats["50%"], stats["75%"])):
+        assert abs((values < estimate).mean() - q) < 0.02
+
+    restored = NumericSummary.from_dict(summary.to_dict())
+    assert restored.describe() == stats
+
+
+def test_small_sketch_is_exact():
+    sketch = KLLSketch()
+    sketch.update([5.0, 1.0, 3.0, np.nan])
+    assert sketch.quantiles([0.0, 0.25, 0.5, 1.0]) == [1.0, 2.0, 3.0, 5.0]
+
+
+def test_numeric_summary_removes_a_subset_exactly():
+    values = np.random.default_rng(1).lognormal(8, 0.5, 10_000)
+    summary, removed = NumericSummary(), NumericSummary()
+    summary.update(values)
+    removed.update(values[::7])
+
+    summary.remove(removed)
+
+    kept = np.delete(values, np.s_[::7])
+    assert summary.count == kept.size
+    assert np.isclose(summary.mean, kept.mean())
+    assert np.isclose(summary.std, kept.std(ddof=1))
@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from utils.storage import (
+    SanitisedWriter,
+    read_sanitised,
+    typed_sanitised,
+    write_arrow_atomic,
+)
+
+SAMPLE = pd.DataFrame(
+    {
+        "id": ["a", "b"],
+        "company_name": ["grab", "grab"],
+        "salary_min": [3000.0, None],
+        "published_date_parsed": ["2025-05-01", None],
+    }
+)
+
+
+def test_csv_reader_restores_dtypes(tmp_path):
+    path = tmp_path / "sanitised.csv"
+    SAMPLE.to_csv(path, index=False)
+    df = read_sanitised(path)
+    assert str(df["salary_min"].dtype) == "Int64"
+    assert str(df["company_name"].dtype) == "category"
+    assert pd.api.types.is_datetime64_any_dtype(df["published_date_parsed"])
+
+
+def test_arrow_round_trip_keeps_dtypes(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "sanitised.arrow"
+    typed = typed_sanitised(SAMPLE)
+    assert write_arrow_atomic(typed, path)
+    pd.testing.assert_frame_equal(read_sanitised(path), typed)
+
+
+def test_chunked_writer_matches_one_shot_outputs(tmp_path):
+    pytest.importorskip("pyarrow")
+    typed = typed_sanitised(SAMPLE)
+    csv_path, arrow_path = tmp_path / "s.csv", tmp_path / "s.arrow"
+    with SanitisedWriter(list(SAMPLE.columns), csv_path, arrow_path) as writer:
+        writer.write(typed.iloc[:1])
+        writer.write(typed.iloc[1:])
+    assert writer.rows == 2
+    pd.testing.assert_frame_equal(read_sanitised(arrow_path), typed)
+    pd.testing.assert_frame_equal(read_sanitised(csv_path), typed)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["s.arrow", "s.csv"]
+
+
+def test_without_pyarrow_a_stale_arrow_file_is_removed(tmp_path, monkeypatch):
+    import utils.storage as storage
+
+    arrow_path, csv_path = tmp_path / "sanitised.arrow", tmp_path / "sanitised.csv"
+    monkeypatch.setattr(storage, "feather", None)
+
+    arrow_path.write_bytes(b"old")
+    assert not write_arrow_atomic(typed_sanitised(SAMPLE), arrow_path)
+    assert not arrow_path.exists()
+
+    arrow_path.write_bytes(b"old")
+    with SanitisedWriter(list(SAMPLE.columns), csv_path, arrow_path) as writer:
+        writer.write(typed_sanitised(SAMPLE))
+    assert csv_path.exists() and not arrow_path.exists()
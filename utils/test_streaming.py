@@ -0,0 +1,26 @@
+import pandas as pd
+
+from utils.streaming import IdIndex, stream_upsert_csv
+
+
+def test_id_index_keeps_first_occurrence_across_chunks():
+    seen = IdIndex()
+    assert seen.first_seen(pd.Series(["a", "b", "a"])).tolist() == [True, True, False]
+    assert seen.first_seen(pd.Series(["c", "b"])).tolist() == [True, False]
+    assert len(seen) == 3
+
+
+def test_stream_upsert_matches_in_memory_upsert(tmp_path):
+    path = tmp_path / "master.csv"
+    master = pd.DataFrame({"id": ["a", "b", "c"], "title": ["x", "y", "z"]})
+    master.to_csv(path, index=False)
+    scraped = pd.DataFrame({"id": ["b", "d"], "title": ["y2", "w"]})
+
+    replaced = stream_upsert_csv(path, scraped, chunksize=2)
+
+    expected = pd.concat([master, scraped], ignore_index=True)
+    expected = expected.drop_duplicates(subset="id", keep="last")
+    pd.testing.assert_frame_equal(
+        pd.read_csv(path), expected.reset_index(drop=True)
+    )
+    assert replaced["id"].tolist() == ["b"]